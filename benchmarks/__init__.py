@@ -0,0 +1,5 @@
+"""Performance benchmarks for m8py.
+
+Run them standalone with ``python -m benchmarks`` or through pytest with
+``pytest benchmarks`` (add ``--bench-json out.json`` to time them fully).
+"""
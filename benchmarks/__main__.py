@@ -0,0 +1,38 @@
+"""Run the benchmarks: ``python -m benchmarks [-k NAME] [--json PATH]``."""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Sequence
+
+from benchmarks.harness import discover, format_table, measure, select, to_json, write_json
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", "--keyword", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (default: 5)")
+    parser.add_argument("--min-time", type=float, default=0.05,
+                        help="minimum seconds per run; sets the loop count (default: 0.05)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    benchmarks = select(discover().values(), args.keyword)
+    if args.list:
+        print("\n".join(b.name for b in benchmarks))
+        return 0
+
+    results = []
+    for bench in benchmarks:
+        print(f"{bench.name} ...", file=sys.stderr, flush=True)
+        results.append(measure(bench, repeat=args.repeat, min_time=args.min_time))
+    log = sys.stderr if args.json == "-" else sys.stdout
+    print(format_table(results), file=log)
+    if args.json:
+        write_json(to_json(results, args.repeat, args.min_time), args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Declarative composition and slot allocation."""
+from __future__ import annotations
+
+from benchmarks import corpus
+from benchmarks.harness import benchmark
+from m8py.compose.allocator import SlotAllocator
+from m8py.compose.declarative import TrackDef, compose, plan
+from m8py.models.phrase import Phrase, PhraseStep
+
+_NOTES = ("C4", "D#4", "G4", "A#4", "C5", "---", "OFF", ".")
+
+# (tracks, steps per track, deduplicate)
+_SIZES = {
+    "small": (1, 64, False),
+    "medium": (4, 256, False),
+    "large": (8, 480, False),
+    "dedup": (8, 4096, True),
+}
+
+
+def _tracks(n_tracks: int, steps: int) -> list[TrackDef]:
+    tracks = []
+    for t in range(n_tracks):
+        pattern = " ".join(_NOTES[(i * (t + 3)) % len(_NOTES)] for i in range(steps))
+        tracks.append(TrackDef(instrument=corpus.instrument(t), pattern=pattern, track=t))
+    return tracks
+
+
+@benchmark("compose", list(_SIZES.values()), ids=list(_SIZES))
+def compose_song(size):
+    n_tracks, steps, dedup = size
+    tracks = _tracks(n_tracks, steps)
+    return lambda: compose(tracks, name="BENCH", deduplicate=dedup)
+
+
+@benchmark("plan", list(_SIZES.values()), ids=list(_SIZES))
+def plan_song(size):
+    n_tracks, steps, dedup = size
+    tracks = _tracks(n_tracks, steps)
+    return lambda: plan(tracks, deduplicate=dedup)
+
+
+def _phrase(i: int) -> Phrase:
+    return Phrase(steps=[PhraseStep(note=i % 128, velocity=i // 128, instrument=0)] * 16)
+
+
+@benchmark("allocator_from_song", [0.25, 0.75, 0.98], ids=["25%", "75%", "98%"])
+def allocator_from_song(density):
+    song = corpus.song("v6.5", density)
+    return lambda: SlotAllocator.from_song(song)
+
+
+@benchmark("allocator_near_capacity", [False, True], ids=["plain", "dedup"])
+def allocator_near_capacity(dedup):
+    """Allocate and release one phrase with 3 of 255 slots free."""
+    alloc = SlotAllocator(deduplicate=dedup)
+    alloc.alloc_phrases(_phrase(i) for i in range(252))
+    phrase = _phrase(300)
+
+    def op():
+        alloc.release_phrase(alloc.alloc_phrase(phrase))
+    return op
+
+
+@benchmark("allocator_range_near_capacity")
+def allocator_range_near_capacity():
+    """Find a 3-slot gap among 252 scattered used phrase slots."""
+    alloc = SlotAllocator()
+    slots = alloc.alloc_phrases(_phrase(i) for i in range(255))
+    for slot in slots[100:103]:
+        alloc.release_phrase(slot)
+    block = [_phrase(i) for i in range(3)]
+
+    def op():
+        start = alloc.alloc_phrase_range(block)
+        for slot in range(start, start + 3):
+            alloc.release_phrase(slot)
+    return op
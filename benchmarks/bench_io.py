@@ -0,0 +1,86 @@
+"""Loading and saving every file type in every firmware layout."""
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from benchmarks import corpus
+from benchmarks.harness import benchmark
+from m8py.format.reader import M8FileReader
+from m8py.format.writer import M8FileWriter
+from m8py.io import load, save
+from m8py.models.song import Song
+from m8py.models.version import M8FileType
+
+_LAYOUTS = list(corpus.LAYOUTS)
+_path = corpus.corpus_file
+
+
+def _out(suffix: str) -> Path:
+    return Path(tempfile.mkdtemp(prefix="out-", dir=corpus.scratch_dir())) / f"out{suffix}"
+
+
+@benchmark("load_song", _LAYOUTS)
+def load_song(layout):
+    path = _path("song", layout)
+    return lambda: load(path)
+
+
+@benchmark("save_song", _LAYOUTS)
+def save_song(layout):
+    song, out = load(_path("song", layout)), _out(".m8s")
+    return lambda: save(song, out)
+
+
+@benchmark("decode_song", _LAYOUTS)
+def decode_song(layout):
+    """Song.from_reader alone, without file I/O."""
+    data = corpus.song_bytes(layout)
+
+    def op():
+        reader = M8FileReader(data)
+        Song.from_reader(reader, M8FileType.from_reader(reader))
+    return op
+
+
+@benchmark("encode_song", _LAYOUTS)
+def encode_song(layout):
+    """Song.write alone, without file I/O."""
+    song = corpus.song(layout)
+    return lambda: song.write(M8FileWriter())
+
+
+@benchmark("load_instrument", _LAYOUTS)
+def load_instrument(layout):
+    path = _path("instrument", layout)
+    return lambda: load(path)
+
+
+@benchmark("save_instrument", _LAYOUTS)
+def save_instrument(layout):
+    inst, out = load(_path("instrument", layout)), _out(".m8i")
+    return lambda: save(inst, out)
+
+
+@benchmark("load_scale", _LAYOUTS)
+def load_scale(layout):
+    path = _path("scale", layout)
+    return lambda: load(path)
+
+
+@benchmark("save_scale", _LAYOUTS)
+def save_scale(layout):
+    scale, out = load(_path("scale", layout)), _out(".m8n")
+    return lambda: save(scale, out)
+
+
+@benchmark("load_theme")
+def load_theme():
+    path = _path("theme")
+    return lambda: load(path)
+
+
+@benchmark("save_theme")
+def save_theme():
+    theme, out = load(_path("theme")), _out(".m8t")
+    return lambda: save(theme, out)
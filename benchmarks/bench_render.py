@@ -0,0 +1,45 @@
+"""Text rendering of phrases, chains, tables, instruments and songs."""
+from __future__ import annotations
+
+from benchmarks import corpus
+from benchmarks.harness import benchmark
+from m8py.display.render import (
+    render_chain, render_instrument_summary, render_phrase,
+    render_song_grid, render_song_overview, render_table,
+)
+
+
+@benchmark("render_phrase")
+def phrase():
+    song = corpus.song()
+    return lambda: render_phrase(song.phrases[0], song.version)
+
+
+@benchmark("render_chain")
+def chain():
+    song = corpus.song()
+    return lambda: render_chain(song.chains[0])
+
+
+@benchmark("render_table")
+def table():
+    song = corpus.song()
+    return lambda: render_table(song.tables[0], song.version)
+
+
+@benchmark("render_instrument_summary")
+def instrument():
+    song = corpus.song()
+    return lambda: render_instrument_summary(song.instruments[4])
+
+
+@benchmark("render_song_grid")
+def song_grid():
+    song = corpus.song()
+    return lambda: render_song_grid(song)
+
+
+@benchmark("render_song_overview")
+def song_overview():
+    song = corpus.song()
+    return lambda: render_song_overview(song)
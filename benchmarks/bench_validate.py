@@ -0,0 +1,36 @@
+"""Whole-song, raw-buffer and incremental validation."""
+from __future__ import annotations
+
+import copy
+
+from benchmarks import corpus
+from benchmarks.harness import benchmark
+from m8py.validate import Validator, validate, validate_bytes
+
+_DENSITIES = [0.25, 0.75, 1.0]
+_IDS = ["25%", "75%", "100%"]
+
+
+@benchmark("validate", _DENSITIES, ids=_IDS)
+def validate_song(density):
+    song = corpus.song("v6.5", density)
+    return lambda: validate(song)
+
+
+@benchmark("validate_bytes", _DENSITIES, ids=_IDS)
+def validate_raw(density):
+    data = corpus.song_bytes("v6.5", density)
+    return lambda: validate_bytes(data)
+
+
+@benchmark("validator_update")
+def validator_update():
+    """Re-check one edited phrase of a dense song."""
+    song = copy.deepcopy(corpus.song("v6.5", 1.0))
+    validator = Validator(song)
+    step = song.phrases[3].steps[0]
+
+    def op():
+        step.instrument = 200 if step.instrument != 200 else 0
+        validator.update({"phrases": [3]})
+    return op
@@ -0,0 +1,42 @@
+"""pytest integration: ``pytest benchmarks [--bench-json PATH]``.
+
+Without ``--bench-json`` every benchmark's setup and operation run once, as
+a smoke test.  With it, each benchmark is timed fully and the results are
+written to PATH when the session ends.
+"""
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.harness import to_json, write_json
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("m8py benchmarks")
+    group.addoption("--bench-json", metavar="PATH", default=None,
+                    help="time benchmarks fully and write JSON results to PATH")
+    group.addoption("--bench-repeat", type=int, default=5, help="timed runs per benchmark")
+    group.addoption("--bench-min-time", type=float, default=0.05, help="minimum seconds per run")
+
+
+def pytest_configure(config):
+    config._bench_results = []
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    path = config.getoption("--bench-json")
+    if path and config._bench_results:
+        write_json(to_json(config._bench_results, config.getoption("--bench-repeat"),
+                           config.getoption("--bench-min-time")), path)
+
+
+@pytest.fixture
+def bench_settings(request):
+    config = request.config
+    return {
+        "timed": config.getoption("--bench-json") is not None,
+        "repeat": config.getoption("--bench-repeat"),
+        "min_time": config.getoption("--bench-min-time"),
+        "results": config._bench_results,
+    }
@@ -0,0 +1,69 @@
+"""Deterministic synthetic inputs for the benchmarks.
+
+Everything comes from ``m8py.testing.corpus`` with a fixed seed, so two
+runs (or two machines) time the same bytes.  Helpers are cached: a
+benchmark's setup may ask for the same song repeatedly without paying for
+it again.
+"""
+from __future__ import annotations
+
+import dataclasses
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from m8py.format.reader import M8FileReader
+from m8py.models.instrument import Instrument, read_instrument
+from m8py.models.song import Song
+from m8py.models.version import M8FileType
+from m8py.testing import corpus
+from m8py.testing.corpus import FILE_TYPES, LAYOUTS
+
+__all__ = ["LAYOUTS", "SEED", "corpus_file", "instrument", "scratch_dir", "song", "song_bytes"]
+
+SEED = 0x4D38
+
+
+def _profile(density: float) -> corpus.Profile:
+    return dataclasses.replace(corpus.PROFILES["typical"], density=density)
+
+
+def instrument(index: int) -> Instrument:
+    """A generated instrument; every index is a different one."""
+    data = corpus.instrument_bytes("v6.5", SEED + index, "full")
+    reader = M8FileReader(data)
+    return read_instrument(reader, M8FileType.from_reader(reader))
+
+
+@lru_cache(maxsize=None)
+def song_bytes(layout: str = "v6.5", density: float = 0.75) -> bytes:
+    """A typical-profile song with ``density`` of its slots in use."""
+    return corpus.song_bytes(layout, SEED, _profile(density))
+
+
+@lru_cache(maxsize=None)
+def song(layout: str = "v6.5", density: float = 0.75) -> Song:
+    """Decoded ``song_bytes``; callers must not modify the result."""
+    reader = M8FileReader(song_bytes(layout, density))
+    return Song.from_reader(reader, M8FileType.from_reader(reader))
+
+
+@lru_cache(maxsize=None)
+def _scratch() -> tempfile.TemporaryDirectory:
+    return tempfile.TemporaryDirectory(prefix="m8py-bench-")
+
+
+def scratch_dir() -> Path:
+    """A directory for benchmark files, removed when the process exits."""
+    return Path(_scratch().name)
+
+
+@lru_cache(maxsize=None)
+def _corpus() -> dict[tuple[str, str], Path]:
+    paths = corpus.generate(len(FILE_TYPES) * len(LAYOUTS), SEED, out=scratch_dir() / "corpus")
+    return {tuple(path.stem.split("-", 2)[1:]): path for path in paths}
+
+
+def corpus_file(file_type: str, layout: str = "v6.5") -> Path:
+    """A generated file of one type and layout, e.g. ``("scale", "v4.1")``."""
+    return _corpus()[file_type, layout]
@@ -0,0 +1,175 @@
+"""Benchmark registry, timer and JSON results.
+
+A benchmark is a setup function that prepares its inputs and returns the
+zero-argument operation to time.  Setup is never timed.  Each benchmark is
+calibrated so one run lasts at least ``min_time`` seconds, then run
+``repeat`` times; results record the per-operation time of every run plus
+their median and median absolute deviation (MAD).
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import pkgutil
+import platform
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+from m8py.bench import summarize
+
+SCHEMA_VERSION = 1
+
+Setup = Callable[[], Callable[[], Any]]
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    group: str
+    setup: Setup
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    number: int
+    runs: list[float] = field(default_factory=list)
+
+    @property
+    def median(self) -> float:
+        return summarize(self.runs)[0]
+
+    @property
+    def mad(self) -> float:
+        return summarize(self.runs)[1]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "group": self.group,
+            "number": self.number,
+            "runs": self.runs,
+            "median": self.median,
+            "mad": self.mad,
+        }
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, params: Sequence[Any] | None = None,
+              ids: Sequence[str] | None = None) -> Callable:
+    """Register a setup function as one benchmark, or one per parameter.
+
+    The group is the defining module's name without its ``bench_`` prefix;
+    parameterized benchmarks are named ``group.name[id]``.
+    """
+    def decorate(setup: Callable) -> Callable:
+        group = setup.__module__.rsplit(".", 1)[-1].removeprefix("bench_")
+        if params is None:
+            _register(Benchmark(f"{group}.{name}", group, setup))
+        else:
+            labels = ids if ids is not None else [str(p) for p in params]
+            for label, param in zip(labels, params):
+                _register(Benchmark(f"{group}.{name}[{label}]", group,
+                                    lambda p=param: setup(p)))
+        return setup
+    return decorate
+
+
+def _register(bench: Benchmark) -> None:
+    if bench.name in BENCHMARKS:
+        raise ValueError(f"duplicate benchmark {bench.name!r}")
+    BENCHMARKS[bench.name] = bench
+
+
+def discover() -> dict[str, Benchmark]:
+    """Import every ``benchmarks.bench_*`` module and return the registry."""
+    package = importlib.import_module("benchmarks")
+    for module in pkgutil.iter_modules(package.__path__):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"benchmarks.{module.name}")
+    return BENCHMARKS
+
+
+def select(benchmarks: Iterable[Benchmark], keyword: str | None = None) -> list[Benchmark]:
+    """Benchmarks whose name contains ``keyword``, sorted by name."""
+    return sorted((b for b in benchmarks if not keyword or keyword in b.name),
+                  key=lambda b: b.name)
+
+
+def measure(bench: Benchmark, repeat: int = 5, min_time: float = 0.05) -> Result:
+    """Time one benchmark; see the module docstring."""
+    op = bench.setup()
+    op()  # warm caches before calibrating
+    number = 1
+    while True:
+        elapsed = _time(op, number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed * 4 >= min_time else 8
+    result = Result(bench.name, bench.group, number)
+    result.runs = [_time(op, number) / number for _ in range(repeat)]
+    return result
+
+
+def _time(op: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        op()
+    return time.perf_counter() - start
+
+
+def environment() -> dict[str, Any]:
+    """Machine and interpreter details stored with every result file."""
+    try:
+        from importlib.metadata import version
+        m8py_version = version("m8py")
+    except Exception:
+        m8py_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "m8py": m8py_version,
+    }
+
+
+def to_json(results: Iterable[Result], repeat: int, min_time: float) -> dict[str, Any]:
+    return {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "settings": {"repeat": repeat, "min_time": min_time},
+        "benchmarks": {r.name: r.to_dict() for r in results},
+    }
+
+
+def write_json(document: dict[str, Any], path: str | Path | None) -> None:
+    """Write results to ``path``, or to stdout if it is None or ``-``."""
+    text = json.dumps(document, indent=2) + "\n"
+    if path is None or str(path) == "-":
+        sys.stdout.write(text)
+    else:
+        Path(path).write_text(text)
+
+
+def format_table(results: Iterable[Result]) -> str:
+    rows = [(r.name, _fmt(r.median), _fmt(r.mad), str(r.number)) for r in results]
+    header = ("benchmark", "median", "mad", "loops")
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(4)]
+    lines = ["  ".join(cell.ljust(w) if i == 0 else cell.rjust(w)
+                       for i, (cell, w) in enumerate(zip(row, widths)))
+             for row in [header, *rows]]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.harness import discover, measure, select
+
+_BENCHMARKS = select(discover().values())
+
+
+@pytest.mark.parametrize("bench", _BENCHMARKS, ids=[b.name for b in _BENCHMARKS])
+def test_benchmark(bench, bench_settings):
+    if not bench_settings["timed"]:
+        bench.setup()()
+        return
+    result = measure(bench, repeat=bench_settings["repeat"], min_time=bench_settings["min_time"])
+    assert result.median > 0
+    bench_settings["results"].append(result)
@@ -1,7 +1,9 @@
 """m8py - Python library for Dirtywave M8 tracker files."""
 
 from m8py.io import load, load_song, load_instrument, load_theme, load_scale, save
-from m8py.validate import validate
+from m8py.validate import validate, validate_bytes, validate_instrument, Validator
+from m8py.batch import validate_many
+from m8py.compact import compact, dedupe
 from m8py.models.song import Song
 from m8py.models.instrument import (
     WavSynth, MacroSynth, Sampler, FMSynth, HyperSynth,
@@ -22,7 +24,9 @@ __all__ = [
     # I/O
     "load", "load_song", "load_instrument", "load_theme", "load_scale", "save",
     # Validation
-    "validate",
+    "validate", "validate_bytes", "validate_instrument", "validate_many", "Validator",
+    # Maintenance
+    "compact", "dedupe",
     # Core models
     "Song", "M8Version", "Theme", "Scale",
     # Instruments
@@ -0,0 +1,70 @@
+"""Command-line entry point: ``python -m m8py <command> ...``.
+
+Commands:
+    validate    Validate songs and instruments, printing JSON Lines reports.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Sequence
+
+from m8py.batch import validate_many
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m m8py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser(
+        "validate",
+        help="validate .m8s/.m8i files",
+        description="Validate every song and instrument under the given paths. "
+                    "Prints one JSON object per file to stdout and a summary to stderr.",
+    )
+    check.add_argument("paths", nargs="+", metavar="PATH", help="files or directories")
+    check.add_argument("-j", "--jobs", type=int, default=None,
+                       help="worker processes (default: CPU count)")
+    check.add_argument("--fail-on", choices=("error", "warning", "never"), default="error",
+                       help="exit with status 1 if any file has issues of this "
+                            "severity or fails to load (default: error)")
+
+    args = parser.parse_args(argv)
+    return _validate(args)
+
+
+def _validate(args: argparse.Namespace) -> int:
+    start = time.perf_counter()
+    files = unreadable = 0
+    totals = {"error": 0, "warning": 0, "info": 0}
+    out = sys.stdout
+    for report in validate_many(args.paths, jobs=args.jobs):
+        out.write(report.to_json() + "\n")
+        out.flush()
+        files += 1
+        unreadable += report.error is not None
+        for severity, count in report.counts.items():
+            totals[severity] += count
+
+    elapsed = time.perf_counter() - start
+    print(f"validated {files} files in {elapsed:.2f}s: {unreadable} unreadable, "
+          f"{totals['error']} errors, {totals['warning']} warnings, {totals['info']} info",
+          file=sys.stderr)
+
+    if args.fail_on == "never":
+        return 0
+    failing = totals["error"] + unreadable
+    if args.fail_on == "warning":
+        failing += totals["warning"]
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        # Output closed early (e.g. piped into head): silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
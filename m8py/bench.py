@@ -0,0 +1,180 @@
+"""Compare benchmark result files and flag regressions.
+
+``python -m m8py.bench compare baseline.json current.json`` reads two
+result files written by the ``benchmarks/`` suite, prints a table of
+per-benchmark changes and exits with status 1 if any benchmark got slower
+by more than the noise allows.
+
+A benchmark counts as regressed when its median time grew by more than
+both ``threshold`` (relative) and ``sigma`` combined robust standard
+deviations of the two measurements, where each deviation is estimated as
+1.4826 x the MAD of that file's runs.  Noisy benchmarks therefore need a
+larger change to trip the gate than stable ones.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Sequence, Union
+
+# MAD to standard deviation for normally distributed noise
+_MAD_TO_SIGMA = 1.4826
+
+# Status values, in the order the summary lists them
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+NEW = "new"
+MISSING = "missing"
+_STATUS_ORDER = {s: n for n, s in enumerate((REGRESSION, IMPROVEMENT, UNCHANGED, NEW, MISSING))}
+
+
+@dataclass
+class Comparison:
+    """One benchmark in both result files.
+
+    Times are per operation, in seconds; ``None`` where the benchmark is
+    absent from one of the files.  ``noise`` is the change, relative to the
+    baseline, that the measurements' spread can explain.
+    """
+    name: str
+    baseline: float | None
+    current: float | None
+    noise: float
+    status: str
+
+    @property
+    def delta(self) -> float | None:
+        """Relative change of the median, e.g. ``0.12`` for 12% slower."""
+        if self.baseline is None or self.current is None or self.baseline == 0:
+            return None
+        return self.current / self.baseline - 1.0
+
+
+def summarize(runs: Sequence[float]) -> tuple[float, float]:
+    """Median and median absolute deviation of a list of run times."""
+    median = statistics.median(runs)
+    return median, statistics.median(abs(run - median) for run in runs)
+
+
+def load_results(path: Union[str, Path]) -> dict[str, Any]:
+    """Read a result file written by the benchmark suite."""
+    document = json.loads(Path(path).read_text())
+    if not isinstance(document, dict) or "benchmarks" not in document:
+        raise ValueError(f"{path}: not a benchmark result file")
+    return document
+
+
+def compare(baseline: Mapping[str, Any], current: Mapping[str, Any],
+            threshold: float = 0.05, sigma: float = 3.0) -> list[Comparison]:
+    """Compare two result documents benchmark by benchmark.
+
+    Args:
+        baseline: Parsed baseline result file.
+        current: Parsed result file to check.
+        threshold: Smallest relative change ever reported, e.g. 0.05 = 5%.
+        sigma: How many combined robust standard deviations a change must
+            exceed.
+
+    Returns:
+        One Comparison per benchmark in either file, regressions first.
+    """
+    base, cur = baseline["benchmarks"], current["benchmarks"]
+    comparisons = []
+    for name in sorted(base.keys() | cur.keys()):
+        if name not in cur:
+            comparisons.append(Comparison(name, _stats(base[name])[0], None, 0.0, MISSING))
+            continue
+        if name not in base:
+            comparisons.append(Comparison(name, None, _stats(cur[name])[0], 0.0, NEW))
+            continue
+        (b_median, b_mad), (c_median, c_mad) = _stats(base[name]), _stats(cur[name])
+        spread = sigma * _MAD_TO_SIGMA * math.hypot(b_mad, c_mad)
+        noise = spread / b_median if b_median else 0.0
+        limit = max(threshold * b_median, spread)
+        if c_median - b_median > limit:
+            status = REGRESSION
+        elif b_median - c_median > limit:
+            status = IMPROVEMENT
+        else:
+            status = UNCHANGED
+        comparisons.append(Comparison(name, b_median, c_median, noise, status))
+    comparisons.sort(key=lambda c: _STATUS_ORDER[c.status])
+    return comparisons
+
+
+def _stats(entry: Mapping[str, Any]) -> tuple[float, float]:
+    """Median and MAD of a result entry, recomputed from its runs when present."""
+    runs = entry.get("runs")
+    if runs:
+        return summarize(runs)
+    return entry["median"], entry.get("mad", 0.0)
+
+
+def format_comparison(comparisons: Sequence[Comparison]) -> str:
+    """Render comparisons as a fixed-width text table."""
+    header = ("benchmark", "baseline", "current", "change", "noise", "status")
+    rows = [header] + [(
+        c.name,
+        _format_time(c.baseline),
+        _format_time(c.current),
+        "" if c.delta is None else f"{c.delta:+.1%}",
+        f"±{c.noise:.1%}" if c.status not in (NEW, MISSING) else "",
+        c.status,
+    ) for c in comparisons]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) if i in (0, 5) else cell.rjust(w)
+                       for i, (cell, w) in enumerate(zip(row, widths))).rstrip()
+             for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    counts = {s: sum(c.status == s for c in comparisons) for s in _STATUS_ORDER}
+    lines.append("")
+    lines.append(", ".join(f"{n} {s}" + ("s" if n != 1 and s in (REGRESSION, IMPROVEMENT) else "")
+                           for s, n in counts.items() if n))
+    return "\n".join(lines)
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m m8py.bench")
+    commands = parser.add_subparsers(dest="command", required=True)
+    cmp = commands.add_parser(
+        "compare", help="compare two benchmark result files",
+        description="Compare benchmark results and exit with status 1 on regressions.",
+    )
+    cmp.add_argument("baseline", help="baseline result JSON")
+    cmp.add_argument("current", help="result JSON to check")
+    cmp.add_argument("--threshold", type=float, default=0.05,
+                     help="minimum relative change to report (default: 0.05)")
+    cmp.add_argument("--sigma", type=float, default=3.0,
+                     help="noise multiplier; changes within this many robust standard "
+                          "deviations are ignored (default: 3)")
+    cmp.add_argument("--fail-on-missing", action="store_true",
+                     help="also fail if a baseline benchmark is missing from current")
+    args = parser.parse_args(argv)
+
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    if baseline.get("environment") != current.get("environment"):
+        print("note: result files come from different environments", file=sys.stderr)
+    comparisons = compare(baseline, current, threshold=args.threshold, sigma=args.sigma)
+    print(format_comparison(comparisons))
+
+    failing = {REGRESSION, MISSING} if args.fail_on_missing else {REGRESSION}
+    return 1 if any(c.status in failing for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""Garbage-collect and renumber the slots of a Song.
+
+``compact()`` clears every phrase, chain, table and instrument that cannot
+be reached from the song grid (or from an active MIDI mapping), and can
+renumber the surviving slots densely from 0.  References in song rows,
+chains, phrases, tables and MIDI mappings are rewritten to match.
+
+``dedupe()`` merges phrase, chain and table slots whose encoded bytes are
+identical into one canonical slot and clears the duplicates.
+
+Slots a lenient load kept as RawSlot are never merged or rewritten.  Their
+references are unknown, so ``compact()`` refuses a song that has any.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Callable
+
+from m8py.format.constants import InstrumentKind, N_INSTRUMENTS, N_TABLES, NOTE_OFF_THRESHOLD
+from m8py.format.writer import M8FileWriter
+from m8py.index import SongIndex, fx_slot_targets, is_active_mapping
+from m8py.models.chain import Chain, ChainStep
+from m8py.models.instrument import EmptyInstrument
+from m8py.models.phrase import Phrase
+from m8py.models.raw import RawSlot
+from m8py.models.song import Song
+from m8py.models.table import Table
+
+Remap = dict[str, dict[int, int]]
+
+# Sections whose slots can reference others
+_SOURCE_SECTIONS = ("song_steps", "chains", "phrases", "tables", "instruments", "midi_mappings")
+
+# Sections compact() manages, with the factory for a cleared slot
+_EMPTY_SLOTS: dict[str, Callable[[], object]] = {
+    "chains": Chain,
+    "phrases": Phrase,
+    "tables": Table,
+    "instruments": EmptyInstrument,
+}
+
+
+def compact(song: Song, renumber: bool = False) -> Remap:
+    """Clear unreachable slots and optionally renumber live ones densely.
+
+    A slot is live when it can be reached from the song grid or from an
+    active MIDI mapping, following chain, phrase, instrument and FX slot
+    references (TBL, INS, ...).  Each live instrument keeps its own table.
+
+    With ``renumber=True`` live chains, phrases and instruments are moved to
+    slots 0..n-1 in their original order, and every reference is rewritten.
+    Instrument tables move with their instrument; other live tables keep
+    their slot unless it is now taken, in which case they move to the first
+    free slot above the instrument range.
+
+    Args:
+        song: The song to compact, modified in place.
+        renumber: Also renumber live slots densely.
+
+    Returns:
+        ``{section: {old_slot: new_slot}}`` for every live slot of
+        ``"chains"``, ``"phrases"``, ``"tables"`` and ``"instruments"``.
+        Slots missing from the table were cleared.
+
+    Raises:
+        ValueError: The song holds RawSlot placeholders from a lenient load.
+    """
+    raw = [f"{section}[{slot}]" for section in _SOURCE_SECTIONS
+           for slot, item in enumerate(getattr(song, section)) if isinstance(item, RawSlot)]
+    if raw:
+        raise ValueError(f"cannot compact a song with undecodable slots: {', '.join(raw)}")
+    index = SongIndex(song)
+    live = index.reachable(roots=("song_steps", "midi_mappings"))
+
+    remap: Remap = {}
+    for section in ("chains", "phrases", "instruments"):
+        slots = sorted(live[section])
+        remap[section] = ({old: new for new, old in enumerate(slots)} if renumber
+                          else {slot: slot for slot in slots})
+    remap["tables"] = _table_remap(live["tables"], remap["instruments"], renumber)
+
+    for section, factory in _EMPTY_SLOTS.items():
+        _relocate(song, section, remap[section], factory)
+    if renumber:
+        rewrite_refs(song, remap)
+    return remap
+
+
+def dedupe(song: Song, transpose: bool = False) -> Remap:
+    """Merge identical phrase, chain and table slots.
+
+    Slots are compared by their encoded bytes.  The lowest slot of each
+    group is kept, references to the others are pointed at it, and the
+    duplicates are cleared.  Empty slots and RawSlots are left alone, as are
+    tables that belong to an instrument (instrument N always plays table N).
+
+    With ``transpose=True`` phrases that differ only by a uniform note
+    offset are merged as well, and the offset moves into the
+    ``ChainStep.transpose`` of every chain step that plays the duplicate.
+    A phrase is only merged this way if every such transpose stays within
+    the signed byte range.  This assumes the phrase's instruments follow
+    chain transpose.
+
+    Args:
+        song: The song to deduplicate, modified in place.
+        transpose: Also merge transposed copies of phrases.
+
+    Returns:
+        ``{section: {duplicate_slot: kept_slot}}`` for ``"tables"``,
+        ``"phrases"`` and ``"chains"``.
+    """
+    bound = {slot for slot, inst in enumerate(song.instruments)
+             if isinstance(inst, RawSlot)
+             or getattr(inst, "kind", InstrumentKind.NONE) != InstrumentKind.NONE}
+    tables = _merge_identical(song.tables, Table, skip=bound)
+    rewrite_refs(song, {"tables": tables})
+
+    phrases = _merge_phrases(song, transpose)
+
+    chains = _merge_identical(song.chains, Chain)
+    rewrite_refs(song, {"chains": chains})
+    return {"tables": tables, "phrases": phrases, "chains": chains}
+
+
+def rewrite_refs(song: Song, remap: Remap) -> None:
+    """Rewrite every slot reference in ``song`` through ``remap``.
+
+    ``remap`` maps section names to ``{old: new}`` tables; slots missing
+    from a table are left unchanged.
+    """
+    chains = remap.get("chains", {})
+    phrases = remap.get("phrases", {})
+    instruments = remap.get("instruments", {})
+    fx_remaps = {cmd: remap.get(section, {})
+                 for cmd, section in fx_slot_targets(song).items()}
+
+    if chains:
+        for row in _decoded(song.song_steps):
+            row.tracks = [chains.get(c, c) for c in row.tracks]
+    if phrases:
+        for chain in _decoded(song.chains):
+            for step in chain.steps:
+                step.phrase = phrases.get(step.phrase, step.phrase)
+    for phrase in _decoded(song.phrases):
+        for step in phrase.steps:
+            step.instrument = instruments.get(step.instrument, step.instrument)
+            _rewrite_fx(fx_remaps, (step.fx1, step.fx2, step.fx3))
+    for table in _decoded(song.tables):
+        for step in table.steps:
+            _rewrite_fx(fx_remaps, (step.fx1, step.fx2, step.fx3))
+    if instruments:
+        for mapping in _decoded(song.midi_mappings):
+            if is_active_mapping(mapping):
+                mapping.instr_index = instruments.get(mapping.instr_index, mapping.instr_index)
+
+
+def _decoded(items: list) -> list:
+    """The slots of a section that are not RawSlot placeholders."""
+    return [item for item in items if not isinstance(item, RawSlot)]
+
+
+def _rewrite_fx(fx_remaps: dict[int, dict[int, int]], fxs) -> None:
+    for fx in fxs:
+        table = fx_remaps.get(fx.command)
+        if table:
+            fx.value = table.get(fx.value, fx.value)
+
+
+def _encode(obj) -> bytes:
+    writer = M8FileWriter()
+    obj.write(writer)
+    return writer.to_bytes()
+
+
+def _merge_identical(items: list, factory: Callable[[], object],
+                     skip: set[int] = frozenset()) -> dict[int, int]:
+    empty = _encode(factory())
+    first: dict[bytes, int] = {}
+    remap: dict[int, int] = {}
+    for slot, item in enumerate(items):
+        if slot in skip or isinstance(item, RawSlot):
+            continue
+        data = _encode(item)
+        if data == empty:
+            continue
+        kept = first.setdefault(data, slot)
+        if kept != slot:
+            remap[slot] = kept
+            items[slot] = factory()
+    return remap
+
+
+def _transposed_key(data: bytes) -> tuple[bytes, int] | None:
+    """Phrase bytes with notes shifted so the lowest is 0, and that lowest note."""
+    notes = data[::9]
+    played = [n for n in notes if n < NOTE_OFF_THRESHOLD]
+    if not played:
+        return None
+    base = min(played)
+    key = bytearray(data)
+    key[::9] = bytes(n - base if n < NOTE_OFF_THRESHOLD else n for n in notes)
+    return bytes(key), base
+
+
+def _merge_phrases(song: Song, transpose: bool) -> dict[int, int]:
+    users: dict[int, list[ChainStep]] = defaultdict(list)
+    for chain in _decoded(song.chains):
+        for step in chain.steps:
+            users[step.phrase].append(step)
+
+    empty = _encode(Phrase())
+    # Phrase bytes -> (kept slot, note offset) of the first phrase with them
+    exact: dict[bytes, tuple[int, int]] = {}
+    shifted: dict[bytes, tuple[int, int]] = {}
+    remap: dict[int, int] = {}
+    for slot, phrase in enumerate(song.phrases):
+        if isinstance(phrase, RawSlot):
+            continue
+        data = _encode(phrase)
+        if data == empty:
+            continue
+        resolved = exact.get(data)
+        if resolved is None:
+            kept, shift = slot, 0
+            if transpose:
+                keyed = _transposed_key(data)
+                if keyed is not None:
+                    key, base = keyed
+                    kept, kept_base = shifted.setdefault(key, (slot, base))
+                    shift = base - kept_base
+            exact[data] = (kept, shift)
+        else:
+            kept, shift = resolved
+        if kept != slot and not all(
+            -0x80 <= _signed(step.transpose) + shift < 0x80 for step in users[slot]
+        ):
+            kept, shift = slot, 0
+            if resolved is None:
+                exact[data] = (slot, 0)
+        if kept == slot:
+            continue
+        for step in users[slot]:
+            step.phrase = kept
+            step.transpose = (step.transpose + shift) & 0xFF
+        remap[slot] = kept
+        song.phrases[slot] = Phrase()
+    return remap
+
+
+def _signed(byte: int) -> int:
+    return byte - 0x100 if byte >= 0x80 else byte
+
+
+def _table_remap(live: set[int], instruments: dict[int, int], renumber: bool) -> dict[int, int]:
+    if not renumber:
+        return {slot: slot for slot in sorted(live)}
+    remap = {old: new for old, new in instruments.items() if old in live}
+    taken = set(remap.values())
+    # Free slots above the instrument range first, then any left below it
+    free = (s for s in (*range(N_INSTRUMENTS, N_TABLES), *range(N_INSTRUMENTS))
+            if s not in taken and s not in live)
+    for slot in sorted(live - remap.keys()):
+        new = next(free) if slot in taken else slot
+        remap[slot] = new
+        taken.add(new)
+    return remap
+
+
+def _relocate(song: Song, section: str, remap: dict[int, int],
+              factory: Callable[[], object]) -> None:
+    items = getattr(song, section)
+    moved = [factory() for _ in items]
+    for old, new in remap.items():
+        moved[new] = items[old]
+    items[:] = moved
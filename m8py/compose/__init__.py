@@ -1,13 +1,15 @@
 """Composition tools for building M8 songs programmatically."""
 
 from m8py.compose.builder import SongBuilder
-from m8py.compose.declarative import compose, TrackDef
+from m8py.compose.declarative import compose, plan, TrackDef, CompositionPlan
 from m8py.compose.allocator import SlotAllocator
-from m8py.compose.notation import normalize_note, parse_pattern, NOTE_OFF
+from m8py.compose.notation import normalize_note, parse_pattern, parse_patterns, iter_pattern, iter_phrases, NOTE_OFF
 from m8py.compose.samples import export_to_sdcard, ExportResult
+from m8py.compose.batch import compose_many, ComposeJob
 
 __all__ = [
-    "SongBuilder", "compose", "TrackDef", "SlotAllocator",
-    "normalize_note", "parse_pattern", "NOTE_OFF",
+    "SongBuilder", "compose", "plan", "TrackDef", "CompositionPlan", "SlotAllocator",
+    "normalize_note", "parse_pattern", "parse_patterns", "iter_pattern", "iter_phrases", "NOTE_OFF",
     "export_to_sdcard", "ExportResult",
+    "compose_many", "ComposeJob",
 ]
@@ -1,63 +1,122 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Callable, Iterable, Sequence
 
 from m8py.format.constants import (
-    N_PHRASES, N_CHAINS, N_INSTRUMENTS, N_TABLES, N_GROOVES,
+    EMPTY, N_PHRASES, N_CHAINS, N_INSTRUMENTS, N_TABLES, N_GROOVES,
 )
 from m8py.format.errors import M8ResourceExhaustedError
+from m8py.format.writer import M8FileWriter
+from m8py.index import SongIndex
+from m8py.models.chain import Chain
+from m8py.models.groove import Groove
+from m8py.models.instrument import write_instrument
+from m8py.models.phrase import Phrase
+from m8py.models.profile import version_profile
+from m8py.models.song import Song
+from m8py.models.table import Table
+
+
+def _encode(obj: Any) -> bytes:
+    """Dedup key for an object: its M8 encoding, or its repr for other objects.
+
+    Keys are compared in full on lookup, so distinct objects never alias.
+    """
+    if not hasattr(obj, "write"):
+        return repr(obj).encode()
+    writer = M8FileWriter()
+    obj.write(writer)
+    return writer.to_bytes()
+
+
+def _encode_instrument(obj: Any) -> bytes:
+    """Dedup key for an instrument: the 215 bytes the song will contain."""
+    writer = M8FileWriter()
+    write_instrument(obj, writer)
+    return writer.to_bytes()
 
 
 @dataclass
 class _SlotPool:
-    """Manages allocation for a single resource type."""
+    """Manages allocation for a single resource type.
+
+    Occupancy is a bitmap held in one int, so finding the lowest free slot
+    or a run of free slots is a handful of integer operations regardless of
+    how many slots are taken.  Released slots are reused.
+    """
     name: str
     capacity: int
-    _next: int = 0
-    _pinned: set[int] = field(default_factory=set)
+    _occupied: int = 0  # bit i set = slot i taken
     _allocated: dict[int, Any] = field(default_factory=dict)
-    _dedup_index: dict[int, int] | None = None  # hash -> slot
+    encode: Callable[[Any], bytes] = field(default=_encode, repr=False)
+    _dedup_index: dict[bytes, int] | None = None  # encoded bytes -> slot
+    _keys: dict[int, bytes] = field(default_factory=dict, repr=False)  # slot -> encoded bytes
 
     def enable_dedup(self) -> None:
         self._dedup_index = {}
 
     def pin(self, slot: int, obj: Any) -> None:
         """Reserve a specific slot."""
-        if slot < 0 or slot >= self.capacity:
-            raise ValueError(f"{self.name} slot {slot} out of range [0, {self.capacity})")
-        self._pinned.add(slot)
-        self._allocated[slot] = obj
-        if self._dedup_index is not None:
-            h = _obj_hash(obj)
-            self._dedup_index[h] = slot
+        self._check_slot(slot)
+        self._place(slot, obj, self._key(obj))
 
     def alloc(self, obj: Any) -> int:
-        """Allocate the next available slot. Returns slot index."""
+        """Allocate the lowest free slot. Returns slot index."""
         # Check dedup first
-        if self._dedup_index is not None:
-            h = _obj_hash(obj)
-            if h in self._dedup_index:
-                return self._dedup_index[h]
-
-        # Find next free slot
-        while self._next < self.capacity and self._next in self._pinned:
-            self._next += 1
-
-        if self._next >= self.capacity:
-            raise M8ResourceExhaustedError(
-                self.name, len(self._allocated), self.capacity
-            )
-
-        slot = self._next
-        self._next += 1
-        self._allocated[slot] = obj
-
-        if self._dedup_index is not None:
-            h = _obj_hash(obj)
-            self._dedup_index[h] = slot
-
+        key = self._key(obj)
+        if key is not None and key in self._dedup_index:
+            return self._dedup_index[key]
+
+        free = self._free_mask()
+        if not free:
+            raise M8ResourceExhaustedError(self.name, self.used, self.capacity)
+        slot = (free & -free).bit_length() - 1
+        self._place(slot, obj, key)
         return slot
 
+    def alloc_many(self, objs: Iterable[Any]) -> list[int]:
+        """Allocate a slot for each object (deduplicating if enabled)."""
+        return [self.alloc(obj) for obj in objs]
+
+    def alloc_range(self, objs: Sequence[Any]) -> int:
+        """Allocate consecutive slots for ``objs``. Returns the first slot.
+
+        Objects are placed as given, without deduplication, so that slot
+        ``first + i`` always holds ``objs[i]``.
+        """
+        count = len(objs)
+        if count == 0:
+            raise ValueError(f"cannot allocate an empty {self.name} range")
+        # Bit i of runs is set when slots i..i+count-1 are all free
+        runs = free = self._free_mask()
+        for shift in range(1, count):
+            runs &= free >> shift
+        if not runs:
+            raise M8ResourceExhaustedError(self.name, self.used, self.capacity, requested=count)
+        first = (runs & -runs).bit_length() - 1
+        for i, obj in enumerate(objs):
+            self._place(first + i, obj, self._key(obj))
+        return first
+
+    def release(self, slot: int) -> None:
+        """Free an allocated or pinned slot so it can be reused."""
+        self._check_slot(slot)
+        if not self._occupied >> slot & 1:
+            raise ValueError(f"{self.name} slot {slot} is not allocated")
+        self._occupied &= ~(1 << slot)
+        del self._allocated[slot]
+        key = self._keys.pop(slot, None)
+        if key is not None and self._dedup_index.get(key) == slot:
+            del self._dedup_index[key]
+
+    def is_free(self, slot: int) -> bool:
+        self._check_slot(slot)
+        return not self._occupied >> slot & 1
+
+    def get(self, slot: int) -> Any:
+        """The object held in a slot, or None if it is free."""
+        return self._allocated.get(slot)
+
     @property
     def used(self) -> int:
         return len(self._allocated)
@@ -66,10 +125,25 @@ class _SlotPool:
     def remaining(self) -> int:
         return self.capacity - self.used
 
+    def _free_mask(self) -> int:
+        return ~self._occupied & ((1 << self.capacity) - 1)
+
+    def _key(self, obj: Any) -> bytes | None:
+        return self.encode(obj) if self._dedup_index is not None else None
 
-def _obj_hash(obj: Any) -> int:
-    """Hash an object for deduplication. Uses repr for general-purpose hashing."""
-    return hash(repr(obj))
+    def _check_slot(self, slot: int) -> None:
+        if slot < 0 or slot >= self.capacity:
+            raise ValueError(f"{self.name} slot {slot} out of range [0, {self.capacity})")
+
+    def _place(self, slot: int, obj: Any, key: bytes | None) -> None:
+        old = self._keys.pop(slot, None)
+        if old is not None and self._dedup_index.get(old) == slot:
+            del self._dedup_index[old]
+        self._occupied |= 1 << slot
+        self._allocated[slot] = obj
+        if key is not None:
+            self._keys[slot] = key
+            self._dedup_index[key] = slot
 
 
 class SlotAllocator:
@@ -83,7 +157,7 @@ class SlotAllocator:
         self._deduplicate = deduplicate
         self._phrases = _SlotPool("phrase", N_PHRASES)
         self._chains = _SlotPool("chain", N_CHAINS)
-        self._instruments = _SlotPool("instrument", N_INSTRUMENTS)
+        self._instruments = _SlotPool("instrument", N_INSTRUMENTS, encode=_encode_instrument)
         self._tables = _SlotPool("table", N_TABLES)
         self._grooves = _SlotPool("groove", N_GROOVES)
         if deduplicate:
@@ -93,6 +167,53 @@ class SlotAllocator:
             self._tables.enable_dedup()
             self._grooves.enable_dedup()
 
+    @staticmethod
+    def from_song(song: Song, deduplicate: bool = False) -> SlotAllocator:
+        """Create an allocator whose occupied slots mirror an existing song.
+
+        A phrase, chain, table or groove slot counts as occupied when its
+        bytes differ from an empty slot or something references it; an
+        instrument slot when it holds an instrument.  Groove 0, the song's
+        default groove, is always occupied.  The song is encoded once and
+        slots are compared as raw section bytes.  With ``deduplicate=True``
+        the occupied slots seed the dedup index, so adding identical
+        material reuses them.
+        """
+        alloc = SlotAllocator(deduplicate=deduplicate)
+        writer = M8FileWriter()
+        song.write(writer)
+        data = memoryview(writer.to_bytes())
+        spans = version_profile(song.version).sections
+        index = SongIndex(song)
+
+        for section, pool, empty in (
+            ("phrases", alloc._phrases, Phrase()),
+            ("chains", alloc._chains, Chain()),
+            ("tables", alloc._tables, Table()),
+            ("grooves", alloc._grooves, Groove()),
+            ("instruments", alloc._instruments, None),
+        ):
+            span = spans[section]
+            items = getattr(song, section)
+            empty_bytes = _encode(empty) if empty is not None else None
+            used = index.used_slots(section)
+            if section == "grooves":
+                used.add(0)
+            for slot in range(min(span.count, pool.capacity)):
+                raw = data[span.slot(slot)]
+                if section == "instruments":
+                    occupied = raw[0] != EMPTY
+                else:
+                    occupied = raw != empty_bytes
+                if occupied or slot in used:
+                    key = bytes(raw) if pool._dedup_index is not None else None
+                    pool._place(slot, items[slot], key)
+        return alloc
+
+    @property
+    def deduplicate(self) -> bool:
+        return self._deduplicate
+
     def alloc_phrase(self, phrase: Any) -> int:
         return self._phrases.alloc(phrase)
 
@@ -108,6 +229,20 @@ class SlotAllocator:
     def alloc_groove(self, groove: Any) -> int:
         return self._grooves.alloc(groove)
 
+    def alloc_phrases(self, phrases: Iterable[Any]) -> list[int]:
+        return self._phrases.alloc_many(phrases)
+
+    def alloc_chains(self, chains: Iterable[Any]) -> list[int]:
+        return self._chains.alloc_many(chains)
+
+    def alloc_phrase_range(self, phrases: Sequence[Any]) -> int:
+        """Place phrases in consecutive slots. Returns the first slot."""
+        return self._phrases.alloc_range(phrases)
+
+    def alloc_chain_range(self, chains: Sequence[Any]) -> int:
+        """Place chains in consecutive slots. Returns the first slot."""
+        return self._chains.alloc_range(chains)
+
     def pin_phrase(self, slot: int, phrase: Any) -> None:
         self._phrases.pin(slot, phrase)
 
@@ -123,6 +258,21 @@ class SlotAllocator:
     def pin_groove(self, slot: int, groove: Any) -> None:
         self._grooves.pin(slot, groove)
 
+    def release_phrase(self, slot: int) -> None:
+        self._phrases.release(slot)
+
+    def release_chain(self, slot: int) -> None:
+        self._chains.release(slot)
+
+    def release_instrument(self, slot: int) -> None:
+        self._instruments.release(slot)
+
+    def release_table(self, slot: int) -> None:
+        self._tables.release(slot)
+
+    def release_groove(self, slot: int) -> None:
+        self._grooves.release(slot)
+
     @property
     def phrases_used(self) -> int:
         return self._phrases.used
@@ -0,0 +1,116 @@
+"""Compose and save many songs in parallel.
+
+``compose_many()`` runs ``compose()`` plus serialization in a process pool.
+Workers write their ``.m8s`` files directly, so finished songs never travel
+back to the parent.  Instruments are sent to each worker once, through the
+pool initializer; jobs refer to them by index, so a few instruments shared
+by thousands of jobs are pickled once per worker rather than once per job.
+
+Example::
+
+    jobs = [ComposeJob(f"out/VAR{i:04}.m8s", tracks_for(i), name=f"VAR{i}")
+            for i in range(10_000)]
+    compose_many(jobs, workers=8)
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence, Union
+
+from m8py.compose.declarative import TrackDef, compose
+from m8py.io import save
+from m8py.models.instrument import Instrument
+
+
+@dataclass
+class ComposeJob:
+    """One song for ``compose_many()``.
+
+    Args:
+        path: Where the worker writes the ``.m8s`` file.
+        tracks: Track definitions, as for ``compose()``.
+        name: Song name.
+        tempo: Song tempo in BPM.
+        deduplicate: Passed to ``compose()``.
+    """
+    path: Union[str, Path]
+    tracks: list[TrackDef]
+    name: str = ""
+    tempo: float = 120.0
+    deduplicate: bool = False
+
+
+# A job as sent to a worker: instruments replaced by their shared index
+_WireJob = tuple[str, str, float, bool, list[tuple[int, object, int]]]
+
+_shared_instruments: list[Instrument] = []
+
+
+def compose_many(jobs: Sequence[ComposeJob], workers: int | None = None) -> list[Path]:
+    """Compose every job and write it to its ``path``.
+
+    Args:
+        jobs: The songs to build.
+        workers: Number of worker processes; defaults to the CPU count.
+            ``workers=1`` runs in the calling process.
+
+    Returns:
+        The written paths, in job order.
+
+    Raises:
+        The first exception raised by any job (e.g.
+        ``M8ResourceExhaustedError``); use ``compose.plan()`` to screen
+        jobs beforehand.
+    """
+    instruments, wire_jobs = _prepare(jobs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(wire_jobs)))
+
+    if workers == 1:
+        _init_worker(instruments)
+        try:
+            return [_run_job(job) for job in wire_jobs]
+        finally:
+            _init_worker([])
+
+    chunksize = max(1, len(wire_jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(instruments,)) as pool:
+        return list(pool.map(_run_job, wire_jobs, chunksize=chunksize))
+
+
+def _prepare(jobs: Sequence[ComposeJob]) -> tuple[list[Instrument], list[_WireJob]]:
+    """Collect distinct instrument objects and rewrite jobs to refer to them."""
+    instruments: list[Instrument] = []
+    index: dict[int, int] = {}
+    wire_jobs = []
+    for job in jobs:
+        tracks = []
+        for tdef in job.tracks:
+            key = id(tdef.instrument)
+            if key not in index:
+                index[key] = len(instruments)
+                instruments.append(tdef.instrument)
+            tracks.append((index[key], tdef.pattern, tdef.track))
+        wire_jobs.append((str(job.path), job.name, job.tempo, job.deduplicate, tracks))
+    return instruments, wire_jobs
+
+
+def _init_worker(instruments: list[Instrument]) -> None:
+    global _shared_instruments
+    _shared_instruments = instruments
+
+
+def _run_job(job: _WireJob) -> Path:
+    path, name, tempo, deduplicate, tracks = job
+    song = compose(
+        [TrackDef(instrument=_shared_instruments[i], pattern=pattern, track=track)
+         for i, pattern, track in tracks],
+        name=name, tempo=tempo, deduplicate=deduplicate,
+    )
+    save(song, path)
+    return Path(path)
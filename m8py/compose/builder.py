@@ -1,9 +1,12 @@
 from __future__ import annotations
-from typing import Union
+from typing import Any, Callable, Iterable, Sequence, Union
 
 from m8py.compose.allocator import SlotAllocator
 from m8py.compose.notation import parse_pattern
-from m8py.format.constants import STEPS_PER_PHRASE
+from m8py.format.constants import EMPTY, N_SONG_STEPS, STEPS_PER_PHRASE
+from m8py.format.errors import M8ResourceExhaustedError
+from m8py.format.offsets import CHAIN_SIZE, PHRASE_SIZE, SONG_STEP_SIZE
+from m8py.format.reader import M8FileReader
 from m8py.models.chain import Chain, ChainStep
 from m8py.models.groove import Groove
 from m8py.models.instrument import Instrument
@@ -35,6 +38,22 @@ class SongBuilder:
         self._last_instrument: int | None = None
         self._last_table: int | None = None
         self._last_groove: int | None = None
+        self._last_phrases: list[int] = []
+        self._last_chains: list[int] = []
+
+    @staticmethod
+    def from_song(song: Song, deduplicate: bool = False) -> SongBuilder:
+        """Continue building on an existing song, e.g. one loaded from disk.
+
+        The song is edited in place.  New phrases, chains, instruments,
+        tables and grooves only go into slots the song does not already
+        use; with ``deduplicate=True`` material identical to an existing
+        slot reuses that slot.
+        """
+        builder = SongBuilder(name=song.name, tempo=song.tempo)
+        builder._song = song
+        builder._alloc = SlotAllocator.from_song(song, deduplicate=deduplicate)
+        return builder
 
     @property
     def last_phrase(self) -> int | None:
@@ -44,6 +63,16 @@ class SongBuilder:
     def last_chain(self) -> int | None:
         return self._last_chain
 
+    @property
+    def last_phrases(self) -> list[int]:
+        """Slots assigned by the most recent add_phrases() call."""
+        return self._last_phrases
+
+    @property
+    def last_chains(self) -> list[int]:
+        """Slots assigned by the most recent add_chains() call."""
+        return self._last_chains
+
     @property
     def last_instrument(self) -> int | None:
         return self._last_instrument
@@ -65,31 +94,63 @@ class SongBuilder:
 
     def add_phrase(self, phrase: Union[Phrase, str]) -> SongBuilder:
         """Add a phrase (Phrase object or pattern string)."""
-        if isinstance(phrase, str):
-            steps = parse_pattern(phrase)
-            # Pad or truncate to 16 steps
-            if len(steps) < STEPS_PER_PHRASE:
-                steps.extend([PhraseStep() for _ in range(STEPS_PER_PHRASE - len(steps))])
-            phrase = Phrase(steps=steps[:STEPS_PER_PHRASE])
+        phrase = _to_phrase(phrase)
         slot = self._alloc.alloc_phrase(phrase)
         self._song.phrases[slot] = phrase
         self._last_phrase = slot
         return self
 
+    def add_phrases(self, phrases: Union[Iterable[Union[Phrase, str]], Any]) -> SongBuilder:
+        """Add many phrases in one allocation.
+
+        Accepts an iterable of Phrase objects or pattern strings, or any
+        buffer (``bytes``, a NumPy ``uint8`` array, ...) holding encoded
+        144-byte phrases back to back.  Without deduplication the phrases
+        occupy one contiguous slot range when one is free, else the lowest
+        free slots.  The slots are in ``last_phrases``.
+        """
+        items = _decode_block(phrases, PHRASE_SIZE, Phrase.from_reader, "phrase")
+        if items is None:
+            items = [_to_phrase(p) for p in phrases]
+        slots = self._alloc_block(items, self._alloc.alloc_phrase_range, self._alloc.alloc_phrases)
+        song_phrases = self._song.phrases
+        for slot, phrase in zip(slots, items):
+            song_phrases[slot] = phrase
+        self._last_phrases = slots
+        if slots:
+            self._last_phrase = slots[-1]
+        return self
+
     def add_chain(self, phrase_slots: list[int], transpose: int = 0) -> SongBuilder:
         """Add a chain referencing the given phrase slot indices."""
-        steps = []
-        for ps in phrase_slots:
-            steps.append(ChainStep(phrase=ps, transpose=transpose))
-        # Pad with empty steps
-        while len(steps) < 16:
-            steps.append(ChainStep())
-        chain = Chain(steps=steps[:16])
+        chain = _to_chain(phrase_slots, transpose)
         slot = self._alloc.alloc_chain(chain)
         self._song.chains[slot] = chain
         self._last_chain = slot
         return self
 
+    def add_chains(self, chains: Union[Iterable[Union[Chain, Sequence[int]]], Any],
+                   transpose: int = 0) -> SongBuilder:
+        """Add many chains in one allocation.
+
+        Accepts an iterable of Chain objects or phrase slot lists (as for
+        add_chain), or a buffer of encoded 32-byte chains back to back.
+        Without deduplication the chains occupy one contiguous slot range
+        when one is free, else the lowest free slots.  The slots are in
+        ``last_chains``.
+        """
+        items = _decode_block(chains, CHAIN_SIZE, Chain.from_reader, "chain")
+        if items is None:
+            items = [c if isinstance(c, Chain) else _to_chain(c, transpose) for c in chains]
+        slots = self._alloc_block(items, self._alloc.alloc_chain_range, self._alloc.alloc_chains)
+        song_chains = self._song.chains
+        for slot, chain in zip(slots, items):
+            song_chains[slot] = chain
+        self._last_chains = slots
+        if slots:
+            self._last_chain = slots[-1]
+        return self
+
     def add_table(self, table: Table) -> SongBuilder:
         """Add a table and allocate a slot."""
         slot = self._alloc.alloc_table(table)
@@ -109,6 +170,30 @@ class SongBuilder:
         self._song.song_steps[row].tracks[track] = chain
         return self
 
+    def set_song_rows(self, rows: Union[Iterable[Sequence[int]], Any],
+                      start: int = 0) -> SongBuilder:
+        """Set consecutive song rows from ``start``.
+
+        Each row lists chain slots for tracks 0-7; shorter rows are padded
+        with empty tracks.  A buffer of 8-byte rows back to back is also
+        accepted.
+        """
+        if _is_buffer(rows):
+            data = memoryview(rows).tobytes()
+            if len(data) % SONG_STEP_SIZE:
+                raise ValueError(f"song row buffer of {len(data)} bytes is not a "
+                                 f"multiple of {SONG_STEP_SIZE}")
+            rows = [data[i:i + SONG_STEP_SIZE] for i in range(0, len(data), SONG_STEP_SIZE)]
+        song_steps = self._song.song_steps
+        for row, tracks in enumerate(rows, start):
+            if not 0 <= row < N_SONG_STEPS:
+                raise ValueError(f"song row {row} out of range [0, {N_SONG_STEPS})")
+            tracks = list(tracks)
+            if len(tracks) > 8:
+                raise ValueError(f"song row {row} has {len(tracks)} tracks, max 8")
+            song_steps[row].tracks = tracks + [EMPTY] * (8 - len(tracks))
+        return self
+
     def set_tempo(self, tempo: float) -> SongBuilder:
         self._song.tempo = tempo
         return self
@@ -124,3 +209,58 @@ class SongBuilder:
     def build(self) -> Song:
         """Return the constructed Song."""
         return self._song
+
+    def _alloc_block(self, items: list, alloc_range: Callable[[list], int],
+                     alloc_many: Callable[[list], list[int]]) -> list[int]:
+        if not items:
+            return []
+        if self._alloc.deduplicate:
+            return alloc_many(items)
+        try:
+            first = alloc_range(items)
+        except M8ResourceExhaustedError as e:
+            # Enough free slots, just not in a row: place them one by one
+            if e.capacity - e.used < len(items):
+                raise
+            return alloc_many(items)
+        return list(range(first, first + len(items)))
+
+
+def _to_phrase(phrase: Union[Phrase, str]) -> Phrase:
+    if isinstance(phrase, str):
+        steps = parse_pattern(phrase)
+        # Pad or truncate to 16 steps
+        if len(steps) < STEPS_PER_PHRASE:
+            steps.extend([PhraseStep() for _ in range(STEPS_PER_PHRASE - len(steps))])
+        phrase = Phrase(steps=steps[:STEPS_PER_PHRASE])
+    return phrase
+
+
+def _to_chain(phrase_slots: Sequence[int], transpose: int) -> Chain:
+    steps = [ChainStep(phrase=ps, transpose=transpose) for ps in phrase_slots]
+    # Pad with empty steps
+    while len(steps) < 16:
+        steps.append(ChainStep())
+    return Chain(steps=steps[:16])
+
+
+def _is_buffer(obj: Any) -> bool:
+    if isinstance(obj, str):
+        return False
+    try:
+        memoryview(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def _decode_block(data: Any, size: int, decode: Callable[[M8FileReader], Any],
+                  kind: str) -> list | None:
+    """Decode a buffer of fixed-size encoded items, or None if not a buffer."""
+    if not _is_buffer(data):
+        return None
+    raw = memoryview(data).tobytes()
+    if len(raw) % size:
+        raise ValueError(f"{kind} buffer of {len(raw)} bytes is not a multiple of {size}")
+    reader = M8FileReader(raw)
+    return [decode(reader) for _ in range(len(raw) // size)]
@@ -1,14 +1,21 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Union
+from itertools import islice
+from typing import Iterable, Iterator, Union
 
+from m8py.compose.allocator import _encode_instrument
 from m8py.compose.builder import SongBuilder
-from m8py.compose.notation import parse_pattern
-from m8py.format.constants import STEPS_PER_PHRASE
+from m8py.compose.notation import iter_pattern
+from m8py.format.constants import (
+    EMPTY, N_CHAINS, N_INSTRUMENTS, N_PHRASES, N_SONG_STEPS, STEPS_PER_PHRASE,
+)
+from m8py.format.errors import M8ResourceExhaustedError
 from m8py.models.instrument import Instrument
 from m8py.models.phrase import Phrase, PhraseStep
 from m8py.models.song import Song
 
+PHRASES_PER_CHAIN = 16
+
 
 @dataclass
 class TrackDef:
@@ -17,8 +24,8 @@ class TrackDef:
     Args:
         instrument: The instrument to use for this track.
         pattern: Notes as a pattern string or list of PhraseSteps.
-            Can be longer than 16 steps — will be auto-split into
-            multiple phrases and chained.
+            Can be any length — every 16 steps become a phrase and
+            every 16 phrases a chain on the next song row.
         track: Which M8 track (0-7) to place this on.
     """
     instrument: Instrument
@@ -26,6 +33,24 @@ class TrackDef:
     track: int = 0
 
 
+@dataclass
+class CompositionPlan:
+    """Slot usage that ``compose()`` would need for a set of tracks.
+
+    ``overflow`` maps each resource that does not fit to
+    ``(needed, capacity)``.
+    """
+    phrases: int = 0
+    chains: int = 0
+    instruments: int = 0
+    song_rows: int = 0
+    overflow: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def fits(self) -> bool:
+        return not self.overflow
+
+
 def compose(
     tracks: list[TrackDef],
     name: str = "",
@@ -37,53 +62,176 @@ def compose(
     Handles:
     - Converting patterns to PhraseSteps
     - Splitting patterns longer than 16 steps into multiple phrases
-    - Creating chains from phrase sequences
-    - Placing chains on the song grid (one row per chain)
+    - Grouping phrases into chains of up to 16
+    - Placing each track's chains on consecutive song rows from row 0
     - Auto-allocating instrument, phrase, and chain slots
 
+    Patterns are consumed as a stream, so arbitrarily long tracks use
+    memory for one chain at a time; with ``deduplicate=True`` repeated
+    phrases and repeated chains share slots.
+
     Args:
         tracks: List of TrackDef describing each track.
         name: Song name.
         tempo: Song tempo in BPM.
-        deduplicate: If True, identical phrases share slots.
+        deduplicate: If True, identical phrases and chains share slots.
 
     Returns:
         A fully assembled Song.
+
+    Raises:
+        M8ResourceExhaustedError: If the arrangement needs more slots or
+            song rows than the M8 has.  Use ``plan()`` to check first.
     """
     builder = SongBuilder(name=name, tempo=tempo, deduplicate=deduplicate)
+    _arrange(tracks, _BuildSink(builder))
+    return builder.build()
 
-    for tdef in tracks:
-        # Allocate instrument
-        builder.add_instrument(tdef.instrument)
-        inst_slot = builder.last_instrument
 
-        # Parse pattern to steps
-        if isinstance(tdef.pattern, str):
-            steps = parse_pattern(tdef.pattern)
-        else:
-            steps = list(tdef.pattern)
+def plan(tracks: list[TrackDef], deduplicate: bool = False) -> CompositionPlan:
+    """Count the slots ``compose()`` would use, without building a Song.
 
+    Runs the same arrangement as ``compose()`` (pattern splitting,
+    instrument stamping and, with ``deduplicate=True``, slot sharing) but
+    only tracks slot identities.  Check ``fits`` or ``overflow`` before
+    composing to fail fast on arrangements that exceed the M8's capacity.
+
+    Args:
+        tracks: List of TrackDef describing each track.
+        deduplicate: Plan for ``compose(..., deduplicate=True)``.
+    """
+    sink = _PlanSink(deduplicate)
+    _arrange(tracks, sink)
+    result = CompositionPlan(
+        phrases=sink.phrases, chains=sink.chains,
+        instruments=sink.instruments, song_rows=sink.song_rows,
+    )
+    for resource, needed, capacity in (
+        ("phrases", result.phrases, N_PHRASES),
+        ("chains", result.chains, N_CHAINS),
+        ("instruments", result.instruments, N_INSTRUMENTS),
+        ("song_rows", result.song_rows, N_SONG_STEPS),
+    ):
+        if needed > capacity:
+            result.overflow[resource] = (needed, capacity)
+    return result
+
+
+# -- arrangement ----------------------------------------------------------------
+
+def _arrange(tracks: Iterable[TrackDef], sink) -> None:
+    """Drive a sink through the slot allocations compose() performs.
+
+    Each track's steps are streamed: every 16 steps become a phrase, every
+    16 phrases a chain, and chain N goes on song row N of the track's
+    column.  Only one chain's worth of steps is held at a time.
+    """
+    for tdef in tracks:
+        inst_slot = sink.instrument(tdef.instrument)
+        phrase_slots: list[int] = []
+        row = 0
+        for chunk in _phrase_chunks(_steps(tdef.pattern)):
+            phrase_slots.append(sink.phrase(chunk, inst_slot))
+            if len(phrase_slots) == PHRASES_PER_CHAIN:
+                sink.place(row, tdef.track, sink.chain(phrase_slots))
+                phrase_slots = []
+                row += 1
+        if phrase_slots:
+            sink.place(row, tdef.track, sink.chain(phrase_slots))
+
+
+def _steps(pattern: Union[str, Iterable[PhraseStep]]) -> Iterator[PhraseStep]:
+    if isinstance(pattern, str):
+        return iter_pattern(pattern)
+    return iter(pattern)
+
+
+def _phrase_chunks(steps: Iterator[PhraseStep]) -> Iterator[list[PhraseStep]]:
+    """Split steps into 16-step chunks; an empty pattern yields one chunk."""
+    chunk = list(islice(steps, STEPS_PER_PHRASE))
+    yield chunk
+    while len(chunk) == STEPS_PER_PHRASE:
+        chunk = list(islice(steps, STEPS_PER_PHRASE))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _BuildSink:
+    """Allocates real slots through a SongBuilder."""
+
+    def __init__(self, builder: SongBuilder):
+        self._builder = builder
+
+    def instrument(self, instrument: Instrument) -> int:
+        return self._builder.add_instrument(instrument).last_instrument
+
+    def phrase(self, chunk: list[PhraseStep], inst_slot: int) -> int:
         # Stamp instrument on each step that has a note
-        for step in steps:
-            if step.note != 0xFF and step.instrument == 0xFF:
+        for step in chunk:
+            if step.note != EMPTY and step.instrument == EMPTY:
                 step.instrument = inst_slot
-
-        # Split into phrase-sized chunks
-        phrase_slots = []
-        for i in range(0, max(len(steps), 1), STEPS_PER_PHRASE):
-            chunk = steps[i:i + STEPS_PER_PHRASE]
-            # Pad to 16 steps
-            while len(chunk) < STEPS_PER_PHRASE:
-                chunk.append(PhraseStep())
-            phrase = Phrase(steps=chunk)
-            builder.add_phrase(phrase)
-            phrase_slots.append(builder.last_phrase)
-
-        # Create chain from phrase slots
-        builder.add_chain(phrase_slots)
-        chain_slot = builder.last_chain
-
-        # Place on song grid
-        builder.set_song_step(0, tdef.track, chain_slot)
-
-    return builder.build()
+        # Pad to 16 steps
+        chunk = chunk + [PhraseStep() for _ in range(STEPS_PER_PHRASE - len(chunk))]
+        return self._builder.add_phrase(Phrase(steps=chunk)).last_phrase
+
+    def chain(self, phrase_slots: list[int]) -> int:
+        return self._builder.add_chain(phrase_slots).last_chain
+
+    def place(self, row: int, track: int, chain: int) -> None:
+        if row >= N_SONG_STEPS:
+            raise M8ResourceExhaustedError("song row", N_SONG_STEPS, N_SONG_STEPS)
+        self._builder.set_song_step(row, track, chain)
+
+
+_EMPTY_STEP_KEY = (EMPTY, EMPTY, EMPTY, EMPTY, 0, EMPTY, 0, EMPTY, 0)
+
+
+class _PlanSink:
+    """Counts slots, keying deduplicated material by content tuples."""
+
+    def __init__(self, deduplicate: bool):
+        self._dedup = deduplicate
+        self._instrument_ids: dict[bytes, int] = {}
+        self._phrase_ids: dict[tuple, int] = {}
+        self._chain_ids: dict[tuple, int] = {}
+        self.instruments = 0
+        self.phrases = 0
+        self.chains = 0
+        self.song_rows = 0
+
+    def instrument(self, instrument: Instrument) -> int:
+        if self._dedup:
+            return self._id(self._instrument_ids, _encode_instrument(instrument), "instruments")
+        return self._next("instruments")
+
+    def phrase(self, chunk: list[PhraseStep], inst_slot: int) -> int:
+        if not self._dedup:
+            return self._next("phrases")
+        key = tuple(
+            (s.note, s.velocity,
+             inst_slot if s.note != EMPTY and s.instrument == EMPTY else s.instrument,
+             s.fx1.command, s.fx1.value, s.fx2.command, s.fx2.value,
+             s.fx3.command, s.fx3.value)
+            for s in chunk
+        ) + (_EMPTY_STEP_KEY,) * (STEPS_PER_PHRASE - len(chunk))
+        return self._id(self._phrase_ids, key, "phrases")
+
+    def chain(self, phrase_slots: list[int]) -> int:
+        if not self._dedup:
+            return self._next("chains")
+        return self._id(self._chain_ids, tuple(phrase_slots), "chains")
+
+    def place(self, row: int, track: int, chain: int) -> None:
+        self.song_rows = max(self.song_rows, row + 1)
+
+    def _next(self, counter: str) -> int:
+        slot = getattr(self, counter)
+        setattr(self, counter, slot + 1)
+        return slot
+
+    def _id(self, ids: dict, key, counter: str) -> int:
+        slot = ids.get(key)
+        if slot is None:
+            slot = ids[key] = self._next(counter)
+        return slot
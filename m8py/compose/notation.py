@@ -1,7 +1,16 @@
 """Note parsing: string notation, MIDI integers, and named helpers."""
 from __future__ import annotations
-from m8py.models.phrase import PhraseStep
-from m8py.format.constants import EMPTY
+import re
+from itertools import islice, product
+from typing import Iterable, Iterator
+
+from m8py.display.commands import command_byte
+from m8py.models.fx import FX
+from m8py.models.phrase import Phrase, PhraseStep
+from m8py.format.constants import EMPTY, STEPS_PER_PHRASE
+
+# FX names resolve against the version of a new Song()
+DEFAULT_FX_VERSION = (6, 5)
 
 # Note name to pitch class (semitone within octave)
 _NOTE_NAMES = {
@@ -9,6 +18,38 @@ _NOTE_NAMES = {
 }
 _ACCIDENTALS = {"#": 1, "b": -1}
 
+# Pattern tokens: "(" | ")" with optional "xN" repeat | a step or FX body
+# with optional "@vel" and ":inst" suffixes | any other character (an error)
+_TOKEN_RE = re.compile(r"(\()|(\))(?:[xX](\d+))?|([^\s@:()]+)(@[^\s:()]*)?(:[^\s()]*)?|(\S)")
+_SEPARATOR = -1
+
+
+def _build_note_table() -> dict[str, int]:
+    """Every spelling normalize_note() accepts for notes 0-127, e.g. "C#4", "db4", "C-1"."""
+    table = {}
+    for letter, pitch_class in _NOTE_NAMES.items():
+        for name in (letter, letter.lower()):
+            for accidental in ("", *_ACCIDENTALS):
+                for octave in range(-1, 10):
+                    midi = (octave + 1) * 12 + pitch_class + _ACCIDENTALS.get(accidental, 0)
+                    if 0 <= midi <= 127:
+                        table[f"{name}{accidental}{octave}"] = midi
+    return table
+
+
+_NOTE_TABLE = _build_note_table()
+
+# Step bodies that are not notes, and the note value they produce
+_BODY_TABLE = {
+    **_NOTE_TABLE,
+    "---": EMPTY,
+    ".": EMPTY,
+    "|": _SEPARATOR,
+    **{"".join(c): 0x80 for c in product(*zip("OFF", "off"))},
+}
+
+_HEX_TABLE = {f"{i:0{w}{case}}": i for i in range(256) for w in (1, 2) for case in "Xx"}
+
 
 def normalize_note(note) -> int:
     """Convert any note representation to MIDI int (0-127).
@@ -25,6 +66,10 @@ def normalize_note(note) -> int:
     if not isinstance(note, str) or len(note) < 2:
         raise ValueError(f"invalid note: {note!r}")
 
+    midi = _NOTE_TABLE.get(note)
+    if midi is not None:
+        return midi
+
     s = note.strip()
     name = s[0].upper()
     if name not in _NOTE_NAMES:
@@ -50,7 +95,7 @@ def normalize_note(note) -> int:
     return midi
 
 
-def parse_pattern(pattern: str) -> list[PhraseStep]:
+def parse_pattern(pattern: str, version: tuple[int, int] = DEFAULT_FX_VERSION) -> list[PhraseStep]:
     """Parse a tracker-style pattern string into PhraseStep objects.
 
     Syntax:
@@ -58,34 +103,168 @@ def parse_pattern(pattern: str) -> list[PhraseStep]:
         Empty: "---" or "."
         Note off: "OFF"
         Velocity: "C4@7F" (hex)
+        Instrument: "C4:02" or "C4@7F:02" (hex)
+        FX: "ARP37 DEL03" after a step fills its FX columns in order
+        Repeat: "(C4 E4 G4)x8" repeats a group; groups nest
         Bar separator: "|" (cosmetic, ignored)
+
+    FX names are the sequencer and mixer commands shown by
+    ``m8py.display.fx_command_name`` for ``version`` (default: the version
+    of a new Song).  Instrument-specific commands cannot be named here.
     """
-    tokens = pattern.split()
-    steps = []
-    for token in tokens:
-        if token == "|":
-            continue
+    return list(iter_pattern(pattern, version))
 
-        if token in ("---", "."):
-            steps.append(PhraseStep())
-            continue
 
-        if token.upper() == "OFF":
-            steps.append(PhraseStep(note=0x80))
+def parse_patterns(patterns: Iterable[str],
+                   version: tuple[int, int] = DEFAULT_FX_VERSION) -> list[list[PhraseStep]]:
+    """Parse many pattern strings; equivalent to mapping parse_pattern()."""
+    return [list(iter_pattern(p, version)) for p in patterns]
+
+
+def iter_pattern(pattern: str,
+                 version: tuple[int, int] = DEFAULT_FX_VERSION) -> Iterator[PhraseStep]:
+    """Parse a pattern string lazily, yielding one PhraseStep per step.
+
+    Repeated groups are expanded as they are consumed, so ``(C4)x100000``
+    never exists as a list.  Every step yielded is a new object.
+    """
+    return _expand(_tokens(pattern, version), depth=0)
+
+
+def iter_phrases(pattern: str,
+                 version: tuple[int, int] = DEFAULT_FX_VERSION) -> Iterator[Phrase]:
+    """Parse a pattern lazily into 16-step phrases, sharing repeated blocks.
+
+    The last phrase is padded with empty steps.  Blocks with identical
+    content are yielded as the same Phrase object, so a long score with
+    repeated material only holds its distinct blocks in memory.  Copy a
+    phrase before editing it.
+    """
+    seen: dict[tuple, Phrase] = {}
+    steps = iter_pattern(pattern, version)
+    while True:
+        block = list(islice(steps, STEPS_PER_PHRASE))
+        if not block:
+            return
+        block.extend(PhraseStep() for _ in range(STEPS_PER_PHRASE - len(block)))
+        key = tuple(
+            (s.note, s.velocity, s.instrument, s.fx1.command, s.fx1.value,
+             s.fx2.command, s.fx2.value, s.fx3.command, s.fx3.value)
+            for s in block
+        )
+        phrase = seen.get(key)
+        if phrase is None:
+            phrase = seen[key] = Phrase(steps=block)
+        yield phrase
+
+
+# Token kinds produced by _tokens()
+_STEP, _FX, _OPEN, _CLOSE = range(4)
+_OPEN_TOKEN = (_OPEN,)
+
+
+def _tokens(pattern: str, version: tuple[int, int]) -> Iterator[tuple]:
+    bodies = _BODY_TABLE
+    for m in _TOKEN_RE.finditer(pattern):
+        is_open, is_close, repeat, body, velocity_suffix, instrument_suffix, other = m.groups()
+        if body is None:
+            if is_open:
+                yield _OPEN_TOKEN
+            elif is_close:
+                yield (_CLOSE, int(repeat or 1))
+            else:
+                raise ValueError(f"invalid character {other!r} in pattern")
             continue
+        if not velocity_suffix and not instrument_suffix:
+            note = bodies.get(body)
+            if note is None:
+                fx = _fx_token(body, version)
+                if fx is not None:
+                    yield (_FX, *fx)
+                    continue
+                # Unknown token: let normalize_note report what is wrong
+                note = normalize_note(body)
+            elif note == _SEPARATOR:
+                continue
+            yield (_STEP, note, EMPTY, EMPTY)
+            continue
+        # Only notes take a velocity or instrument
+        note = _NOTE_TABLE.get(body)
+        if note is None:
+            note = normalize_note(body)
+        velocity = _hex(velocity_suffix[1:]) if velocity_suffix else EMPTY
+        instrument = _hex(instrument_suffix[1:]) if instrument_suffix else EMPTY
+        yield (_STEP, note, velocity, instrument)
+
 
-        # Check for velocity suffix
-        velocity = EMPTY
-        if "@" in token:
-            note_part, vel_hex = token.split("@", 1)
-            velocity = int(vel_hex, 16)
+def _expand(tokens: Iterator[tuple], depth: int) -> Iterator[PhraseStep]:
+    """Turn tokens into steps; returns at the ``)`` closing this depth."""
+    pending: PhraseStep | None = None
+    for token in tokens:
+        kind = token[0]
+        if kind == _STEP:
+            if pending is not None:
+                yield pending
+            _, note, velocity, instrument = token
+            pending = PhraseStep(note, velocity, instrument)
+        elif kind == _FX:
+            if pending is None:
+                raise ValueError("FX must follow a step in the same group")
+            if pending.fx1.command == EMPTY:
+                pending.fx1 = FX(command=token[1], value=token[2])
+            elif pending.fx2.command == EMPTY:
+                pending.fx2 = FX(command=token[1], value=token[2])
+            elif pending.fx3.command == EMPTY:
+                pending.fx3 = FX(command=token[1], value=token[2])
+            else:
+                raise ValueError("a step has at most 3 FX columns")
+        elif kind == _OPEN:
+            if pending is not None:
+                yield pending
+                pending = None
+            group = _collect_group(tokens)
+            for _ in range(group[-1][1]):
+                yield from _expand(iter(group), depth + 1)
         else:
-            note_part = token
+            if depth == 0:
+                raise ValueError("unbalanced ')' in pattern")
+            break
+    if pending is not None:
+        yield pending
+
+
+def _collect_group(tokens: Iterator[tuple]) -> list[tuple]:
+    """Tokens of one group body, ending with its closing token."""
+    group = []
+    level = 0
+    for token in tokens:
+        group.append(token)
+        if token[0] == _OPEN:
+            level += 1
+        elif token[0] == _CLOSE:
+            if level == 0:
+                return group
+            level -= 1
+    raise ValueError("unbalanced '(' in pattern")
+
+
+def _fx_token(body: str, version: tuple[int, int]) -> tuple[int, int] | None:
+    if len(body) != 5:
+        return None
+    command = command_byte(body[:3], version)
+    value = _HEX_TABLE.get(body[3:])
+    if command is None or value is None:
+        return None
+    return command, value
 
-        midi = normalize_note(note_part)
-        steps.append(PhraseStep(note=midi, velocity=velocity))
 
-    return steps
+def _hex(text: str) -> int:
+    value = _HEX_TABLE.get(text)
+    if value is None:
+        value = int(text, 16)
+        if not 0 <= value <= 0xFF:
+            raise ValueError(f"hex value {text!r} out of byte range")
+    return value
 
 
 # Named note constants: C0 through B9
@@ -107,4 +286,4 @@ REST = None
 NOTE_OFF = 0x80
 
 # Make names available for: from m8py.compose.notation import C4, E4, ...
-__all__ = list(_NOTES.keys()) + ["REST", "NOTE_OFF", "normalize_note", "parse_pattern"]
+__all__ = list(_NOTES.keys()) + ["REST", "NOTE_OFF", "normalize_note", "parse_pattern", "parse_patterns", "iter_pattern", "iter_phrases"]
@@ -4,6 +4,8 @@ Maps command byte values to three-letter display names. Version-dependent:
 different firmware versions use different command tables.
 """
 
+from functools import lru_cache
+
 from m8py.format.constants import InstrumentKind
 
 # --- Sequencer commands (index 0x00+) ---
@@ -259,10 +261,53 @@ def fx_command_name(
     Returns:
         3-letter command name, or "---" for empty (0xFF), or hex fallback.
     """
+    major, minor = version if version is not None else (4, 0)
+    if 0 <= command <= 0xFF:
+        return command_names(major, minor, instrument_kind)[command]
+    return _lookup_command(command, major, minor, instrument_kind)
+
+
+@lru_cache(maxsize=None)
+def command_names(
+    major: int, minor: int, instrument_kind: int | None = None,
+) -> tuple[str, ...]:
+    """All 256 command display names for a version, indexed by command byte.
+
+    Built once per (version, instrument kind) and cached.
+    """
+    return tuple(_lookup_command(c, major, minor, instrument_kind) for c in range(256))
+
+
+@lru_cache(maxsize=None)
+def _command_bytes(
+    major: int, minor: int, instrument_kind: int | None,
+) -> dict[str, int]:
+    result: dict[str, int] = {}
+    for byte, name in enumerate(command_names(major, minor, instrument_kind)):
+        if name != "---" and not name.startswith("?"):
+            result.setdefault(name, byte)
+    return result
+
+
+def command_byte(
+    name: str,
+    version: tuple[int, int] | None = None,
+    instrument_kind: int | None = None,
+) -> int | None:
+    """Reverse of fx_command_name: the command byte for a 3-letter name.
+
+    Returns None if the name is not a command in that version.
+    """
+    major, minor = version if version is not None else (4, 0)
+    return _command_bytes(major, minor, instrument_kind).get(name.upper())
+
+
+def _lookup_command(
+    command: int, major: int, minor: int, instrument_kind: int | None,
+) -> str:
     if command == 0xFF:
         return "---"
 
-    major, minor = version if version is not None else (4, 0)
     table = _get_command_table(major, minor)
 
     # Sequencer + mixer range
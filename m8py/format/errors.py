@@ -11,9 +11,19 @@ class M8ValidationError(M8Error):
     """Raised when a model violates M8 constraints."""
 
 class M8ResourceExhaustedError(M8Error):
-    """Raised when a slot pool is full."""
-    def __init__(self, resource: str, used: int, capacity: int):
+    """Raised when a slot pool is full.
+
+    ``requested`` is set when a contiguous run was asked for: the pool may
+    still have free slots, just not enough of them in a row.
+    """
+    def __init__(self, resource: str, used: int, capacity: int, requested: int | None = None):
         self.resource = resource
         self.used = used
         self.capacity = capacity
-        super().__init__(f"{resource}: {used}/{capacity} slots used, none remaining")
+        self.requested = requested
+        if requested is not None and used < capacity:
+            message = (f"no contiguous run of {requested} free {resource} slots "
+                       f"({capacity - used} free)")
+        else:
+            message = f"{resource}: {used}/{capacity} slots used, none remaining"
+        super().__init__(message)
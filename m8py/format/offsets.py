@@ -1,5 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from m8py.format.constants import (
+    N_GROOVES, N_SONG_STEPS, N_PHRASES, N_CHAINS, N_TABLES,
+    N_INSTRUMENTS, N_MIDI_MAPPINGS, N_SCALES, INSTRUMENT_SIZE,
+)
 from m8py.models.version import M8Version
 
 
@@ -64,3 +68,63 @@ def offsets_for_version(version: M8Version) -> SongOffsets:
     if version.at_least(2, 5):
         return V25_OFFSETS
     return V2_OFFSETS
+
+
+# Byte sizes of one slot in each song section
+GROOVE_SIZE = 16
+SONG_STEP_SIZE = 8
+PHRASE_STEP_SIZE = 9
+PHRASE_SIZE = 16 * PHRASE_STEP_SIZE
+CHAIN_STEP_SIZE = 2
+CHAIN_SIZE = 16 * CHAIN_STEP_SIZE
+TABLE_STEP_SIZE = 8
+TABLE_SIZE = 16 * TABLE_STEP_SIZE
+MIDI_MAPPING_SIZE = 9
+SCALE_SIZE = 42           # note_enable(2) + 12 intervals(24) + name(16)
+SCALE_TUNING_SIZE = 4     # float32 tuning appended from v4.0
+EQ_SIZE = 18
+
+
+@dataclass(frozen=True)
+class SectionSpan:
+    """Location of a fixed-stride section inside a song file."""
+    offset: int
+    count: int
+    stride: int
+
+    @property
+    def size(self) -> int:
+        return self.count * self.stride
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.size
+
+    def slot(self, index: int) -> slice:
+        if not 0 <= index < self.count:
+            raise IndexError(f"slot {index} out of range [0, {self.count})")
+        start = self.offset + index * self.stride
+        return slice(start, start + self.stride)
+
+
+def section_spans(version: M8Version) -> dict[str, SectionSpan]:
+    """Return the slot sections present in a song of the given version.
+
+    Keys match the corresponding ``Song`` attribute names.
+    """
+    offsets = offsets_for_version(version)
+    spans = {
+        "grooves": SectionSpan(offsets.groove, N_GROOVES, GROOVE_SIZE),
+        "song_steps": SectionSpan(offsets.song, N_SONG_STEPS, SONG_STEP_SIZE),
+        "phrases": SectionSpan(offsets.phrases, N_PHRASES, PHRASE_SIZE),
+        "chains": SectionSpan(offsets.chains, N_CHAINS, CHAIN_SIZE),
+        "tables": SectionSpan(offsets.table, N_TABLES, TABLE_SIZE),
+        "instruments": SectionSpan(offsets.instruments, N_INSTRUMENTS, INSTRUMENT_SIZE),
+        "midi_mappings": SectionSpan(offsets.midi_mapping, N_MIDI_MAPPINGS, MIDI_MAPPING_SIZE),
+    }
+    if version.caps.has_scales and offsets.scale is not None:
+        stride = SCALE_SIZE + (SCALE_TUNING_SIZE if version.at_least(4, 0) else 0)
+        spans["scales"] = SectionSpan(offsets.scale, N_SCALES, stride)
+    if version.caps.has_eq and offsets.eq is not None:
+        spans["eqs"] = SectionSpan(offsets.eq, offsets.instrument_eq_count, EQ_SIZE)
+    return spans
@@ -0,0 +1,244 @@
+"""Reference graph over a Song with forward and reverse lookups.
+
+SongIndex records every slot reference in a song in one pass:
+
+    song grid row  -> chains                 (SongStep.tracks)
+    chain          -> phrases                (ChainStep.phrase)
+    phrase         -> instruments            (PhraseStep.instrument)
+    phrase, table  -> tables/grooves/scales/instruments  (TBL, GRV, SCA, INS FX)
+    instrument     -> its table              (instrument N plays table N)
+    MIDI mapping   -> instrument             (MIDIMapping.instr_index)
+
+Nodes are ``(section, slot)`` tuples whose section names match the Song
+attributes (``"phrases"``, ``"chains"``, ...).  After editing a slot, call
+``update()`` for it (or ``update_slots()`` with the output of
+``SongSnapshot.changed_slots``) to refresh only that slot's edges.
+RawSlot placeholders from a lenient load have no known references and add
+no edges.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, Mapping
+
+from m8py.format.constants import (
+    EMPTY, InstrumentKind,
+    N_SONG_STEPS, N_CHAINS, N_PHRASES, N_INSTRUMENTS, N_TABLES,
+    N_GROOVES, N_SCALES, N_MIDI_MAPPINGS,
+)
+from m8py.models.profile import version_profile
+from m8py.models.raw import RawSlot
+from m8py.models.song import Song
+
+Node = tuple[str, int]
+
+SECTION_SIZES: dict[str, int] = {
+    "song_steps": N_SONG_STEPS,
+    "chains": N_CHAINS,
+    "phrases": N_PHRASES,
+    "instruments": N_INSTRUMENTS,
+    "tables": N_TABLES,
+    "grooves": N_GROOVES,
+    "scales": N_SCALES,
+    "midi_mappings": N_MIDI_MAPPINGS,
+}
+
+# FX commands whose value is a slot number, by command name
+FX_SLOT_COMMANDS: dict[str, str] = {
+    "TBL": "tables",
+    "GRV": "grooves",
+    "SCA": "scales",
+    "INS": "instruments",
+}
+
+# Sections that hold references to other slots
+_SOURCE_SECTIONS = ("song_steps", "chains", "phrases", "tables", "instruments", "midi_mappings")
+
+
+def fx_slot_targets(song: Song) -> dict[int, str]:
+    """Map FX command bytes that reference slots to the section they target."""
+    profile = version_profile(song.version)
+    targets = {}
+    for name, section in FX_SLOT_COMMANDS.items():
+        byte = profile.command_byte(name)
+        if byte is not None:
+            targets[byte] = section
+    return targets
+
+
+def is_active_mapping(mapping) -> bool:
+    """True if a MIDI mapping entry is in use; unused entries are all zero."""
+    return bool(mapping.control_number or mapping.max_value or mapping.type)
+
+
+def _ref(section: str, slot: int) -> Node | None:
+    if slot == EMPTY or not 0 <= slot < SECTION_SIZES[section]:
+        return None
+    return (section, slot)
+
+
+class SongIndex:
+    """Forward and reverse slot references of a Song.
+
+    Args:
+        song: The song to index.  The index keeps a reference to it and
+            re-reads slots from it in ``update()``.
+    """
+
+    def __init__(self, song: Song):
+        self._song = song
+        self._fx_targets = fx_slot_targets(song)
+        self._forward: dict[Node, Counter[Node]] = {}
+        self._reverse: dict[Node, Counter[Node]] = {}
+        for section in _SOURCE_SECTIONS:
+            for slot in range(len(getattr(song, section))):
+                self._set_edges((section, slot), self._scan(section, slot))
+
+    @property
+    def song(self) -> Song:
+        return self._song
+
+    # -- incremental updates ------------------------------------------------
+
+    def update(self, section: str, slot: int) -> None:
+        """Re-read one slot from the song and refresh its outgoing edges."""
+        if section not in _SOURCE_SECTIONS:
+            return
+        self._set_edges((section, slot), self._scan(section, slot))
+
+    def update_slots(self, changed: Mapping[str, Iterable[int]]) -> None:
+        """Refresh several slots, e.g. ``index.update_slots(new.changed_slots(old))``."""
+        for section, slots in changed.items():
+            for slot in slots:
+                self.update(section, slot)
+
+    # -- generic queries ------------------------------------------------------
+
+    def refs(self, section: str, slot: int) -> set[Node]:
+        """Slots directly referenced by ``(section, slot)``."""
+        return set(self._forward.get((section, slot), ()))
+
+    def users(self, section: str, slot: int) -> set[Node]:
+        """Slots that directly reference ``(section, slot)``."""
+        return set(self._reverse.get((section, slot), ()))
+
+    def use_count(self, section: str, slot: int) -> int:
+        """Number of individual references to ``(section, slot)``."""
+        return sum(self._reverse.get((section, slot), Counter()).values())
+
+    def is_used(self, section: str, slot: int) -> bool:
+        """True if anything references ``(section, slot)``."""
+        return bool(self._reverse.get((section, slot)))
+
+    def used_slots(self, section: str) -> set[int]:
+        """All slots of a section that are referenced by something."""
+        return {slot for (sec, slot), users in self._reverse.items()
+                if sec == section and users}
+
+    def reachable(self, roots: Iterable[str] = ("song_steps",)) -> dict[str, set[int]]:
+        """Slots reachable from the song grid, per section.
+
+        Instruments reached this way also pull in their own table, and FX
+        references are followed transitively.  Pass ``roots`` to start from
+        other source sections as well, e.g. ``("song_steps", "midi_mappings")``.
+        """
+        roots = set(roots)
+        seen: set[Node] = set()
+        stack: list[Node] = [node for node in self._forward if node[0] in roots]
+        while stack:
+            node = stack.pop()
+            for target in self._forward.get(node, ()):
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        result: dict[str, set[int]] = {section: set() for section in SECTION_SIZES}
+        for section, slot in seen:
+            result[section].add(slot)
+        for section in roots:
+            result.pop(section, None)
+        return result
+
+    # -- convenience queries --------------------------------------------------
+
+    def rows_using_chain(self, chain: int) -> set[int]:
+        return {slot for section, slot in self.users("chains", chain) if section == "song_steps"}
+
+    def chains_using_phrase(self, phrase: int) -> set[int]:
+        return {slot for section, slot in self.users("phrases", phrase) if section == "chains"}
+
+    def phrases_using_instrument(self, instrument: int) -> set[int]:
+        return {slot for section, slot in self.users("instruments", instrument)
+                if section == "phrases"}
+
+    def phrases_using_table(self, table: int) -> set[int]:
+        return {slot for section, slot in self.users("tables", table) if section == "phrases"}
+
+    def mappings_targeting_instrument(self, instrument: int) -> set[int]:
+        return {slot for section, slot in self.users("instruments", instrument)
+                if section == "midi_mappings"}
+
+    # -- internals ------------------------------------------------------------
+
+    def _set_edges(self, node: Node, refs: Counter[Node]) -> None:
+        old = self._forward.get(node)
+        if old:
+            for target, count in old.items():
+                users = self._reverse[target]
+                users[node] -= count
+                if users[node] <= 0:
+                    del users[node]
+                if not users:
+                    del self._reverse[target]
+        if refs:
+            self._forward[node] = refs
+            for target, count in refs.items():
+                self._reverse.setdefault(target, Counter())[node] += count
+        else:
+            self._forward.pop(node, None)
+
+    def _scan(self, section: str, slot: int) -> Counter[Node]:
+        song = self._song
+        refs: Counter[Node] = Counter()
+        if isinstance(getattr(song, section)[slot], RawSlot):
+            return refs
+        if section == "song_steps":
+            for chain in song.song_steps[slot].tracks:
+                node = _ref("chains", chain)
+                if node:
+                    refs[node] += 1
+        elif section == "chains":
+            for step in song.chains[slot].steps:
+                node = _ref("phrases", step.phrase)
+                if node:
+                    refs[node] += 1
+        elif section == "phrases":
+            for step in song.phrases[slot].steps:
+                node = _ref("instruments", step.instrument)
+                if node:
+                    refs[node] += 1
+                self._scan_fx(refs, (step.fx1, step.fx2, step.fx3))
+        elif section == "tables":
+            for step in song.tables[slot].steps:
+                self._scan_fx(refs, (step.fx1, step.fx2, step.fx3))
+        elif section == "instruments":
+            inst = song.instruments[slot]
+            if getattr(inst, "kind", InstrumentKind.NONE) != InstrumentKind.NONE:
+                node = _ref("tables", slot)
+                if node:
+                    refs[node] += 1
+        elif section == "midi_mappings":
+            mapping = song.midi_mappings[slot]
+            if is_active_mapping(mapping):
+                node = _ref("instruments", mapping.instr_index)
+                if node:
+                    refs[node] += 1
+        return refs
+
+    def _scan_fx(self, refs: Counter[Node], fxs) -> None:
+        targets = self._fx_targets
+        for fx in fxs:
+            target = targets.get(fx.command)
+            if target is not None:
+                node = _ref(target, fx.value)
+                if node:
+                    refs[node] += 1
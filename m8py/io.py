@@ -6,13 +6,14 @@ Theme (.m8t), and Scale (.m8n).
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Union
+from typing import Any, Union
 
 from m8py.format.constants import FileType, HEADER_SIZE
 from m8py.format.errors import M8ParseError
 from m8py.format.reader import M8FileReader
 from m8py.format.writer import M8FileWriter
 from m8py.models.instrument import Instrument, read_instrument, write_instrument
+from m8py.models.raw import ParseDiagnostic, RawSlot
 from m8py.models.scale import Scale
 from m8py.models.song import Song
 from m8py.models.theme import Theme
@@ -26,8 +27,18 @@ _EXT_TO_FILE_TYPE = {
 }
 
 
-def load(path: Union[str, Path]) -> Song | Instrument | Theme | Scale:
-    """Load an M8 file, detecting file type from extension."""
+def load(
+    path: Union[str, Path], strict: bool = True,
+) -> Song | Instrument | Theme | Scale | tuple[Any, list[ParseDiagnostic]]:
+    """Load an M8 file, detecting file type from extension.
+
+    With ``strict=False`` damaged files are salvaged instead of rejected:
+    the result is ``(obj, diagnostics)``, where undecodable slots of a song
+    are RawSlot placeholders holding their original bytes and
+    ``diagnostics`` lists a ParseDiagnostic for every repair (empty for a
+    clean file).  An undecodable instrument, theme or scale file loads as
+    a single RawSlot.  A file whose M8 header is unreadable still raises.
+    """
     path = Path(path)
     data = path.read_bytes()
     if len(data) < HEADER_SIZE:
@@ -40,7 +51,10 @@ def load(path: Union[str, Path]) -> Song | Instrument | Theme | Scale:
         raise M8ParseError(f"unknown M8 file extension: {ext!r}")
     reader = M8FileReader(data)
     version = M8FileType.from_reader(reader)
-    return _dispatch_read(reader, version, file_type)
+    if strict:
+        return _dispatch_read(reader, version, file_type)
+    diagnostics: list[ParseDiagnostic] = []
+    return _salvage_read(reader, version, file_type, diagnostics), diagnostics
 
 
 def load_song(path: Union[str, Path]) -> Song:
@@ -104,6 +118,24 @@ def save(obj: Song | Instrument | Theme | Scale, path: Union[str, Path]) -> None
     Path(path).write_bytes(writer.to_bytes())
 
 
+def _salvage_read(
+    reader: M8FileReader, version: M8Version, file_type: FileType,
+    diagnostics: list[ParseDiagnostic],
+) -> Song | Instrument | Theme | Scale | RawSlot:
+    """Lenient counterpart of ``_dispatch_read``."""
+    if file_type == FileType.SONG:
+        return Song.from_reader(reader, version, diagnostics)
+    try:
+        return _dispatch_read(reader, version, file_type)
+    except (M8ParseError, ValueError) as e:
+        data = reader._data[HEADER_SIZE:]
+        diagnostics.append(ParseDiagnostic(file_type.name.lower(), HEADER_SIZE,
+                                           f"{e}; kept as RawSlot"))
+        raw = RawSlot(data, len(data))
+        raw._file_version = version
+        return raw
+
+
 def _dispatch_read(
     reader: M8FileReader, version: M8Version, file_type: FileType
 ) -> Song | Instrument | Theme | Scale:
@@ -17,6 +17,10 @@ from m8py.models.eq import EQ, EQBand
 from m8py.models.fx import FX
 from m8py.models.settings import MIDISettings, MixerSettings, EffectsSettings
 from m8py.models.midi import MIDIMapping
+from m8py.models.snapshot import SongSnapshot, SongHistory
+from m8py.models.view import SongView
+from m8py.models.profile import SectionCodec, VersionProfile, version_profile
+from m8py.models.raw import RawSlot, ParseDiagnostic
 
 __all__ = [
     "Song", "M8Version", "VersionCapabilities",
@@ -25,5 +29,7 @@ __all__ = [
     "Phrase", "PhraseStep", "Chain", "ChainStep", "Table", "TableStep",
     "Groove", "SongStep", "Theme", "RGB", "Scale", "NoteInterval",
     "EQ", "EQBand", "FX", "MIDISettings", "MixerSettings", "EffectsSettings",
-    "MIDIMapping",
+    "MIDIMapping", "SongSnapshot", "SongHistory",
+    "SectionCodec", "SongView", "VersionProfile", "version_profile",
+    "RawSlot", "ParseDiagnostic",
 ]
@@ -21,6 +21,7 @@ EmptyInstrument (kind 0xFF) is 1 + 214 zero bytes.
 """
 from __future__ import annotations
 
+import copyreg
 from dataclasses import dataclass, field
 from typing import List
 
@@ -43,6 +44,8 @@ _TAIL_SIZE = INSTRUMENT_SIZE - _TAIL_OFFSET              # = 128
 _COMMON_PREFIX_SIZE = 28       # kind(1) + name(12) + 5 common + 10 filter/mixer
 _SAMPLE_PATH_LEN = 128
 _HYPERSYNTH_CHORDS_SIZE = 112  # 16 chords × 7 bytes each
+_PICKLE_VERSION = M8Version(6, 5, 0)
+_PICKLE_STATE_KEYS = ("_raw", "_file_version", "_file_tail", "_gap", "_tail")
 
 
 def _default_mods() -> List[Modulator]:
@@ -156,6 +159,57 @@ def _write_tail(writer: M8FileWriter, tail: bytes, inst_start: int) -> None:
         _pad_to_end(writer, inst_start)
 
 
+def _reduce_instrument(instrument) -> tuple:
+    """Pickle an instrument as the 215 bytes ``write_instrument`` saves.
+
+    Raw passthrough attributes that the bytes cannot reproduce exactly (the
+    cached ``_raw`` bytes, file-level extras, and unset gap/tail fields)
+    travel alongside as state.  When the bytes do not decode back to the
+    instrument, because a loaded instrument was edited or a value does not
+    fit the format (a long name or sample path), every attribute does.
+    """
+    data = _pickle_bytes(instrument)
+    if data is None:
+        return (copyreg.__newobj__, (type(instrument),), dict(vars(instrument)))
+    state = _pickle_state(instrument)
+    if not _rebuilds_equal(instrument, data, _PICKLE_VERSION, state):
+        state = dict(vars(instrument))
+    return (_instrument_from_bytes, (data,), state)
+
+
+def _instrument_from_bytes(data: bytes) -> Instrument:
+    """Rebuild a pickled instrument; see ``_reduce_instrument``."""
+    instrument = read_instrument(M8FileReader(data), _PICKLE_VERSION)
+    del instrument._raw
+    return instrument
+
+
+def _pickle_bytes(instrument) -> bytes | None:
+    """The bytes ``write_instrument`` saves, or None if the fields cannot be encoded."""
+    writer = M8FileWriter()
+    try:
+        write_instrument(instrument, writer)
+    except (ValueError, M8ParseError):
+        return None
+    return writer.to_bytes()
+
+
+def _pickle_state(instrument) -> dict:
+    """Raw passthrough attributes a pickled instrument carries alongside its bytes."""
+    return {key: value for key, value in vars(instrument).items()
+            if key in _PICKLE_STATE_KEYS and (key not in ("_gap", "_tail") or not value)}
+
+
+def _rebuilds_equal(instrument, data: bytes, version: M8Version, state: dict) -> bool:
+    """True if decoding ``data`` and applying ``state`` gives back ``instrument``."""
+    try:
+        decoded = read_instrument(M8FileReader(data), version)
+    except M8ParseError:
+        return False
+    vars(decoded).update(state)
+    return decoded == instrument
+
+
 def _pad_to_end(writer: M8FileWriter, inst_start: int) -> None:
     """Pad from current position to exactly inst_start + INSTRUMENT_SIZE."""
     current = writer.position()
@@ -205,6 +259,9 @@ class WavSynth:
                         mult=mult, warp=warp, scan=scan, modulators=mods,
                         _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -251,6 +308,9 @@ class MacroSynth:
                           color=color, degrade=degrade, redux=redux,
                           modulators=mods, _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -301,6 +361,9 @@ class Sampler:
                        degrade=degrade, sample_path=sample_path, modulators=mods,
                        _gap=gap)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -383,6 +446,9 @@ class FMSynth:
                        mod1=mod1, mod2=mod2, mod3=mod3, mod4=mod4,
                        modulators=mods, _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -438,6 +504,9 @@ class HyperSynth:
                           custom_chords=custom_chords, modulators=mods,
                           _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -498,6 +567,9 @@ class External:
                         bank=bank, program=program, cca=cca, ccb=ccb,
                         ccc=ccc, ccd=ccd, modulators=mods, _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -591,6 +663,9 @@ class MIDIOut:
                        program_change=program_change, control_changes=ccs,
                        modulators=mods, _gap=gap, _tail=tail)
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(self.kind)
@@ -623,6 +698,9 @@ class EmptyInstrument:
         reader.seek(inst_start + INSTRUMENT_SIZE)
         return EmptyInstrument()
 
+    def __reduce__(self):
+        return _reduce_instrument(self)
+
     def write(self, writer: M8FileWriter) -> None:
         inst_start = writer.position()
         writer.write(0xFF)
@@ -0,0 +1,127 @@
+"""Per-firmware version profiles.
+
+A VersionProfile bundles everything that depends on the file format
+version: capability flags, section offsets and strides, FX command lookups,
+and the section codecs bound to that layout.  Profiles are built once per
+(major, minor), interned, and hashable, so read/write paths resolve
+version-dependent behaviour once instead of re-dispatching inside their
+loops.  Support for a new firmware layout is added in ``_build_profile``
+and ``_build_codecs``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Mapping, NamedTuple, Union
+
+from m8py.display.commands import command_byte, command_names
+from m8py.format.offsets import SectionSpan, SongOffsets, offsets_for_version, section_spans
+from m8py.models.version import M8Version, VersionCapabilities
+
+if TYPE_CHECKING:
+    from m8py.format.reader import M8FileReader
+    from m8py.format.writer import M8FileWriter
+
+
+class SectionCodec(NamedTuple):
+    """Decoder and encoder for the slots of one song section."""
+    read: Callable[[M8FileReader], Any]
+    write: Callable[[Any, M8FileWriter], None]
+
+
+@dataclass(frozen=True)
+class VersionProfile:
+    """Everything version-dependent about one (major, minor) file layout.
+
+    Obtain instances through ``version_profile()``; equal versions return
+    the same object.
+    """
+    major: int
+    minor: int
+    caps: VersionCapabilities = field(compare=False, repr=False)
+    offsets: SongOffsets = field(compare=False, repr=False)
+    sections: Mapping[str, SectionSpan] = field(compare=False, repr=False)
+    scale_has_tuning: bool = field(compare=False, repr=False)
+
+    @property
+    def key(self) -> tuple[int, int]:
+        return (self.major, self.minor)
+
+    @cached_property
+    def codecs(self) -> Mapping[str, SectionCodec]:
+        """Codecs for this layout, keyed like the Song attributes.
+
+        Covers every slot section plus ``"mixer_settings"`` and
+        ``"effects_settings"``.
+        """
+        return MappingProxyType(_build_codecs(M8Version(self.major, self.minor, 0)))
+
+    def command_name(self, command: int, instrument_kind: int | None = None) -> str:
+        """Display name of an FX command byte in this version."""
+        return command_names(self.major, self.minor, instrument_kind)[command & 0xFF]
+
+    def command_byte(self, name: str, instrument_kind: int | None = None) -> int | None:
+        """Command byte for a 3-letter FX name in this version, or None."""
+        return command_byte(name, self.key, instrument_kind)
+
+
+def version_profile(version: Union[M8Version, tuple[int, int]]) -> VersionProfile:
+    """Return the interned profile for a version or (major, minor) tuple."""
+    if isinstance(version, M8Version):
+        return _profile_for(version.major, version.minor)
+    major, minor = version
+    return _profile_for(major, minor)
+
+
+@lru_cache(maxsize=None)
+def _profile_for(major: int, minor: int) -> VersionProfile:
+    return _build_profile(M8Version(major, minor, 0))
+
+
+def _build_profile(version: M8Version) -> VersionProfile:
+    return VersionProfile(
+        major=version.major,
+        minor=version.minor,
+        caps=version.caps,
+        offsets=offsets_for_version(version),
+        sections=MappingProxyType(section_spans(version)),
+        scale_has_tuning=version.at_least(4, 0),
+    )
+
+
+def _write(obj: Any, writer: M8FileWriter) -> None:
+    obj.write(writer)
+
+
+def _build_codecs(version: M8Version) -> dict[str, SectionCodec]:
+    # The models import this module, so their codecs are looked up on first use
+    from m8py.models.chain import Chain
+    from m8py.models.eq import EQ
+    from m8py.models.groove import Groove
+    from m8py.models.instrument import read_instrument, write_instrument
+    from m8py.models.midi import MIDIMapping
+    from m8py.models.phrase import Phrase
+    from m8py.models.scale import Scale
+    from m8py.models.settings import EffectsSettings, MixerSettings
+    from m8py.models.song_step import SongStep
+    from m8py.models.table import Table
+
+    def versioned(cls: Any) -> SectionCodec:
+        return SectionCodec(lambda reader: cls.from_reader(reader, version),
+                            lambda obj, writer: obj.write(writer, version))
+
+    return {
+        "mixer_settings": versioned(MixerSettings),
+        "effects_settings": versioned(EffectsSettings),
+        "grooves": SectionCodec(Groove.from_reader, _write),
+        "song_steps": SectionCodec(SongStep.from_reader, _write),
+        "phrases": SectionCodec(Phrase.from_reader, _write),
+        "chains": SectionCodec(Chain.from_reader, _write),
+        "tables": SectionCodec(Table.from_reader, _write),
+        "instruments": SectionCodec(lambda reader: read_instrument(reader, version),
+                                    write_instrument),
+        "midi_mappings": SectionCodec(MIDIMapping.from_reader, _write),
+        "scales": versioned(Scale),
+        "eqs": SectionCodec(EQ.from_reader, _write),
+    }
@@ -0,0 +1,40 @@
+"""Placeholders and diagnostics for lenient (``strict=False``) loading."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from m8py.format.writer import M8FileWriter
+from m8py.models.version import M8Version
+
+
+@dataclass
+class RawSlot:
+    """A slot that could not be decoded, kept as its original bytes.
+
+    Writing a RawSlot emits ``data`` unchanged, zero-padded to ``size`` if
+    the file was truncated inside the slot, so a salvaged song saves back
+    with the damaged bytes where they were.
+    """
+    data: bytes
+    size: int
+
+    def write(self, writer: M8FileWriter, version: M8Version | None = None) -> None:
+        writer.write_bytes(self.data[:self.size])
+        if len(self.data) < self.size:
+            writer.pad(self.size - len(self.data))
+
+
+@dataclass
+class ParseDiagnostic:
+    """Something a lenient load had to repair.
+
+    ``path`` names the part of the file, e.g. ``"instruments[5]"`` or
+    ``"phrases[200:]"`` for a run of slots missing from a truncated file;
+    ``offset`` is its file offset.
+    """
+    path: str
+    offset: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path} @ 0x{self.offset:X}: {self.message}"
@@ -1,9 +1,12 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from m8py.format.reader import M8FileReader
 from m8py.format.writer import M8FileWriter
+from m8py.models.profile import version_profile
 from m8py.models.version import M8Version
 
+_PICKLE_VERSION = M8Version(6, 5, 0)
+
 @dataclass
 class NoteInterval:
     semitone: int = 0
@@ -41,13 +44,24 @@ class Scale:
             chars.append(chr(b))
         name = "".join(chars)
         tuning = 0.0
-        has_tuning = version is not None and version.at_least(4, 0)
-        if has_tuning:
+        if version is not None and version_profile(version).scale_has_tuning:
             tuning = reader.read_float_le()
         return Scale(name=name, note_enable=note_enable,
                      note_offsets=note_offsets, tuning=tuning,
                      _raw_name=_raw_name)
 
+    def __reduce__(self):
+        """Pickle as the scale encoding (with tuning).
+
+        The name and tuning travel alongside as state, since the encoding
+        truncates the name to 16 ASCII bytes and rounds tuning to float32.
+        """
+        writer = M8FileWriter()
+        replace(self, name="").write(writer)
+        state = {k: v for k, v in vars(self).items()
+                 if k in ("name", "tuning", "_raw_name", "_file_version")}
+        return (_scale_from_bytes, (writer.to_bytes(),), state)
+
     def write(self, writer: M8FileWriter, version: M8Version | None = None) -> None:
         writer.write_u16_le(self.note_enable)
         for ni in self.note_offsets:
@@ -56,6 +70,9 @@ class Scale:
             writer.write_bytes(self._raw_name)
         else:
             writer.write_str(self.name, 16)
-        has_tuning = version is None or version.at_least(4, 0)
-        if has_tuning:
+        if version is None or version_profile(version).scale_has_tuning:
             writer.write_float_le(self.tuning)
+
+
+def _scale_from_bytes(data: bytes) -> Scale:
+    return Scale.from_reader(M8FileReader(data), _PICKLE_VERSION)
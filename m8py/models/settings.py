@@ -2,6 +2,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from m8py.format.reader import M8FileReader
 from m8py.format.writer import M8FileWriter
+from m8py.models.profile import version_profile
 from m8py.models.version import M8Version
 
 
@@ -274,7 +275,7 @@ class EffectsSettings:
         delay = DelaySettings.from_reader(reader)
         reverb = ReverbSettings.from_reader(reader)
 
-        caps = version.caps if version is not None else None
+        caps = version_profile(version).caps if version is not None else None
         shimmer = 0
         ott = None
         mfx_kind = 0
@@ -292,7 +293,7 @@ class EffectsSettings:
         self.chorus.write(writer)
         self.delay.write(writer)
         self.reverb.write(writer)
-        caps = version.caps if version is not None else None
+        caps = version_profile(version).caps if version is not None else None
         if caps is not None and caps.has_reverb_shimmer:
             writer.write(self.shimmer)
             if self.ott is not None:
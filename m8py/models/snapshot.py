@@ -0,0 +1,321 @@
+"""Copy-on-write Song snapshots for undo history.
+
+A SongSnapshot stores every slot of a Song as its encoded bytes.  When a
+snapshot is taken relative to a previous one, slots whose bytes did not
+change share the previous entry, and sections with no changes at all share
+the previous section tuple.  A chain of snapshots therefore costs roughly the
+size of the edits between them rather than a full copy of the song.
+
+Restoring relative to the snapshot that describes the song's current state
+decodes only the slots that differ.
+"""
+from __future__ import annotations
+
+import copy
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from m8py.format.reader import M8FileReader
+from m8py.format.writer import M8FileWriter
+from m8py.models.chain import Chain, ChainStep
+from m8py.models.eq import EQ
+from m8py.models.groove import Groove
+from m8py.models.instrument import read_instrument, write_instrument
+from m8py.models.midi import MIDIMapping
+from m8py.models.phrase import Phrase, PhraseStep
+from m8py.models.raw import RawSlot
+from m8py.models.scale import Scale
+from m8py.models.song_step import SongStep
+from m8py.models.table import Table, TableStep
+from m8py.models.version import M8Version
+
+if TYPE_CHECKING:
+    from m8py.models.song import Song
+
+# Scales are encoded with the newest layout so the tuning field survives
+# snapshots of songs whose own version would drop it.
+_CODEC_VERSION = M8Version(6, 5, 0)
+
+# Song fields that hold plain immutable values and are stored as-is.
+_HEADER_FIELDS = (
+    "directory", "transpose", "tempo", "quantize", "name", "key",
+    "_reserved", "_post_instruments", "_post_effects", "_file_tail",
+)
+
+# Song fields that hold small settings objects and are stored as copies.
+_SETTINGS_FIELDS = ("version", "midi_settings", "mixer_settings", "effects_settings")
+
+
+def _encode(obj: Any) -> bytes:
+    writer = M8FileWriter()
+    obj.write(writer)
+    return writer.to_bytes()
+
+
+def _decode_steps(container: Callable, step_cls: Any, step_size: int) -> Callable:
+    def decode(data: bytes, version: M8Version) -> Any:
+        reader = M8FileReader(data)
+        return container(steps=[step_cls.from_reader(reader)
+                                for _ in range(len(data) // step_size)])
+    return decode
+
+
+def _decode_bytes_list(container: Callable) -> Callable:
+    def decode(data: bytes, version: M8Version) -> Any:
+        return container(list(data))
+    return decode
+
+
+def _encode_instrument(inst: Any) -> tuple[bytes, bool]:
+    writer = M8FileWriter()
+    write_instrument(inst, writer)
+    return writer.to_bytes(), getattr(inst, "_raw", None) is not None
+
+
+def _decode_instrument(entry: tuple[bytes, bool], version: M8Version) -> Any:
+    data, has_raw = entry
+    inst = read_instrument(M8FileReader(data), version)
+    if not has_raw:
+        # Keep programmatic instruments on the structured write path
+        del inst._raw
+    return inst
+
+
+def _encode_scale(scale: Scale) -> tuple[bytes, bool]:
+    writer = M8FileWriter()
+    scale.write(writer, _CODEC_VERSION)
+    return writer.to_bytes(), scale._raw_name is not None
+
+
+def _decode_scale(entry: tuple[bytes, bool], version: M8Version) -> Scale:
+    data, has_raw_name = entry
+    scale = Scale.from_reader(M8FileReader(data), _CODEC_VERSION)
+    if not has_raw_name:
+        scale._raw_name = None
+    return scale
+
+
+def _decode_simple(cls: Any) -> Callable:
+    def decode(data: bytes, version: M8Version) -> Any:
+        return cls.from_reader(M8FileReader(data))
+    return decode
+
+
+def _keep_raw(encode: Callable, decode: Callable) -> tuple[Callable, Callable]:
+    """Wrap a section codec so RawSlots from a lenient load restore as RawSlots."""
+    def encode_slot(obj: Any) -> Any:
+        if isinstance(obj, RawSlot):
+            return RawSlot(bytes(obj.data), obj.size)
+        return encode(obj)
+
+    def decode_slot(entry: Any, version: M8Version) -> Any:
+        if isinstance(entry, RawSlot):
+            return RawSlot(entry.data, entry.size)
+        return decode(entry, version)
+    return encode_slot, decode_slot
+
+
+# Slot sections: Song attribute -> (encode, decode)
+_SECTIONS: dict[str, tuple[Callable, Callable]] = {
+    name: _keep_raw(encode, decode) for name, (encode, decode) in {
+        "grooves": (_encode, _decode_bytes_list(lambda s: Groove(steps=s))),
+        "song_steps": (_encode, _decode_bytes_list(lambda t: SongStep(tracks=t))),
+        "phrases": (_encode, _decode_steps(Phrase, PhraseStep, 9)),
+        "chains": (_encode, _decode_steps(Chain, ChainStep, 2)),
+        "tables": (_encode, _decode_steps(Table, TableStep, 8)),
+        "instruments": (_encode_instrument, _decode_instrument),
+        "midi_mappings": (_encode, _decode_simple(MIDIMapping)),
+        "scales": (_encode_scale, _decode_scale),
+        "eqs": (_encode, _decode_simple(EQ)),
+    }.items()
+}
+
+
+class SongSnapshot:
+    """Immutable, structurally shared record of a Song's state.
+
+    Create one with ``Song.snapshot()``.  Pass the previous snapshot to share
+    unchanged slots with it::
+
+        before = song.snapshot()
+        song.phrases[3].steps[0].note = 60
+        after = song.snapshot(previous=before)
+        after.changed_slots(before)   # {"phrases": [3]}
+        before.restore(song, current=after)  # decodes phrase 3 only
+    """
+
+    __slots__ = ("_header", "_settings", "_sections")
+
+    def __init__(self, header: tuple, settings: tuple,
+                 sections: dict[str, tuple]) -> None:
+        object.__setattr__(self, "_header", header)
+        object.__setattr__(self, "_settings", settings)
+        object.__setattr__(self, "_sections", sections)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SongSnapshot is immutable")
+
+    @staticmethod
+    def capture(song: Song, previous: SongSnapshot | None = None) -> SongSnapshot:
+        """Encode a Song, sharing unchanged entries with ``previous``."""
+        header = tuple(getattr(song, name) for name in _HEADER_FIELDS)
+        if previous is not None and previous._header == header:
+            header = previous._header
+
+        settings = []
+        for i, name in enumerate(_SETTINGS_FIELDS):
+            value = getattr(song, name)
+            if previous is not None and previous._settings[i] == value:
+                settings.append(previous._settings[i])
+            else:
+                settings.append(copy.deepcopy(value))
+
+        sections: dict[str, tuple] = {}
+        for name, (encode, _) in _SECTIONS.items():
+            entries = [encode(obj) for obj in getattr(song, name)]
+            old = previous._sections[name] if previous is not None else None
+            if old is not None:
+                changed = len(old) != len(entries)
+                for i in range(min(len(old), len(entries))):
+                    if old[i] == entries[i]:
+                        entries[i] = old[i]
+                    else:
+                        changed = True
+                if not changed:
+                    sections[name] = old
+                    continue
+            sections[name] = tuple(entries)
+
+        return SongSnapshot(header, tuple(settings), sections)
+
+    @property
+    def version(self) -> M8Version:
+        return copy.copy(self._settings[0])
+
+    def changed_slots(self, other: SongSnapshot) -> dict[str, list[int]]:
+        """Return, per section, the slot indices that differ from ``other``.
+
+        Sections with no differences are omitted.  Runs in time proportional
+        to the number of sections that changed.
+        """
+        result: dict[str, list[int]] = {}
+        for name, entries in self._sections.items():
+            theirs = other._sections[name]
+            if entries is theirs:
+                continue
+            slots = [i for i in range(max(len(entries), len(theirs)))
+                     if i >= len(entries) or i >= len(theirs)
+                     or entries[i] is not theirs[i] and entries[i] != theirs[i]]
+            if slots:
+                result[name] = slots
+        return result
+
+    def slot(self, section: str, index: int) -> Any:
+        """Decode a single slot, e.g. ``snapshot.slot("phrases", 3)``."""
+        _, decode = _SECTIONS[section]
+        return decode(self._sections[section][index], self._settings[0])
+
+    def restore(self, song: Song, current: SongSnapshot | None = None) -> None:
+        """Write this snapshot's state back into ``song`` in place.
+
+        Args:
+            song: The Song to modify.
+            current: A snapshot of ``song``'s present state.  When given,
+                only slots that differ between it and this snapshot are
+                decoded; otherwise every slot is.
+        """
+        for name, value in zip(_HEADER_FIELDS, self._header):
+            setattr(song, name, value)
+        for i, name in enumerate(_SETTINGS_FIELDS):
+            if current is not None and current._settings[i] is self._settings[i]:
+                continue
+            setattr(song, name, copy.deepcopy(self._settings[i]))
+
+        version = self._settings[0]
+        for name, entries in self._sections.items():
+            _, decode = _SECTIONS[name]
+            target = getattr(song, name)
+            theirs = current._sections[name] if current is not None else None
+            if theirs is entries:
+                continue
+            if theirs is None or len(theirs) != len(entries) or len(target) != len(entries):
+                target[:] = [decode(e, version) for e in entries]
+                continue
+            for i, entry in enumerate(entries):
+                if entry is not theirs[i]:
+                    target[i] = decode(entry, version)
+
+    def to_song(self) -> Song:
+        """Materialize this snapshot as a new, independent Song."""
+        from m8py.models.song import Song
+        song = Song()
+        self.restore(song)
+        return song
+
+
+class SongHistory:
+    """Bounded undo/redo history for a Song built on SongSnapshot.
+
+    Call ``commit()`` after each edit.  The oldest entries are evicted once
+    more than ``limit`` undo levels are stored.
+
+    Args:
+        song: The Song being edited.  Undo and redo modify it in place.
+        limit: Maximum number of undo levels kept.
+    """
+
+    def __init__(self, song: Song, limit: int = 50):
+        if limit < 1:
+            raise ValueError(f"history limit must be >= 1, got {limit}")
+        self._song = song
+        self._states: deque[SongSnapshot] = deque([song.snapshot()], maxlen=limit + 1)
+        self._pos = 0
+
+    @property
+    def song(self) -> Song:
+        return self._song
+
+    @property
+    def can_undo(self) -> bool:
+        return self._pos > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._pos < len(self._states) - 1
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __iter__(self) -> Iterator[SongSnapshot]:
+        return iter(self._states)
+
+    def commit(self) -> SongSnapshot:
+        """Record the song's current state as a new undo point."""
+        snap = self._song.snapshot(previous=self._states[self._pos])
+        while len(self._states) > self._pos + 1:
+            self._states.pop()
+        self._states.append(snap)
+        self._pos = len(self._states) - 1
+        return snap
+
+    def undo(self) -> bool:
+        """Step back one commit.  Returns False if there is nothing to undo.
+
+        Uncommitted edits are discarded.
+        """
+        if not self.can_undo:
+            return False
+        self._move(self._pos - 1)
+        return True
+
+    def redo(self) -> bool:
+        """Step forward one commit.  Returns False if there is nothing to redo."""
+        if not self.can_redo:
+            return False
+        self._move(self._pos + 1)
+        return True
+
+    def _move(self, pos: int) -> None:
+        current = self._song.snapshot(previous=self._states[self._pos])
+        self._states[pos].restore(self._song, current=current)
+        self._pos = pos
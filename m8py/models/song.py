@@ -1,23 +1,30 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import List
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, List
 
+from m8py import profiling
 from m8py.format.constants import (
-    EMPTY, HEADER_SIZE,
+    EMPTY, INSTRUMENT_SIZE,
     N_SONG_STEPS, N_PHRASES, N_CHAINS, N_INSTRUMENTS,
-    N_TABLES, N_GROOVES, N_SCALES, N_MIDI_MAPPINGS,
+    N_TABLES, N_GROOVES, N_SCALES, N_MIDI_MAPPINGS, N_TRACKS,
 )
-from m8py.format.offsets import offsets_for_version
+from m8py.format.errors import M8ParseError
+from m8py.format.offsets import SectionSpan
 from m8py.format.reader import M8FileReader
 from m8py.format.writer import M8FileWriter
 from m8py.models.chain import Chain
 from m8py.models.eq import EQ
 from m8py.models.groove import Groove
-from m8py.models.instrument import Instrument, EmptyInstrument, read_instrument, write_instrument
+from m8py.models.instrument import (
+    Instrument, EmptyInstrument, _pickle_bytes, _pickle_state, _rebuilds_equal,
+)
 from m8py.models.midi import MIDIMapping
 from m8py.models.phrase import Phrase
+from m8py.models.profile import version_profile
+from m8py.models.raw import ParseDiagnostic, RawSlot
 from m8py.models.scale import Scale
 from m8py.models.settings import MIDISettings, MixerSettings, EffectsSettings
+from m8py.models.snapshot import SongSnapshot
 from m8py.models.song_step import SongStep
 from m8py.models.table import Table
 from m8py.models.version import M8Version, M8FileType
@@ -50,59 +57,98 @@ class Song:
     _file_tail: bytes = field(default_factory=bytes, repr=False)
 
     @staticmethod
-    def from_reader(reader: M8FileReader, version: M8Version) -> Song:
-        offsets = offsets_for_version(version)
-
-        # Header section (after 14-byte file header)
-        directory = reader.read_bytes(128)
-        transpose = reader.read()
-        tempo = reader.read_float_le()
-        quantize = reader.read()
-        name = reader.read_str(12)
-        midi_settings = MIDISettings.from_reader(reader)
-        key = reader.read()
-        _reserved = reader.read_bytes(18)
-        mixer_settings = MixerSettings.from_reader(reader, version)
-
-        # Seek-based sections
-        reader.seek(offsets.groove)
-        grooves = [Groove.from_reader(reader) for _ in range(N_GROOVES)]
+    def from_reader(reader: M8FileReader, version: M8Version,
+                    diagnostics: list[ParseDiagnostic] | None = None) -> Song:
+        """Decode a song from ``reader``, positioned after the file header.
 
-        reader.seek(offsets.song)
-        song_steps = [SongStep.from_reader(reader) for _ in range(N_SONG_STEPS)]
+        By default any damage raises M8ParseError.  Pass a list as
+        ``diagnostics`` to decode leniently instead: slots that fail to
+        decode become RawSlot placeholders holding their original bytes,
+        slots missing from a truncated file are left empty, unreadable
+        header or settings blocks fall back to defaults, and a
+        ParseDiagnostic is appended to the list for each repair.
+        """
+        profiler = profiling.active()
+        if profiler is None:
+            return Song._decode(reader, version, diagnostics, None)
+        with profiler.measure("read", version, "total", reader):
+            return Song._decode(reader, version, diagnostics, profiler)
 
-        reader.seek(offsets.phrases)
-        phrases = [Phrase.from_reader(reader) for _ in range(N_PHRASES)]
+    @staticmethod
+    def _decode(reader: M8FileReader, version: M8Version,
+                diagnostics: list[ParseDiagnostic] | None,
+                profiler: profiling.Profiler | None) -> Song:
+        profile = version_profile(version)
+        offsets = profile.offsets
+        spans = profile.sections
+        codecs = profile.codecs
+        timed = profiling.section_timer(profiler, "read", version, reader)
+        read_inst = codecs["instruments"].read
+        if profiler is not None:
+            read_inst = profiler.instrument_reader(version, read_inst)
 
-        reader.seek(offsets.chains)
-        chains = [Chain.from_reader(reader) for _ in range(N_CHAINS)]
+        # Header section (after 14-byte file header)
+        with timed("header"):
+            header_start = reader.position()
+            try:
+                directory = reader.read_bytes(128)
+                transpose = reader.read()
+                tempo = reader.read_float_le()
+                quantize = reader.read()
+                name = reader.read_str(12)
+                midi_settings = MIDISettings.from_reader(reader)
+                key = reader.read()
+                _reserved = reader.read_bytes(18)
+                mixer_settings = codecs["mixer_settings"].read(reader)
+            except M8ParseError as e:
+                if diagnostics is None:
+                    raise
+                diagnostics.append(ParseDiagnostic("song", header_start, f"{e}; defaults used"))
+                directory, transpose, tempo, quantize, name = bytes(128), 0, 120.0, 0, ""
+                midi_settings, key, _reserved = MIDISettings(), 0, bytes(18)
+                mixer_settings = MixerSettings()
 
-        reader.seek(offsets.table)
-        tables = [Table.from_reader(reader) for _ in range(N_TABLES)]
+        # Seek-based sections
+        def section(name: str) -> list:
+            with timed(name):
+                return _read_section(reader, name, spans[name], diagnostics,
+                                     read_inst if name == "instruments" else codecs[name].read)
 
-        reader.seek(offsets.instruments)
-        instruments = [read_instrument(reader, version) for _ in range(N_INSTRUMENTS)]
+        grooves = section("grooves")
+        song_steps = section("song_steps")
+        phrases = section("phrases")
+        chains = section("chains")
+        tables = section("tables")
+        instruments = section("instruments")
 
-        _post_instruments = reader.read_bytes(3)
-        effects_settings = EffectsSettings.from_reader(reader, version)
-        # Preserve bytes between effects end and midi_mapping
-        effects_tail_size = offsets.midi_mapping - reader.position()
-        _post_effects = reader.read_bytes(effects_tail_size) if effects_tail_size > 0 else b""
-        midi_mappings = [MIDIMapping.from_reader(reader) for _ in range(N_MIDI_MAPPINGS)]
+        with timed("effects_settings"):
+            settings_start = spans["instruments"].end
+            try:
+                reader.seek(settings_start)
+                _post_instruments = reader.read_bytes(3)
+                effects_settings = codecs["effects_settings"].read(reader)
+                # Preserve bytes between effects end and midi_mapping
+                effects_tail_size = offsets.midi_mapping - reader.position()
+                _post_effects = reader.read_bytes(effects_tail_size) if effects_tail_size > 0 else b""
+            except M8ParseError as e:
+                if diagnostics is None:
+                    raise
+                diagnostics.append(ParseDiagnostic(
+                    "effects_settings", settings_start, f"{e}; defaults used"))
+                _post_instruments, effects_settings, _post_effects = bytes(3), EffectsSettings(), b""
+        midi_mappings = section("midi_mappings")
 
         scales: List[Scale]
-        if version.caps.has_scales and offsets.scale is not None:
-            reader.seek(offsets.scale)
-            scales = [Scale.from_reader(reader, version) for _ in range(N_SCALES)]
+        if "scales" in spans:
+            scales = section("scales")
         else:
             scales = [Scale() for _ in range(N_SCALES)]
 
-        eqs: List[EQ] = []
-        if version.caps.has_eq and offsets.eq is not None:
-            reader.seek(offsets.eq)
-            eqs = [EQ.from_reader(reader) for _ in range(offsets.instrument_eq_count)]
+        eqs: List[EQ] = section("eqs") if "eqs" in spans else []
 
         # Preserve any trailing bytes after the last section
+        if diagnostics is not None:
+            reader.seek(min(max(span.end for span in spans.values()), len(reader._data)))
         remaining = reader.remaining()
         _file_tail = reader.read_bytes(remaining) if remaining > 0 else b""
 
@@ -132,71 +178,178 @@ class Song:
             _file_tail=_file_tail,
         )
 
+    def __reduce__(self):
+        """Pickle (and copy) through the M8 song file encoding.
+
+        The payload is one song file's worth of bytes plus whatever that
+        encoding cannot reproduce, and unpickling runs the regular decoder.
+        Instruments are encoded as ``save()`` writes them; one whose bytes
+        do not decode back to it (an edited loaded instrument, a name too
+        long for the format) travels whole alongside, as do RawSlots from a
+        lenient load and slots whose step lists are not the file's length.  The exact name, tempo, scale names
+        and tunings, the EQ count, unset padding and OTT settings are carried
+        too, so the copy compares equal and saves the same bytes.
+        """
+        irregular = {}
+        for section in _EMPTY_SLOTS:
+            attr, count = _STEP_COUNTS.get(section, (None, 0))
+            slots = {i: item for i, item in enumerate(getattr(self, section))
+                     if isinstance(item, RawSlot) or attr and len(getattr(item, attr)) != count}
+            if slots:
+                irregular[section] = slots
+
+        instruments = []
+        for i, inst in enumerate(self.instruments):
+            if isinstance(inst, RawSlot):
+                instruments.append(RawSlot(_EMPTY_INSTRUMENT, INSTRUMENT_SIZE))
+                continue
+            data = _pickle_bytes(inst)
+            if data is None or not _rebuilds_equal(inst, data, self.version, _pickle_state(inst)):
+                irregular.setdefault("instruments", {})[i] = inst
+                data = data or _EMPTY_INSTRUMENT
+            instruments.append(RawSlot(data, INSTRUMENT_SIZE))
+
+        # Encode a stand-in: names travel as state, odd slots as empty ones
+        encoded = object.__new__(Song)
+        vars(encoded).update(vars(self))
+        encoded.name = ""
+        encoded.instruments = instruments
+        for section, slots in irregular.items():
+            if section != "instruments":
+                setattr(encoded, section, [_EMPTY_SLOTS[section]() if i in slots else item
+                                           for i, item in enumerate(getattr(self, section))])
+        encoded.scales = [replace(s, name="") for s in encoded.scales]
+        writer = M8FileWriter()
+        encoded._encode(writer, None)
+
+        unset = tuple(name for name, value in (
+            ("_post_effects", self._post_effects),
+            ("_file_tail", self._file_tail),
+            ("ott", self.effects_settings.ott),
+        ) if not value)
+        structured = tuple(
+            (i, tuple(k for k in ("_gap", "_tail") if vars(inst).get(k) == b""))
+            for i, inst in enumerate(self.instruments)
+            if getattr(inst, "_raw", None) is None and not isinstance(inst, RawSlot)
+        )
+        default = Scale()
+        named = [(i, scale) for i, scale in enumerate(self.scales) if isinstance(scale, Scale)]
+        unnamed = tuple(i for i, scale in named if scale._raw_name is None)
+        scales = {i: (scale.name, scale.tuning) for i, scale in named
+                  if (scale.name, scale.tuning) != (default.name, default.tuning)
+                  or scale._raw_name is not None}
+        return (_song_from_bytes,
+                (writer.to_bytes(), len(self.eqs), unset, structured, unnamed, irregular, scales),
+                {"name": self.name, "tempo": self.tempo})
+
+    def snapshot(self, previous: SongSnapshot | None = None) -> SongSnapshot:
+        """Capture an immutable snapshot of this song.
+
+        Slots unchanged since ``previous`` share its storage, so keeping a
+        long chain of snapshots costs roughly the size of the edits.
+        """
+        return SongSnapshot.capture(self, previous)
+
+    def restore(self, snapshot: SongSnapshot, current: SongSnapshot | None = None) -> None:
+        """Reset this song to the state recorded in ``snapshot``.
+
+        If ``current`` is a snapshot of this song's present state, only the
+        slots that differ are decoded.
+        """
+        snapshot.restore(self, current)
+
     def write(self, writer: M8FileWriter) -> None:
+        profiler = profiling.active()
+        if profiler is None:
+            self._encode(writer, None)
+            return
+        with profiler.measure("write", self.version, "total", writer):
+            self._encode(writer, profiler)
+
+    def _encode(self, writer: M8FileWriter, profiler: profiling.Profiler | None) -> None:
         version = self.version
-        offsets = offsets_for_version(version)
+        profile = version_profile(version)
+        offsets = profile.offsets
+        codecs = profile.codecs
+        timed = profiling.section_timer(profiler, "write", version, writer)
+        write_inst = codecs["instruments"].write
+        if profiler is not None:
+            write_inst = profiler.instrument_writer(version, write_inst)
 
         # Write header
         M8FileType.write_header(writer, version)
 
         # Header section
-        writer.write_bytes(self.directory[:128])
-        if len(self.directory) < 128:
-            writer.pad(128 - len(self.directory))
-        writer.write(self.transpose)
-        writer.write_float_le(self.tempo)
-        writer.write(self.quantize)
-        writer.write_str(self.name, 12)
-        self.midi_settings.write(writer)
-        writer.write(self.key)
-        writer.write_bytes(self._reserved)
-        self.mixer_settings.write(writer, version)
+        with timed("header"):
+            writer.write_bytes(self.directory[:128])
+            if len(self.directory) < 128:
+                writer.pad(128 - len(self.directory))
+            writer.write(self.transpose)
+            writer.write_float_le(self.tempo)
+            writer.write(self.quantize)
+            writer.write_str(self.name, 12)
+            self.midi_settings.write(writer)
+            writer.write(self.key)
+            writer.write_bytes(self._reserved)
+            codecs["mixer_settings"].write(self.mixer_settings, writer)
 
         # Pad to groove offset
-        _pad_to(writer, offsets.groove)
-        for g in self.grooves:
-            g.write(writer)
-
-        _pad_to(writer, offsets.song)
-        for s in self.song_steps:
-            s.write(writer)
-
-        _pad_to(writer, offsets.phrases)
-        for p in self.phrases:
-            p.write(writer)
-
-        _pad_to(writer, offsets.chains)
-        for c in self.chains:
-            c.write(writer)
-
-        _pad_to(writer, offsets.table)
-        for t in self.tables:
-            t.write(writer)
-
-        _pad_to(writer, offsets.instruments)
-        for inst in self.instruments:
-            write_instrument(inst, writer)
-
-        writer.write_bytes(self._post_instruments[:3])
-        self.effects_settings.write(writer, version)
-        if self._post_effects:
-            writer.write_bytes(self._post_effects)
-        _pad_to(writer, offsets.midi_mapping)
-        for m in self.midi_mappings:
-            m.write(writer)
-
-        if version.caps.has_scales and offsets.scale is not None:
-            _pad_to(writer, offsets.scale)
-            for s in self.scales:
-                s.write(writer, version)
-
-        if version.caps.has_eq and offsets.eq is not None:
-            _pad_to(writer, offsets.eq)
-            for i in range(offsets.instrument_eq_count):
-                if i < len(self.eqs):
-                    self.eqs[i].write(writer)
-                else:
-                    EQ().write(writer)
+        with timed("grooves"):
+            _pad_to(writer, offsets.groove)
+            for g in self.grooves:
+                g.write(writer)
+
+        with timed("song_steps"):
+            _pad_to(writer, offsets.song)
+            for s in self.song_steps:
+                s.write(writer)
+
+        with timed("phrases"):
+            _pad_to(writer, offsets.phrases)
+            for p in self.phrases:
+                p.write(writer)
+
+        with timed("chains"):
+            _pad_to(writer, offsets.chains)
+            for c in self.chains:
+                c.write(writer)
+
+        with timed("tables"):
+            _pad_to(writer, offsets.table)
+            for t in self.tables:
+                t.write(writer)
+
+        with timed("instruments"):
+            _pad_to(writer, offsets.instruments)
+            for inst in self.instruments:
+                write_inst(inst, writer)
+
+        with timed("effects_settings"):
+            writer.write_bytes(self._post_instruments[:3])
+            codecs["effects_settings"].write(self.effects_settings, writer)
+            if self._post_effects:
+                writer.write_bytes(self._post_effects)
+
+        with timed("midi_mappings"):
+            _pad_to(writer, offsets.midi_mapping)
+            for m in self.midi_mappings:
+                m.write(writer)
+
+        if profile.caps.has_scales and offsets.scale is not None:
+            with timed("scales"):
+                _pad_to(writer, offsets.scale)
+                write_scale = codecs["scales"].write
+                for s in self.scales:
+                    write_scale(s, writer)
+
+        if profile.caps.has_eq and offsets.eq is not None:
+            with timed("eqs"):
+                _pad_to(writer, offsets.eq)
+                for i in range(offsets.instrument_eq_count):
+                    if i < len(self.eqs):
+                        self.eqs[i].write(writer)
+                    else:
+                        EQ().write(writer)
 
         # v6.5+ files have 32 trailing bytes after EQs
         if self._file_tail:
@@ -205,6 +358,78 @@ class Song:
             writer.pad(32)
 
 
+def _song_from_bytes(data: bytes, eq_count: int, unset: tuple[str, ...],
+                     structured_instruments: tuple[tuple[int, tuple[str, ...]], ...],
+                     unnamed_scales: tuple[int, ...], irregular: dict[str, dict[int, Any]],
+                     scale_fields: dict[int, tuple[str, float]]) -> Song:
+    """Rebuild a pickled Song; see ``Song.__reduce__``."""
+    reader = M8FileReader(data)
+    song = Song.from_reader(reader, M8FileType.from_reader(reader))
+    del song.eqs[eq_count:]
+    for name in unset:
+        if name == "ott":
+            song.effects_settings.ott = None
+        else:
+            setattr(song, name, b"")
+    for i, unset_padding in structured_instruments:
+        inst = song.instruments[i]
+        del inst._raw
+        for name in unset_padding:
+            setattr(inst, name, b"")
+    for section, slots in irregular.items():
+        items = getattr(song, section)
+        for i, item in slots.items():
+            items[i] = item
+    for i in unnamed_scales:
+        song.scales[i]._raw_name = None
+    for i, (name, tuning) in scale_fields.items():
+        song.scales[i].name, song.scales[i].tuning = name, tuning
+    return song
+
+
+# Length of the step list each slot of these sections has in the file
+_STEP_COUNTS: dict[str, tuple[str, int]] = {
+    "grooves": ("steps", 16), "song_steps": ("tracks", N_TRACKS), "phrases": ("steps", 16),
+    "chains": ("steps", 16), "tables": ("steps", 16),
+}
+
+_EMPTY_INSTRUMENT = b"\xff" + bytes(INSTRUMENT_SIZE - 1)
+
+_EMPTY_SLOTS: dict[str, Callable[[], Any]] = {
+    "grooves": Groove, "song_steps": SongStep, "phrases": Phrase, "chains": Chain,
+    "tables": Table, "instruments": EmptyInstrument, "midi_mappings": MIDIMapping,
+    "scales": Scale, "eqs": EQ,
+}
+
+
+def _read_section(reader: M8FileReader, name: str, span: SectionSpan,
+                  diagnostics: list[ParseDiagnostic] | None,
+                  decode: Callable[[M8FileReader], Any]) -> list:
+    """Decode every slot of a section; see ``Song.from_reader`` for leniency."""
+    if diagnostics is None:
+        reader.seek(span.offset)
+        return [decode(reader) for _ in range(span.count)]
+
+    size = len(reader._data)
+    items: list = []
+    for i in range(span.count):
+        start = span.offset + i * span.stride
+        if start >= size:
+            items.extend(_EMPTY_SLOTS[name]() for _ in range(i, span.count))
+            diagnostics.append(ParseDiagnostic(
+                f"{name}[{i}:]", start,
+                f"file ends at offset {size}; {span.count - i} missing slots left empty",
+            ))
+            break
+        try:
+            reader.seek(start)
+            items.append(decode(reader))
+        except (M8ParseError, ValueError) as e:
+            items.append(RawSlot(bytes(reader._data[start:start + span.stride]), span.stride))
+            diagnostics.append(ParseDiagnostic(f"{name}[{i}]", start, f"{e}; kept as RawSlot"))
+    return items
+
+
 def _pad_to(writer: M8FileWriter, target: int) -> None:
     """Pad the writer to reach the target offset."""
     current = writer.position()
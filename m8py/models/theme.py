@@ -47,6 +47,13 @@ class Theme:
             meter_peak=RGB.from_reader(reader),
         )
 
+    def __reduce__(self):
+        """Pickle as the 39-byte theme encoding."""
+        writer = M8FileWriter()
+        self.write(writer)
+        state = {k: v for k, v in vars(self).items() if k == "_file_version"}
+        return (_theme_from_bytes, (writer.to_bytes(),), state)
+
     def write(self, writer: M8FileWriter) -> None:
         for color in [
             self.background, self.text_empty, self.text_info,
@@ -56,3 +63,7 @@ class Theme:
             self.meter_peak,
         ]:
             color.write(writer)
+
+
+def _theme_from_bytes(data: bytes) -> Theme:
+    return Theme.from_reader(M8FileReader(data))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from functools import lru_cache
 from m8py.format.reader import M8FileReader
 from m8py.format.writer import M8FileWriter
 from m8py.format.constants import HEADER_MAGIC
@@ -20,7 +21,7 @@ class M8Version:
 
     @property
     def caps(self) -> VersionCapabilities:
-        return VersionCapabilities.from_version(self)
+        return _caps_for(self.major, self.minor)
 
 
 @dataclass(frozen=True)
@@ -52,6 +53,11 @@ class VersionCapabilities:
         )
 
 
+@lru_cache(maxsize=None)
+def _caps_for(major: int, minor: int) -> VersionCapabilities:
+    return VersionCapabilities.from_version(M8Version(major, minor, 0))
+
+
 class M8FileType:
     @staticmethod
     def from_reader(reader: M8FileReader) -> M8Version:
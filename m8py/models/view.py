@@ -0,0 +1,132 @@
+"""Read-only, buffer-backed views over encoded song files.
+
+A SongView wraps the bytes of a ``.m8s`` file (any buffer: ``bytes``,
+``mmap``, or a shared-memory block) and exposes its sections as memoryview
+slices.  Individual slots are decoded on demand; nothing is copied or parsed
+until it is asked for.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from m8py.format.constants import HEADER_SIZE
+from m8py.format.errors import M8ParseError
+from m8py.format.offsets import SectionSpan
+from m8py.format.reader import M8FileReader
+from m8py.models.chain import Chain
+from m8py.models.groove import Groove
+from m8py.models.instrument import Instrument
+from m8py.models.phrase import Phrase
+from m8py.models.profile import version_profile
+from m8py.models.song import Song
+from m8py.models.song_step import SongStep
+from m8py.models.table import Table
+from m8py.models.version import M8FileType, M8Version
+
+# Song header fields, as offsets from the start of the file
+_TEMPO_OFFSET = HEADER_SIZE + 128 + 1
+_NAME_OFFSET = _TEMPO_OFFSET + 4 + 1
+_NAME_SIZE = 12
+
+
+class SongView:
+    """Read-only view of an encoded song held in any buffer.
+
+    Args:
+        buffer: The complete song file, including its 14-byte header.
+
+    Example:
+        view = SongView(Path("song.m8s").read_bytes())
+        view.name, view.tempo
+        view.section("phrases")        # memoryview, no copy
+        view.phrase(3)                 # decodes one Phrase
+    """
+
+    def __init__(self, buffer: Any):
+        self._buf = memoryview(buffer).toreadonly()
+        if len(self._buf) < HEADER_SIZE:
+            raise M8ParseError(
+                f"song buffer too small: {len(self._buf)} bytes, need at least {HEADER_SIZE}"
+            )
+        self._version = M8FileType.from_reader(M8FileReader(bytes(self._buf[:HEADER_SIZE])))
+        self._profile = version_profile(self._version)
+        self._spans = self._profile.sections
+        end = max(span.end for span in self._spans.values())
+        if len(self._buf) < end:
+            raise M8ParseError(
+                f"song buffer truncated: {len(self._buf)} bytes, sections end at {end}"
+            )
+
+    @property
+    def version(self) -> M8Version:
+        return self._version
+
+    @property
+    def buffer(self) -> memoryview:
+        return self._buf
+
+    @property
+    def name(self) -> str:
+        return M8FileReader(bytes(self._buf[_NAME_OFFSET:_NAME_OFFSET + _NAME_SIZE])).read_str(_NAME_SIZE)
+
+    @property
+    def tempo(self) -> float:
+        return M8FileReader(bytes(self._buf[_TEMPO_OFFSET:_TEMPO_OFFSET + 4])).read_float_le()
+
+    @property
+    def sections(self) -> dict[str, SectionSpan]:
+        return dict(self._spans)
+
+    def section(self, name: str) -> memoryview:
+        """Return the raw bytes of a section, e.g. ``"phrases"``."""
+        span = self._span(name)
+        return self._buf[span.offset:span.end]
+
+    def slot(self, name: str, index: int) -> memoryview:
+        """Return the raw bytes of one slot in a section."""
+        return self._buf[self._span(name).slot(index)]
+
+    def get(self, name: str, index: int) -> Any:
+        """Decode one slot of a section into its model object."""
+        reader = M8FileReader(bytes(self.slot(name, index)))
+        return self._profile.codecs[name].read(reader)
+
+    def groove(self, index: int) -> Groove:
+        return self.get("grooves", index)
+
+    def song_step(self, index: int) -> SongStep:
+        return self.get("song_steps", index)
+
+    def phrase(self, index: int) -> Phrase:
+        return self.get("phrases", index)
+
+    def chain(self, index: int) -> Chain:
+        return self.get("chains", index)
+
+    def table(self, index: int) -> Table:
+        return self.get("tables", index)
+
+    def instrument(self, index: int) -> Instrument:
+        return self.get("instruments", index)
+
+    def to_song(self) -> Song:
+        """Decode the whole buffer into an independent Song."""
+        reader = M8FileReader(bytes(self._buf))
+        return Song.from_reader(reader, M8FileType.from_reader(reader))
+
+    def release(self) -> None:
+        """Release the underlying buffer.  The view is unusable afterwards."""
+        self._buf.release()
+
+    def __enter__(self) -> SongView:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+    def _span(self, name: str) -> SectionSpan:
+        span = self._spans.get(name)
+        if span is None:
+            raise KeyError(f"section {name!r} not present in v{self._version.major}."
+                           f"{self._version.minor} songs")
+        return span
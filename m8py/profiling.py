@@ -0,0 +1,225 @@
+"""Opt-in timing of song decoding and encoding.
+
+While a Profiler is active, ``Song.from_reader`` and ``Song.write`` record
+wall time, call counts and bytes for each section of the file (header,
+grooves, song steps, phrases, chains, tables, instruments, effects
+settings, MIDI mappings, scales, EQs) and for each instrument kind, keyed
+by firmware layout.  When no profiler is active the only cost is one
+function call per song.
+
+Example::
+
+    with profiling.profile(trace=True) as prof:
+        song = load("SONG.m8s")
+        save(song, "OUT.m8s")
+    print(prof.stats.format())
+    prof.write_trace("trace.json")   # open in chrome://tracing or Perfetto
+
+Timings are per process and the profiler is not thread-safe: profile one
+thread at a time.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Iterator, Union
+
+if TYPE_CHECKING:
+    from m8py.models.version import M8Version
+
+# (operation, layout, section or instrument kind), e.g. ("read", "4.1", "phrases")
+StatsKey = tuple[str, str, str]
+
+_active: Profiler | None = None
+_NULL = nullcontext()
+
+
+@dataclass
+class Timing:
+    """Accumulated cost of one section or instrument kind."""
+    calls: int = 0
+    seconds: float = 0.0
+    bytes: int = 0
+
+    @property
+    def mean(self) -> float:
+        """Seconds per call."""
+        return self.seconds / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileStats:
+    """Timings keyed by ``(operation, layout, name)``.
+
+    ``operation`` is ``"read"`` or ``"write"`` and ``layout`` the firmware
+    version as ``"major.minor"``.  In ``sections`` the name is a song
+    section, or ``"total"`` for the whole call; in ``instruments`` it is an
+    instrument class name such as ``"Sampler"`` or ``"EmptyInstrument"``.
+    Section bytes include any padding skipped before the section.
+    """
+    sections: dict[StatsKey, Timing] = field(default_factory=dict)
+    instruments: dict[StatsKey, Timing] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, list[dict[str, Any]]]:
+        """JSON-ready form: one record per key."""
+        return {
+            group: [{"operation": op, "layout": layout, "name": name,
+                     "calls": t.calls, "seconds": t.seconds, "bytes": t.bytes}
+                    for (op, layout, name), t in timings.items()]
+            for group, timings in (("sections", self.sections), ("instruments", self.instruments))
+        }
+
+    def format(self) -> str:
+        """Render both tables as fixed-width text."""
+        return "\n\n".join(_format_table(title, timings) for title, timings in (
+            ("section", self.sections), ("instrument", self.instruments)) if timings)
+
+
+class Profiler:
+    """Collects timings while active; see ``profile()`` and ``enable()``.
+
+    With ``trace=True`` every measured section and instrument is also kept
+    as a Chrome trace event.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self.stats = ProfileStats()
+        self.trace = trace
+        self.events: list[dict[str, Any]] = []
+        self._origin = perf_counter()
+        self._pid = os.getpid()
+
+    def measure(self, operation: str, version: M8Version, name: str, stream) -> ContextManager:
+        """Time a block that reads from or writes to ``stream``.
+
+        Bytes are the change in ``stream.position()`` across the block.
+        """
+        return _Measure(self, self.stats.sections,
+                        (operation, _layout(version), name), stream, "section")
+
+    def instrument_reader(self, version: M8Version, read: Callable) -> Callable:
+        """Wrap an instrument decoder to record time per decoded kind."""
+        layout = _layout(version)
+
+        def timed_read(reader):
+            position, start = reader.position(), perf_counter()
+            instrument = read(reader)
+            self._add(self.stats.instruments, ("read", layout, type(instrument).__name__),
+                      start, perf_counter() - start, reader.position() - position, "instrument")
+            return instrument
+        return timed_read
+
+    def instrument_writer(self, version: M8Version, write: Callable) -> Callable:
+        """Wrap an instrument encoder to record time per encoded kind."""
+        layout = _layout(version)
+
+        def timed_write(instrument, writer):
+            position, start = writer.position(), perf_counter()
+            write(instrument, writer)
+            self._add(self.stats.instruments, ("write", layout, type(instrument).__name__),
+                      start, perf_counter() - start, writer.position() - position, "instrument")
+        return timed_write
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The recorded events as a Chrome trace-event JSON object."""
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Union[str, Path]) -> None:
+        """Write ``chrome_trace()`` to a file."""
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+    def _add(self, table: dict[StatsKey, Timing], key: StatsKey, start: float,
+             seconds: float, nbytes: int, category: str) -> None:
+        timing = table.get(key)
+        if timing is None:
+            timing = table[key] = Timing()
+        timing.calls += 1
+        timing.seconds += seconds
+        timing.bytes += max(nbytes, 0)
+        if self.trace:
+            operation, layout, name = key
+            self.events.append({
+                "name": name, "cat": f"{operation},{category}", "ph": "X",
+                "ts": (start - self._origin) * 1e6, "dur": seconds * 1e6,
+                "pid": self._pid, "tid": threading.get_ident(),
+                "args": {"operation": operation, "layout": layout, "bytes": max(nbytes, 0)},
+            })
+
+
+class _Measure:
+    __slots__ = ("_profiler", "_table", "_key", "_stream", "_category", "_position", "_start")
+
+    def __init__(self, profiler: Profiler, table: dict[StatsKey, Timing], key: StatsKey,
+                 stream, category: str) -> None:
+        self._profiler, self._table, self._key = profiler, table, key
+        self._stream, self._category = stream, category
+
+    def __enter__(self) -> None:
+        self._position = self._stream.position()
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = perf_counter() - self._start
+        self._profiler._add(self._table, self._key, self._start, elapsed,
+                            self._stream.position() - self._position, self._category)
+
+
+def active() -> Profiler | None:
+    """The running profiler, or None when profiling is off."""
+    return _active
+
+
+def enable(trace: bool = False) -> Profiler:
+    """Start a new profiler, replacing any active one, and return it."""
+    global _active
+    _active = Profiler(trace)
+    return _active
+
+
+def disable() -> Profiler | None:
+    """Stop profiling and return the profiler that was active."""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+@contextmanager
+def profile(trace: bool = False) -> Iterator[Profiler]:
+    """Profile the block; the previously active profiler resumes afterwards."""
+    global _active
+    previous, _active = _active, Profiler(trace)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def section_timer(profiler: Profiler | None, operation: str, version: M8Version,
+                  stream) -> Callable[[str], ContextManager]:
+    """``timer(name)`` context managers for one song; no-ops without a profiler."""
+    if profiler is None:
+        return lambda name: _NULL
+    return lambda name: profiler.measure(operation, version, name, stream)
+
+
+def _layout(version: M8Version) -> str:
+    return f"{version.major}.{version.minor}"
+
+
+def _format_table(title: str, timings: dict[StatsKey, Timing]) -> str:
+    header = ("op", "layout", title, "calls", "total ms", "mean us", "bytes", "MB/s")
+    rows = [header] + [(
+        op, layout, name, str(t.calls), f"{t.seconds * 1e3:.3f}", f"{t.mean * 1e6:.1f}",
+        str(t.bytes), f"{t.bytes / t.seconds / 1e6:.1f}" if t.seconds else "-",
+    ) for (op, layout, name), t in sorted(timings.items(), key=lambda kv: kv[0][:2])]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = ["  ".join(cell.ljust(w) if i < 3 else cell.rjust(w)
+                       for i, (cell, w) in enumerate(zip(row, widths))).rstrip()
+             for row in rows]
+    lines.insert(1, "  ".join("-" * w for w in widths))
+    return "\n".join(lines)
@@ -0,0 +1,162 @@
+"""Publish encoded songs in shared memory for multi-process readers.
+
+A SharedSongCorpus packs many song files into one
+``multiprocessing.shared_memory`` block: a small header, an offset index,
+then the raw song bytes back to back.  Worker processes attach by name and
+read songs through read-only ``SongView`` objects, so N workers share a
+single copy of the corpus instead of each unpickling their own.
+
+Example::
+
+    # parent
+    with SharedSongCorpus.create(paths) as corpus:
+        with ProcessPoolExecutor(initializer=init, initargs=(corpus.name,)) as ex:
+            ...
+
+    # worker
+    corpus = SharedSongCorpus.attach(name)
+    view = corpus[i]
+    view.phrase(0)
+"""
+from __future__ import annotations
+
+import struct
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Union
+
+from m8py.format.errors import M8ParseError
+from m8py.format.writer import M8FileWriter
+from m8py.models.song import Song
+from m8py.models.view import SongView
+
+_MAGIC = b"M8PYSHM1"
+_HEADER = struct.Struct("<8sQ")      # magic, song count
+_ENTRY = struct.Struct("<QQ")        # offset, length
+
+SongSource = Union[Song, str, Path, bytes, bytearray, memoryview]
+
+
+class SharedSongCorpus:
+    """A set of encoded songs stored in one shared-memory block.
+
+    Use ``create()`` in the publishing process and ``attach()`` in readers.
+    Views returned by indexing borrow the shared buffer; release them (or let
+    them go out of scope) before calling ``close()``.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        magic, count = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC:
+            self._buf = None
+            shm.close()
+            raise M8ParseError(f"shared block {shm.name!r} is not an m8py song corpus")
+        self._count = count
+        self._index = self._buf[_HEADER.size:_HEADER.size + count * _ENTRY.size].cast("Q")
+
+    @staticmethod
+    def create(songs: Iterable[SongSource], name: str | None = None) -> SharedSongCorpus:
+        """Publish songs into a new shared-memory block.
+
+        Args:
+            songs: Song objects, paths to ``.m8s`` files, or encoded bytes.
+                Files are read straight into the shared block.
+            name: Optional name for the block; one is generated otherwise.
+        """
+        blobs: list[Path | memoryview] = []
+        for src in songs:
+            if isinstance(src, Song):
+                writer = M8FileWriter()
+                src.write(writer)
+                blobs.append(memoryview(writer.to_bytes()))
+            elif isinstance(src, (str, Path)):
+                blobs.append(Path(src))
+            else:
+                blobs.append(memoryview(src).cast("B"))
+        sizes = [b.stat().st_size if isinstance(b, Path) else len(b) for b in blobs]
+
+        data_start = _HEADER.size + len(blobs) * _ENTRY.size
+        shm = shared_memory.SharedMemory(name=name, create=True,
+                                         size=data_start + sum(sizes))
+        buf = shm.buf
+        try:
+            _HEADER.pack_into(buf, 0, _MAGIC, len(blobs))
+            offset = data_start
+            for i, (blob, size) in enumerate(zip(blobs, sizes)):
+                _ENTRY.pack_into(buf, _HEADER.size + i * _ENTRY.size, offset, size)
+                if isinstance(blob, Path):
+                    with open(blob, "rb") as f:
+                        read = f.readinto(buf[offset:offset + size])
+                    if read != size:
+                        raise M8ParseError(f"{blob}: expected {size} bytes, read {read}")
+                else:
+                    buf[offset:offset + size] = blob
+                offset += size
+        except BaseException:
+            del buf
+            shm.close()
+            shm.unlink()
+            raise
+        del buf
+        return SharedSongCorpus(shm, owner=True)
+
+    @staticmethod
+    def attach(name: str) -> SharedSongCorpus:
+        """Attach to a corpus published by another process."""
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return SharedSongCorpus(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, index: int) -> memoryview:
+        """Return the encoded bytes of one song without copying."""
+        if not 0 <= index < self._count:
+            raise IndexError(f"song {index} out of range [0, {self._count})")
+        offset = self._index[2 * index]
+        length = self._index[2 * index + 1]
+        return self._buf[offset:offset + length].toreadonly()
+
+    def __getitem__(self, index: int) -> SongView:
+        if index < 0:
+            index += self._count
+        return SongView(self.raw(index))
+
+    def __iter__(self) -> Iterator[SongView]:
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self) -> None:
+        """Detach from the shared block.  Outstanding views must be released."""
+        if self._buf is None:
+            return
+        self._index.release()
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared block.  Only the creating process should call this."""
+        self._shm.unlink()
+
+    def __enter__(self) -> SharedSongCorpus:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+        if self._owner:
+            self.unlink()
@@ -0,0 +1,5 @@
+"""Helpers for tests and benchmarks of code built on m8py.
+
+``m8py.testing.corpus`` generates synthetic song, instrument, theme and
+scale files for every firmware layout.
+"""
@@ -0,0 +1,460 @@
+"""Generate synthetic M8 files for performance and scaling tests.
+
+``generate()`` writes any number of ``.m8s``, ``.m8i``, ``.m8t`` and
+``.m8n`` files, cycling through every firmware layout m8py reads, so test
+suites can work on thousands of realistic files without shipping user
+songs.  A Profile controls what the files contain: how many slots are in
+use, how full phrases are, which instrument kinds appear and which
+modulator types they carry.
+
+Files are built by stamping bytes into pre-encoded templates: each layout's
+empty song and each instrument kind is encoded once, and generation only
+copies the template and overwrites the bytes that differ.  No model objects
+are built per file, and whole sections are filled a column at a time.
+
+Output is a pure function of ``(seed, profile, index)``: the same
+arguments always produce the same bytes, and ``generate(10, seed)`` writes
+the same first ten files as ``generate(1000, seed)``.
+
+Example::
+
+    paths = generate(2000, seed=7, profile="sparse", out="corpus/")
+    songs = [p for p in paths if p.suffix == ".m8s"]
+"""
+from __future__ import annotations
+
+import random
+import struct
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Union
+
+from m8py.format.constants import (
+    EMPTY, HEADER_SIZE, INSTRUMENT_SIZE, InstrumentKind, ModulatorType,
+    N_CHAINS, N_INSTRUMENTS, N_PHRASES, N_SONG_STEPS, N_TABLES,
+)
+from m8py.format.offsets import CHAIN_STEP_SIZE, PHRASE_STEP_SIZE, TABLE_SIZE, TABLE_STEP_SIZE
+from m8py.format.writer import M8FileWriter
+from m8py.models.eq import EQ
+from m8py.models.instrument import (
+    External, FMSynth, HyperSynth, MacroSynth, MIDIOut, Sampler, SynthCommon, WavSynth,
+)
+from m8py.models.profile import version_profile
+from m8py.models.scale import Scale
+from m8py.models.song import Song
+from m8py.models.version import M8FileType, M8Version
+
+# Firmware layouts with distinct song encodings, by label
+LAYOUTS: dict[str, M8Version] = {
+    "v2": M8Version(2, 0, 0),
+    "v2.5": M8Version(2, 5, 0),
+    "v4": M8Version(4, 0, 0),
+    "v4.1": M8Version(4, 1, 0),
+    "v6.5": M8Version(6, 5, 0),
+}
+
+# File types generate() writes, with their extensions
+FILE_TYPES: dict[str, str] = {
+    "song": ".m8s",
+    "instrument": ".m8i",
+    "theme": ".m8t",
+    "scale": ".m8n",
+}
+
+
+@dataclass(frozen=True)
+class Profile:
+    """What a generated file contains.
+
+    Args:
+        name: Profile label.
+        density: Fraction of phrase, chain, instrument, table and song-row
+            slots in use.
+        step_fill: Fraction of steps holding data within a used phrase,
+            chain, table or song row.
+        fx_fill: Chance that a filled phrase or table step carries an FX.
+        kinds: Instrument kinds with relative weights.  Kinds a layout
+            cannot hold (HyperSynth, External before 3.0) are skipped there.
+        modulators: Modulator types to draw from; TrigEnv and TrackingEnv
+            are skipped before 3.0.
+        modulator_slots: How many of an instrument's 4 modulators are set.
+    """
+    name: str
+    density: float
+    step_fill: float
+    fx_fill: float
+    kinds: tuple[tuple[InstrumentKind, int], ...]
+    modulators: tuple[ModulatorType, ...]
+    modulator_slots: int
+
+
+PROFILES: dict[str, Profile] = {
+    "sparse": Profile(
+        "sparse", density=0.1, step_fill=0.25, fx_fill=0.1,
+        kinds=((InstrumentKind.SAMPLER, 3), (InstrumentKind.WAVSYNTH, 1),
+               (InstrumentKind.MIDIOUT, 1)),
+        modulators=(ModulatorType.AHD_ENV, ModulatorType.LFO),
+        modulator_slots=1,
+    ),
+    "typical": Profile(
+        "typical", density=0.5, step_fill=0.5, fx_fill=0.3,
+        kinds=((InstrumentKind.SAMPLER, 4), (InstrumentKind.WAVSYNTH, 2),
+               (InstrumentKind.MACROSYNTH, 2), (InstrumentKind.FMSYNTH, 2),
+               (InstrumentKind.HYPERSYNTH, 1), (InstrumentKind.MIDIOUT, 1),
+               (InstrumentKind.EXTERNAL, 1)),
+        modulators=tuple(ModulatorType),
+        modulator_slots=2,
+    ),
+    "full": Profile(
+        "full", density=1.0, step_fill=1.0, fx_fill=1.0,
+        kinds=tuple((kind, 1) for kind in InstrumentKind if kind != InstrumentKind.NONE),
+        modulators=tuple(ModulatorType),
+        modulator_slots=4,
+    ),
+}
+
+# FX commands with harmless values in every layout
+_FX_NAMES = ("ARP", "CHA", "DEL", "RET", "REP")
+
+# Byte offsets inside the encodings being stamped
+_SONG_TEMPO = HEADER_SIZE + 129       # after the 128-byte directory and transpose
+_SONG_NAME = HEADER_SIZE + 134
+_INST_NAME = 1
+_INST_VOLUME = 15                     # synth kinds: after name, transp_eq, table_tick
+_INST_CUTOFF = 19
+_MIDI_CHANNEL = 16
+_MODS = 63
+_SAMPLE_PATH = 87
+_THEME_SIZE = 39
+
+_SYNTH_CLASSES = {
+    InstrumentKind.WAVSYNTH: WavSynth,
+    InstrumentKind.MACROSYNTH: MacroSynth,
+    InstrumentKind.SAMPLER: Sampler,
+    InstrumentKind.FMSYNTH: FMSynth,
+    InstrumentKind.HYPERSYNTH: HyperSynth,
+    InstrumentKind.EXTERNAL: External,
+}
+
+# 0-255 random bytes mapped onto value ranges
+_NOTES = bytes(24 + b % 72 for b in range(256))
+_VELOCITIES = bytes(0x40 + b % 0x40 for b in range(256))
+_TRANSPOSES = bytes(b % 24 for b in range(256))
+_CHAIN_TRANSPOSES = bytes(b % 13 for b in range(256))
+
+ProfileArg = Union[str, Profile]
+
+
+def generate(
+    n: int,
+    seed: int = 0,
+    profile: ProfileArg = "typical",
+    out: Union[str, Path, None] = None,
+    layouts: Iterable[str] | None = None,
+    types: Iterable[str] | None = None,
+) -> list[Path]:
+    """Write ``n`` generated files and return their paths.
+
+    File ``i`` takes its type and layout from position ``i`` in the cycle
+    over ``types`` x ``layouts``, so any ``n`` at least that long covers
+    every combination.  Names look like ``00042-song-v4.1.m8s``.
+
+    Args:
+        n: Number of files to write.
+        seed: Base seed; each file derives its own from it.
+        profile: A Profile or the name of one in ``PROFILES``.
+        out: Directory to write into (created if missing); defaults to a
+            new temporary directory.
+        layouts: Labels from ``LAYOUTS``; defaults to all of them.
+        types: Keys of ``FILE_TYPES``; defaults to all of them.
+    """
+    profile = _resolve(profile)
+    layouts = list(LAYOUTS if layouts is None else layouts)
+    types = list(FILE_TYPES if types is None else types)
+    for layout in layouts:
+        if layout not in LAYOUTS:
+            raise ValueError(f"unknown layout {layout!r}; expected one of {list(LAYOUTS)}")
+    for file_type in types:
+        if file_type not in FILE_TYPES:
+            raise ValueError(f"unknown file type {file_type!r}; expected one of {list(FILE_TYPES)}")
+    if not layouts or not types:
+        raise ValueError("layouts and types must not be empty")
+
+    root = Path(tempfile.mkdtemp(prefix="m8py-corpus-") if out is None else out)
+    root.mkdir(parents=True, exist_ok=True)
+    combos = [(t, layout) for t in types for layout in layouts]
+    paths = []
+    for i in range(n):
+        file_type, layout = combos[i % len(combos)]
+        path = root / f"{i:05}-{file_type}-{layout}{FILE_TYPES[file_type]}"
+        path.write_bytes(_BUILDERS[file_type](layout, _file_seed(seed, i), profile))
+        paths.append(path)
+    return paths
+
+
+def song_bytes(layout: str = "v6.5", seed: int = 0, profile: ProfileArg = "typical") -> bytes:
+    """The bytes of one generated ``.m8s`` file."""
+    return _song(layout, seed, _resolve(profile))
+
+
+def instrument_bytes(layout: str = "v6.5", seed: int = 0, profile: ProfileArg = "typical") -> bytes:
+    """The bytes of one generated ``.m8i`` file."""
+    return _instrument_file(layout, seed, _resolve(profile))
+
+
+def scale_bytes(layout: str = "v6.5", seed: int = 0) -> bytes:
+    """The bytes of one generated ``.m8n`` file."""
+    return _scale_file(layout, seed, None)
+
+
+def theme_bytes(layout: str = "v6.5", seed: int = 0) -> bytes:
+    """The bytes of one generated ``.m8t`` file."""
+    return _theme_file(layout, seed, None)
+
+
+def _resolve(profile: ProfileArg) -> Profile:
+    if isinstance(profile, Profile):
+        return profile
+    try:
+        return PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"unknown profile {profile!r}; expected one of {list(PROFILES)}") from None
+
+
+def _file_seed(seed: int, index: int) -> int:
+    return (seed << 32) | index
+
+
+def _count(total: int, fraction: float) -> int:
+    return max(1, min(total, round(total * fraction)))
+
+
+def _gate(fraction: float) -> int:
+    """Threshold for a random byte: ``byte < gate`` with probability ``fraction``."""
+    return 256 if fraction >= 1.0 else int(fraction * 256)
+
+
+# ---------------------------------------------------------------------------
+# Templates, encoded once per layout or kind
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _header(layout: str) -> bytes:
+    writer = M8FileWriter()
+    M8FileType.write_header(writer, LAYOUTS[layout])
+    return writer.to_bytes()
+
+
+@lru_cache(maxsize=None)
+def _song_template(layout: str) -> bytes:
+    writer = M8FileWriter()
+    Song(version=LAYOUTS[layout]).write(writer)
+    return writer.to_bytes()
+
+
+@lru_cache(maxsize=None)
+def _instrument_template(kind: InstrumentKind) -> bytes:
+    inst = MIDIOut() if kind == InstrumentKind.MIDIOUT else _SYNTH_CLASSES[kind](common=SynthCommon())
+    writer = M8FileWriter()
+    inst.write(writer)
+    return writer.to_bytes()
+
+
+@lru_cache(maxsize=None)
+def _choices(layout: str, profile: Profile):
+    """(kinds, weights, modulator types, FX command bytes) usable in a layout."""
+    vp = version_profile(LAYOUTS[layout])
+    caps = vp.caps
+    excluded = set()
+    if not caps.has_hypersynth:
+        excluded.add(InstrumentKind.HYPERSYNTH)
+    if not caps.has_external:
+        excluded.add(InstrumentKind.EXTERNAL)
+    kinds = [(k, w) for k, w in profile.kinds if k not in excluded] or [(InstrumentKind.SAMPLER, 1)]
+    mods = [m for m in profile.modulators if caps.has_new_modulators
+            or m not in (ModulatorType.TRIG_ENV, ModulatorType.TRACKING_ENV)]
+    fx = bytes(vp.command_byte(name) for name in _FX_NAMES)
+    return ([k for k, _ in kinds], [w for _, w in kinds],
+            mods or [ModulatorType.AHD_ENV], bytes(fx[b % len(fx)] for b in range(256)))
+
+
+# ---------------------------------------------------------------------------
+# Stamping
+# ---------------------------------------------------------------------------
+
+def _stamp_instrument(buf: bytearray, at: int, kind: InstrumentKind, name: str,
+                      rng: random.Random, profile: Profile, mods: list[ModulatorType]) -> None:
+    buf[at:at + INSTRUMENT_SIZE] = _instrument_template(kind)
+    encoded = name.encode("ascii")[:12]
+    buf[at + _INST_NAME:at + _INST_NAME + len(encoded)] = encoded
+    if kind == InstrumentKind.MIDIOUT:
+        buf[at + _MIDI_CHANNEL] = rng.randrange(16)
+    else:
+        buf[at + _INST_VOLUME] = rng.randrange(0x40, 0x100)
+        buf[at + _INST_CUTOFF] = rng.randrange(0x20, 0x100)
+    for m in range(min(profile.modulator_slots, 4)):
+        o = at + _MODS + 6 * m
+        buf[o] = (rng.choice(mods) << 4) | rng.randrange(1, 5)
+        buf[o + 1:o + 6] = rng.randbytes(5)
+    if kind == InstrumentKind.SAMPLER:
+        path = f"/Samples/corpus/{name}.wav".encode("ascii")
+        buf[at + _SAMPLE_PATH:at + _SAMPLE_PATH + len(path)] = path
+
+
+def _mask(rng: random.Random, count: int, fraction: float) -> bytes:
+    """``count`` bytes, each 0xFF with probability ``fraction`` and 0 otherwise."""
+    return rng.randbytes(count).translate(_gate_table(_gate(fraction)))
+
+
+@lru_cache(maxsize=None)
+def _gate_table(gate: int) -> bytes:
+    return bytes(0xFF if b < gate else 0 for b in range(256))
+
+
+def _select(mask: bytes, data: bytes, fallback: int) -> bytes:
+    """``data`` where ``mask`` is 0xFF and ``fallback`` where it is 0."""
+    m = int.from_bytes(mask, "little")
+    d = int.from_bytes(data, "little")
+    f = int.from_bytes(bytes((fallback,)) * len(mask), "little")
+    return ((d & m) | (f & ~m)).to_bytes(len(mask), "little")
+
+
+def _both(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") & int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _stamp_columns(buf: bytearray, start: int, count: int, stride: int,
+                   columns: Iterable[tuple[int, bytes]]) -> None:
+    """Overwrite ``count`` records of ``stride`` bytes, one column at a time.
+
+    Each column is ``(offset within record, one byte per record)``.
+    """
+    end = start + count * stride
+    region = buf[start:end]
+    for offset, data in columns:
+        region[offset::stride] = data
+    buf[start:end] = region
+
+
+def _leading(count: int, used: int) -> bytes:
+    """Mask selecting the first ``used`` of every 16 steps."""
+    return (b"\xff" * used + bytes(16 - used)) * count
+
+
+def _stamp_tables(buf: bytearray, at: int, count: int, rng: random.Random,
+                  profile: Profile, fx_table: bytes) -> None:
+    n = count * 16
+    steps = _leading(count, _count(16, profile.step_fill))
+    fx = _both(steps, _mask(rng, n, profile.fx_fill))
+    _stamp_columns(buf, at, n, TABLE_STEP_SIZE, (
+        (0, _select(steps, rng.randbytes(n).translate(_TRANSPOSES), 0)),
+        (1, _select(steps, rng.randbytes(n).translate(_VELOCITIES), EMPTY)),
+        (2, _select(fx, rng.randbytes(n).translate(fx_table), EMPTY)),
+        (3, _select(fx, rng.randbytes(n), 0)),
+    ))
+
+
+def _song(layout: str, seed: int, profile: Profile) -> bytes:
+    rng = random.Random(seed)
+    kinds, weights, mods, fx_table = _choices(layout, profile)
+    sections = version_profile(LAYOUTS[layout]).sections
+    buf = bytearray(_song_template(layout))
+
+    struct.pack_into("<f", buf, _SONG_TEMPO, float(rng.randrange(80, 175)))
+    name = f"SONG{seed & 0xFFFFF:05X}".encode("ascii")
+    buf[_SONG_NAME:_SONG_NAME + len(name)] = name
+
+    n_instruments = _count(N_INSTRUMENTS, profile.density)
+    span = sections["instruments"]
+    for slot, kind in enumerate(rng.choices(kinds, weights, k=n_instruments)):
+        _stamp_instrument(buf, span.offset + slot * span.stride, kind,
+                          f"{kind.name[:6]}{slot:02X}", rng, profile, mods)
+
+    _stamp_tables(buf, sections["tables"].offset, _count(N_TABLES, profile.density),
+                  rng, profile, fx_table)
+
+    # Phrases: the downbeat is always set, so no used phrase is empty
+    n_phrases = _count(N_PHRASES, profile.density)
+    n = n_phrases * 16
+    steps = bytearray(_mask(rng, n, profile.step_fill))
+    steps[::16] = b"\xff" * n_phrases
+    fx = _both(steps, _mask(rng, n, profile.fx_fill))
+    instrument_table = bytes(b % n_instruments for b in range(256))
+    _stamp_columns(buf, sections["phrases"].offset, n, PHRASE_STEP_SIZE, (
+        (0, _select(steps, rng.randbytes(n).translate(_NOTES), EMPTY)),
+        (1, _select(steps, rng.randbytes(n).translate(_VELOCITIES), EMPTY)),
+        (2, _select(steps, rng.randbytes(n).translate(instrument_table), EMPTY)),
+        (3, _select(fx, rng.randbytes(n).translate(fx_table), EMPTY)),
+        (4, _select(fx, rng.randbytes(n), 0)),
+    ))
+
+    n_chains = _count(N_CHAINS, profile.density)
+    n = n_chains * 16
+    steps = _leading(n_chains, _count(16, profile.step_fill))
+    phrase_table = bytes(b % n_phrases for b in range(256))
+    _stamp_columns(buf, sections["chains"].offset, n, CHAIN_STEP_SIZE, (
+        (0, _select(steps, rng.randbytes(n).translate(phrase_table), EMPTY)),
+        (1, _select(_mask(rng, n, 0.25), rng.randbytes(n).translate(_CHAIN_TRANSPOSES), 0)),
+    ))
+
+    rows = _count(N_SONG_STEPS, profile.density)
+    chain_table = bytes(b % n_chains for b in range(256))
+    at = sections["song_steps"].offset
+    buf[at:at + rows * 8] = _select(_mask(rng, rows * 8, profile.step_fill),
+                                    rng.randbytes(rows * 8).translate(chain_table), EMPTY)
+    return bytes(buf)
+
+
+def _instrument_file(layout: str, seed: int, profile: Profile) -> bytes:
+    """Header, instrument, its 16-step table and, from 4.1, its EQ."""
+    rng = random.Random(seed)
+    kinds, weights, mods, fx_table = _choices(layout, profile)
+    kind = rng.choices(kinds, weights)[0]
+    buf = bytearray(_header(layout) + bytes(INSTRUMENT_SIZE) + _empty_table())
+    _stamp_instrument(buf, HEADER_SIZE, kind, f"{kind.name[:6]}{seed & 0xFF:02X}",
+                      rng, profile, mods)
+    _stamp_tables(buf, HEADER_SIZE + INSTRUMENT_SIZE, 1, rng, profile, fx_table)
+    eq_at = version_profile(LAYOUTS[layout]).offsets.instrument_file_eq_offset
+    if eq_at is not None:
+        writer = M8FileWriter()
+        EQ().write(writer)
+        buf[eq_at:] = writer.to_bytes()
+    return bytes(buf)
+
+
+@lru_cache(maxsize=None)
+def _empty_table() -> bytes:
+    return bytes((0, EMPTY, EMPTY, 0, EMPTY, 0, EMPTY, 0)) * (TABLE_SIZE // TABLE_STEP_SIZE)
+
+
+@lru_cache(maxsize=None)
+def _scale_template(layout: str) -> bytes:
+    writer = M8FileWriter()
+    Scale().write(writer, LAYOUTS[layout])
+    return _header(layout) + writer.to_bytes()
+
+
+def _scale_file(layout: str, seed: int, profile: Profile | None) -> bytes:
+    rng = random.Random(seed)
+    buf = bytearray(_scale_template(layout))
+    struct.pack_into("<H", buf, HEADER_SIZE, rng.randrange(1, 1 << 12))
+    for i in range(12):
+        buf[HEADER_SIZE + 2 + 2 * i] = rng.randrange(12)
+        buf[HEADER_SIZE + 3 + 2 * i] = rng.randrange(256)
+    name = f"SCALE{seed & 0xFFFF:04X}".encode("ascii")
+    buf[HEADER_SIZE + 26:HEADER_SIZE + 26 + len(name)] = name
+    return bytes(buf)
+
+
+def _theme_file(layout: str, seed: int, profile: Profile | None) -> bytes:
+    return _header(layout) + random.Random(seed).randbytes(_THEME_SIZE)
+
+
+_BUILDERS = {
+    "song": _song,
+    "instrument": _instrument_file,
+    "theme": _theme_file,
+    "scale": _scale_file,
+}
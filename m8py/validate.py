@@ -1,13 +1,48 @@
+"""Song validation.
+
+``validate()`` runs a set of named rules over a Song.  Each rule declares
+the sections it inspects; the song is walked once, section by section, and
+every slot is handed to all rules interested in that section.  Built-in
+rules live in the module-level registry ``RULES``; in-house checks are
+added with the ``rule()`` decorator and join the same single pass::
+
+    @rule("drum-velocity", "phrases", severity=Severity.WARNING)
+    def _check_velocity(ctx, section, slot, phrase):
+        for j, step in enumerate(phrase.steps):
+            if step.velocity == 0:
+                yield f"phrases[{slot}].steps[{j}].velocity", "zero velocity"
+
+A rule's check yields ``(path, message)`` pairs; the engine turns them into
+ValidationIssues with the rule's severity.  Pass ``severity=`` to override
+severities per rule name, or map a rule to ``None`` to switch it off.
+Slots a lenient load kept as RawSlot are only seen by rules registered with
+``raw=True``, such as the built-in ``raw-slot``.
+"""
 from __future__ import annotations
 from dataclasses import dataclass
 from enum import Enum
-from typing import List
+from functools import cached_property, lru_cache
+from types import SimpleNamespace
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Union
 
-from m8py.format.constants import EMPTY, N_PHRASES, N_CHAINS, N_INSTRUMENTS
+from m8py.format.constants import EMPTY, InstrumentKind, N_PHRASES, N_CHAINS, N_INSTRUMENTS
+from m8py.format.errors import M8ParseError
+from m8py.format.offsets import CHAIN_STEP_SIZE, PHRASE_STEP_SIZE
+from m8py.format.writer import M8FileWriter
+from m8py.index import SECTION_SIZES, SongIndex, fx_slot_targets
+from m8py.models.chain import Chain
+from m8py.models.instrument import Instrument, Sampler
+from m8py.models.phrase import Phrase
+from m8py.models.profile import VersionProfile, version_profile
+from m8py.models.raw import RawSlot
 from m8py.models.song import Song
+from m8py.models.table import Table
+from m8py.models.version import M8Version
+from m8py.models.view import SongView
 
 
 class Severity(Enum):
+    INFO = "info"
     WARNING = "warning"
     ERROR = "error"
 
@@ -17,82 +52,531 @@ class ValidationIssue:
     severity: Severity
     path: str
     message: str
+    rule: str = ""
 
     def __str__(self) -> str:
         return f"[{self.severity.value}] {self.path}: {self.message}"
 
 
-def validate(song: Song) -> List[ValidationIssue]:
-    """Validate a Song and return a list of issues found."""
+# -- rules ------------------------------------------------------------------------
+
+# Sections rules can inspect, in the order validate() walks them.  "song" is
+# the song itself (header fields) and is visited once, as slot 0.
+SECTIONS = (
+    "song", "song_steps", "chains", "phrases", "instruments",
+    "tables", "grooves", "scales", "midi_mappings",
+)
+_SECTION_ORDER = {section: n for n, section in enumerate(SECTIONS)}
+
+Check = Callable[["ValidationContext", str, int, Any], Iterable[tuple[str, str]]]
+SeverityPolicy = Mapping[str, Optional[Severity]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """A named check over the slots of one or more sections.
+
+    Args:
+        name: Unique rule name, used in severity policies and on issues.
+        sections: Sections whose slots are passed to ``check``.
+        check: ``check(ctx, section, slot, item)`` yielding
+            ``(path, message)`` for every problem found.
+        severity: Default severity of the rule's issues.
+        description: One-line summary.
+        raw: Also pass RawSlot placeholders left by a lenient load; other
+            rules skip them.
+    """
+    name: str
+    sections: tuple[str, ...]
+    check: Check
+    severity: Severity = Severity.ERROR
+    description: str = ""
+    raw: bool = False
+
+
+RULES: dict[str, Rule] = {}
+
+
+def register_rule(new: Rule, replace: bool = False) -> Rule:
+    """Add a rule to the default registry used by ``validate()``."""
+    unknown = [s for s in new.sections if s not in _SECTION_ORDER]
+    if unknown:
+        raise ValueError(f"rule {new.name!r} inspects unknown sections {unknown}")
+    if new.name in RULES and not replace:
+        raise ValueError(f"validation rule {new.name!r} is already registered")
+    RULES[new.name] = new
+    return new
+
+
+def rule(name: str, *sections: str, severity: Severity = Severity.ERROR,
+         replace: bool = False, raw: bool = False) -> Callable[[Check], Check]:
+    """Decorator registering a check function as a rule.
+
+    The first line of the function's docstring becomes the description.
+    """
+    def decorate(check: Check) -> Check:
+        doc = (check.__doc__ or "").strip().splitlines()
+        register_rule(Rule(name, sections, check, severity, doc[0] if doc else "", raw),
+                      replace=replace)
+        return check
+    return decorate
+
+
+class ValidationContext:
+    """Song-wide state shared by every rule during one validation.
+
+    Expensive lookups are computed on first use and shared, so rules that
+    need the reference graph or slot emptiness do not each re-walk the song.
+    """
+
+    def __init__(self, song: Song, index: SongIndex | None = None):
+        self.song = song
+        self._index = index
+        self._empty: dict[tuple[str, int], bool] = {}
+
+    @cached_property
+    def profile(self) -> VersionProfile:
+        return version_profile(self.song.version)
+
+    @cached_property
+    def fx_targets(self) -> dict[int, str]:
+        """FX command bytes whose value is a slot, mapped to the target section."""
+        return fx_slot_targets(self.song)
+
+    @property
+    def index(self) -> SongIndex:
+        """Reference graph of the song, built on first use."""
+        if self._index is None:
+            self._index = SongIndex(self.song)
+        return self._index
+
+    def instrument_kind(self, slot: int) -> int | None:
+        """Kind of the instrument in ``slot``, or None if out of range or empty."""
+        if not 0 <= slot < len(self.song.instruments):
+            return None
+        kind = getattr(self.song.instruments[slot], "kind", InstrumentKind.NONE)
+        return None if kind == InstrumentKind.NONE else kind
+
+    def is_empty(self, section: str, slot: int) -> bool:
+        """True if a chain, phrase, table or instrument slot holds nothing.
+
+        A RawSlot from a lenient load is never empty.
+        """
+        key = (section, slot)
+        empty = self._empty.get(key)
+        if empty is None:
+            if isinstance(getattr(self.song, section)[slot], RawSlot):
+                empty = False
+            elif section == "instruments":
+                empty = self.instrument_kind(slot) is None
+            else:
+                empty = _encode(getattr(self.song, section)[slot]) == _empty_encoding(section)
+            self._empty[key] = empty
+        return empty
+
+    def invalidate(self, section: str, slot: int) -> None:
+        """Forget cached facts about a slot after it was edited."""
+        self._empty.pop((section, slot), None)
+
+
+def _encode(obj: Any) -> bytes:
+    writer = M8FileWriter()
+    obj.write(writer)
+    return writer.to_bytes()
+
+
+_EMPTY_FACTORIES: dict[str, Callable[[], Any]] = {
+    "chains": Chain, "phrases": Phrase, "tables": Table,
+}
+
+
+@lru_cache(maxsize=None)
+def _empty_encoding(section: str) -> bytes:
+    return _encode(_EMPTY_FACTORIES[section]())
+
+
+class _Dispatch:
+    """Rules grouped by section, with the severity policy applied."""
+
+    def __init__(self, rules: Iterable[Union[Rule, str]] | None,
+                 severity: SeverityPolicy | None):
+        selected = [RULES[r] if isinstance(r, str) else r
+                    for r in (RULES.values() if rules is None else rules)]
+        policy = dict(severity or {})
+        unknown = policy.keys() - {r.name for r in selected}
+        if unknown:
+            raise ValueError(f"severity policy names unknown rules: {sorted(unknown)}")
+        self._by_section: dict[str, list[tuple[Rule, Severity]]] = {}
+        for r in selected:
+            level = policy.get(r.name, r.severity)
+            if level is None:
+                continue
+            for section in r.sections:
+                self._by_section.setdefault(section, []).append((r, level))
+
+    @property
+    def sections(self) -> list[str]:
+        return sorted(self._by_section, key=_SECTION_ORDER.__getitem__)
+
+    def check(self, ctx: ValidationContext, section: str, slot: int,
+              item: Any) -> List[ValidationIssue]:
+        raw = isinstance(item, RawSlot)
+        return [
+            ValidationIssue(level, path, message, r.name)
+            for r, level in self._by_section.get(section, ())
+            if r.raw or not raw
+            for path, message in r.check(ctx, section, slot, item)
+        ]
+
+    def run(self, ctx: ValidationContext) -> Iterable[tuple[str, int, List[ValidationIssue]]]:
+        """Walk each inspected section once, yielding issues per slot."""
+        for section in self.sections:
+            items = [ctx.song] if section == "song" else getattr(ctx.song, section)
+            for slot, item in enumerate(items):
+                yield section, slot, self.check(ctx, section, slot, item)
+
+
+def validate(song: Song, rules: Iterable[Union[Rule, str]] | None = None,
+             severity: SeverityPolicy | None = None) -> List[ValidationIssue]:
+    """Validate a Song and return a list of issues found.
+
+    Args:
+        song: The song to check.
+        rules: Rules (or registered rule names) to run; defaults to every
+            rule in ``RULES``.
+        severity: ``{rule_name: Severity}`` overrides; ``None`` disables
+            a rule.
+    """
+    ctx = ValidationContext(song)
     issues: List[ValidationIssue] = []
+    for _, _, found in _Dispatch(rules, severity).run(ctx):
+        issues.extend(found)
+    return issues
 
-    # Tempo range
-    if song.tempo < 1.0 or song.tempo > 800.0:
+
+# Instrument rules that read the song's reference graph
+_SONG_SCOPED = ("unused-instrument",)
+
+# Version assumed for instruments that were not loaded from a file, as in io.save()
+_DEFAULT_VERSION = M8Version(6, 5, 0)
+
+
+def validate_instrument(instrument: Instrument, rules: Iterable[Union[Rule, str]] | None = None,
+                        severity: SeverityPolicy | None = None) -> List[ValidationIssue]:
+    """Validate a standalone instrument, e.g. one loaded from a ``.m8i`` file.
+
+    Runs the rules that inspect ``"instruments"``, with the instrument as
+    slot 0 of a song that holds nothing else.  Rules that look at the rest
+    of the song (``unused-instrument``) are off, and enabling one through
+    ``severity`` raises ValueError since a standalone instrument has no song.
+    """
+    # Building a full Song is far more work than checking one instrument
+    song = SimpleNamespace(
+        instruments=[instrument],
+        version=getattr(instrument, "_file_version", _DEFAULT_VERSION),
+    )
+    enabled = [name for name in _SONG_SCOPED if (severity or {}).get(name) is not None]
+    if enabled:
+        raise ValueError(f"rule {enabled[0]!r} needs a song and cannot check "
+                         "a standalone instrument")
+    policy = {**dict.fromkeys(_SONG_SCOPED), **(severity or {})}
+    if rules is not None:
+        rules = list(rules)
+        names = {r if isinstance(r, str) else r.name for r in rules}
+        policy = {name: level for name, level in policy.items() if name in names}
+    return _Dispatch(rules, policy).check(ValidationContext(song), "instruments", 0, instrument)
+
+
+def validate_bytes(data: Any) -> List[ValidationIssue]:
+    """Screen an encoded song file without parsing it into a Song.
+
+    Runs the reference and header checks of ``validate()`` (tempo range,
+    name length, chain, phrase and instrument references) straight over
+    the section bytes of ``data`` (any buffer), using strided views of the
+    reference columns.  A buffer that is not a readable song yields a
+    single error at path ``"file"``.
+    """
+    try:
+        view = SongView(data)
+    except M8ParseError as e:
+        return [ValidationIssue(Severity.ERROR, "file", str(e))]
+
+    issues: List[ValidationIssue] = []
+    tempo = view.tempo
+    if tempo < 1.0 or tempo > 800.0:
         issues.append(ValidationIssue(
             Severity.ERROR, "song.tempo",
-            f"tempo {song.tempo} out of range [1.0, 800.0]",
+            f"tempo {tempo} out of range [1.0, 800.0]",
         ))
-
-    # Byte field ranges
-    if song.transpose > 255:
+    name = view.name
+    if len(name) > 11:
         issues.append(ValidationIssue(
-            Severity.ERROR, "song.transpose",
-            f"transpose {song.transpose} exceeds byte range",
+            Severity.WARNING, "song.name",
+            f"name '{name}' will be truncated to 11 characters",
         ))
 
-    if song.quantize > 255:
+    for k, ref in _bad_refs(view.section("song_steps"), 1, 0, N_CHAINS):
         issues.append(ValidationIssue(
-            Severity.ERROR, "song.quantize",
-            f"quantize {song.quantize} exceeds byte range",
+            Severity.ERROR, f"song_steps[{k // 8}].tracks[{k % 8}]",
+            f"chain reference {ref} >= {N_CHAINS}",
         ))
-
-    if song.key > 255:
+    for k, ref in _bad_refs(view.section("chains"), CHAIN_STEP_SIZE, 0, N_PHRASES):
         issues.append(ValidationIssue(
-            Severity.ERROR, "song.key",
-            f"key {song.key} exceeds byte range",
+            Severity.ERROR, f"chains[{k // 16}].steps[{k % 16}].phrase",
+            f"phrase reference {ref} >= {N_PHRASES}",
         ))
-
-    # Song name length
-    if len(song.name) > 11:
+    for k, ref in _bad_refs(view.section("phrases"), PHRASE_STEP_SIZE, 2, N_INSTRUMENTS):
         issues.append(ValidationIssue(
-            Severity.WARNING, "song.name",
-            f"name '{song.name}' will be truncated to 11 characters",
+            Severity.ERROR, f"phrases[{k // 16}].steps[{k % 16}].instrument",
+            f"instrument reference {ref} >= {N_INSTRUMENTS}",
         ))
+    return issues
 
-    # Song step chain references
-    for i, step in enumerate(song.song_steps):
-        for t, chain_idx in enumerate(step.tracks):
-            if chain_idx != EMPTY and chain_idx >= N_CHAINS:
-                issues.append(ValidationIssue(
-                    Severity.ERROR, f"song_steps[{i}].tracks[{t}]",
-                    f"chain reference {chain_idx} >= {N_CHAINS}",
-                ))
-
-    # Chain phrase references
-    for i, chain in enumerate(song.chains):
-        for j, cs in enumerate(chain.steps):
-            if cs.phrase != EMPTY and cs.phrase >= N_PHRASES:
-                issues.append(ValidationIssue(
-                    Severity.ERROR, f"chains[{i}].steps[{j}].phrase",
-                    f"phrase reference {cs.phrase} >= {N_PHRASES}",
-                ))
-
-    # Phrase instrument references
-    for i, phrase in enumerate(song.phrases):
-        for j, ps in enumerate(phrase.steps):
-            if ps.instrument != EMPTY and ps.instrument >= N_INSTRUMENTS:
-                issues.append(ValidationIssue(
-                    Severity.ERROR, f"phrases[{i}].steps[{j}].instrument",
-                    f"instrument reference {ps.instrument} >= {N_INSTRUMENTS}",
-                ))
-
-    # Sampler instruments without sample paths (warning)
-    from m8py.models.instrument import Sampler, EmptyInstrument
-    for i, inst in enumerate(song.instruments):
-        if isinstance(inst, Sampler) and not inst.sample_path:
-            issues.append(ValidationIssue(
-                Severity.WARNING, f"instruments[{i}]",
-                "Sampler instrument has empty sample_path",
-            ))
 
-    return issues
+@lru_cache(maxsize=None)
+def _valid_ref_bytes(limit: int) -> bytes:
+    return bytes(range(limit)) + bytes([EMPTY])
+
+
+def _bad_refs(section: memoryview, stride: int, field: int, limit: int) -> list[tuple[int, int]]:
+    """(step index, value) of every reference byte >= limit, EMPTY excepted."""
+    column = bytes(section[field::stride])
+    if not column.translate(None, _valid_ref_bytes(limit)):
+        return []
+    return [(k, b) for k, b in enumerate(column) if b != EMPTY and b >= limit]
+
+
+class Validator:
+    """Incremental validation of a Song that is being edited.
+
+    The validator keeps the issues of every slot separately.  After an
+    edit, ``update()`` re-checks only the slots that changed, the slots
+    that reference them and the slots they referenced before and after
+    the edit, so the cost scales with the edit rather than with the song.
+
+    Example:
+        validator = Validator(song)
+        song.phrases[3].steps[0].instrument = 200
+        validator.update({"phrases": [3]})
+        validator.issues
+
+    Pass the output of ``SongSnapshot.changed_slots`` to ``update()``, or
+    call it with no arguments to have the validator diff snapshots itself.
+    ``rules`` and ``severity`` are as for ``validate()``.
+    """
+
+    def __init__(self, song: Song, rules: Iterable[Union[Rule, str]] | None = None,
+                 severity: SeverityPolicy | None = None):
+        self._song = song
+        self._dispatch = _Dispatch(rules, severity)
+        self._slots: dict[tuple[str, int], List[ValidationIssue]] = {}
+        self._rebuild()
+
+    @property
+    def song(self) -> Song:
+        return self._song
+
+    @property
+    def issues(self) -> List[ValidationIssue]:
+        """All current issues, in the same order ``validate()`` reports them."""
+        issues: List[ValidationIssue] = []
+        for key in sorted(self._slots, key=_slot_order):
+            issues.extend(self._slots[key])
+        return issues
+
+    def slot_issues(self, section: str, slot: int) -> List[ValidationIssue]:
+        """Current issues of one slot, e.g. ``("phrases", 3)``."""
+        return list(self._slots.get((section, slot), ()))
+
+    def update(self, changed: Mapping[str, Iterable[int]] | None = None) -> List[ValidationIssue]:
+        """Re-validate after an edit and return all current issues.
+
+        Args:
+            changed: Slots that changed, as ``{section: [slot, ...]}`` with
+                Song attribute names as sections.  If omitted, the song is
+                diffed against the snapshot taken at the previous update.
+        """
+        if changed is None:
+            if self._snapshot is None:
+                # Explicit updates since the last diff: nothing to diff against
+                self._rebuild()
+                return self.issues
+            current = self._song.snapshot(previous=self._snapshot)
+            changed = current.changed_slots(self._snapshot)
+            self._snapshot = current
+        else:
+            self._snapshot = None
+
+        ctx, index = self._ctx, self._ctx.index
+        dirty: set[tuple[str, int]] = {("song", 0)}
+        for section, slots in changed.items():
+            for slot in slots:
+                dirty.update(index.refs(section, slot))
+                index.update(section, slot)
+                ctx.invalidate(section, slot)
+                dirty.add((section, slot))
+                dirty.update(index.refs(section, slot))
+                dirty.update(index.users(section, slot))
+        for section, slot in dirty:
+            if section == "song":
+                item = self._song
+            else:
+                items = getattr(self._song, section, None)
+                if items is None or not 0 <= slot < len(items):
+                    continue
+                item = items[slot]
+            self._store(section, slot, self._dispatch.check(ctx, section, slot, item))
+        return self.issues
+
+    def _rebuild(self) -> None:
+        song = self._song
+        self._ctx = ValidationContext(song, SongIndex(song))
+        self._snapshot = song.snapshot()
+        self._slots.clear()
+        for section, slot, issues in self._dispatch.run(self._ctx):
+            self._store(section, slot, issues)
+
+    def _store(self, section: str, slot: int, issues: List[ValidationIssue]) -> None:
+        if issues:
+            self._slots[(section, slot)] = issues
+        else:
+            self._slots.pop((section, slot), None)
+
+
+def _slot_order(key: tuple[str, int]) -> tuple[int, int]:
+    return (_SECTION_ORDER[key[0]], key[1])
+
+
+# -- built-in rules -----------------------------------------------------------------
+
+@rule("tempo-range", "song")
+def _check_tempo(ctx: ValidationContext, section: str, slot: int, song: Song):
+    """Tempo must be within the M8's 1-800 BPM range."""
+    if song.tempo < 1.0 or song.tempo > 800.0:
+        yield "song.tempo", f"tempo {song.tempo} out of range [1.0, 800.0]"
+
+
+@rule("byte-range", "song")
+def _check_byte_fields(ctx: ValidationContext, section: str, slot: int, song: Song):
+    """Single-byte song fields must fit in a byte."""
+    for name in ("transpose", "quantize", "key"):
+        value = getattr(song, name)
+        if value > 255:
+            yield f"song.{name}", f"{name} {value} exceeds byte range"
+
+
+@rule("name-length", "song", severity=Severity.WARNING)
+def _check_name(ctx: ValidationContext, section: str, slot: int, song: Song):
+    """Song names longer than 11 characters are truncated on save."""
+    if len(song.name) > 11:
+        yield "song.name", f"name '{song.name}' will be truncated to 11 characters"
+
+
+@rule("chain-ref", "song_steps")
+def _check_song_step(ctx: ValidationContext, section: str, i: int, step):
+    """Song rows must reference existing chain slots."""
+    for t, chain_idx in enumerate(step.tracks):
+        if chain_idx != EMPTY and chain_idx >= N_CHAINS:
+            yield f"song_steps[{i}].tracks[{t}]", f"chain reference {chain_idx} >= {N_CHAINS}"
+
+
+@rule("phrase-ref", "chains")
+def _check_chain(ctx: ValidationContext, section: str, i: int, chain: Chain):
+    """Chain steps must reference existing phrase slots."""
+    for j, cs in enumerate(chain.steps):
+        if cs.phrase != EMPTY and cs.phrase >= N_PHRASES:
+            yield f"chains[{i}].steps[{j}].phrase", f"phrase reference {cs.phrase} >= {N_PHRASES}"
+
+
+@rule("instrument-ref", "phrases")
+def _check_phrase(ctx: ValidationContext, section: str, i: int, phrase: Phrase):
+    """Phrase steps must reference existing instrument slots."""
+    for j, ps in enumerate(phrase.steps):
+        if ps.instrument != EMPTY and ps.instrument >= N_INSTRUMENTS:
+            yield (f"phrases[{i}].steps[{j}].instrument",
+                   f"instrument reference {ps.instrument} >= {N_INSTRUMENTS}")
+
+
+@rule("sample-path", "instruments", severity=Severity.WARNING)
+def _check_sample_path(ctx: ValidationContext, section: str, i: int, inst):
+    """Sampler instruments should have a sample path."""
+    if isinstance(inst, Sampler) and not inst.sample_path:
+        yield f"instruments[{i}]", "Sampler instrument has empty sample_path"
+
+
+def _fx_steps(ctx: ValidationContext, section: str, slot: int, item):
+    """(step, fx number, fx, instrument kind) for every FX slot of a phrase or table."""
+    table_kind = ctx.instrument_kind(slot) if section == "tables" else None
+    for j, step in enumerate(item.steps):
+        kind = ctx.instrument_kind(step.instrument) if section == "phrases" else table_kind
+        for n, fx in enumerate((step.fx1, step.fx2, step.fx3), 1):
+            if fx.command != EMPTY:
+                yield j, n, fx, kind
+
+
+@rule("fx-command", "phrases", "tables")
+def _check_fx_command(ctx: ValidationContext, section: str, slot: int, item):
+    """FX command bytes must name a command in the song's firmware version.
+
+    Instrument commands (0x80 and up) are only checked when the step's
+    instrument is known.
+    """
+    profile = ctx.profile
+    for j, n, fx, kind in _fx_steps(ctx, section, slot, item):
+        if fx.command >= 0x80 and kind is None:
+            continue
+        if profile.command_name(fx.command, kind).startswith("?"):
+            yield (f"{section}[{slot}].steps[{j}].fx{n}",
+                   f"unknown FX command 0x{fx.command:02X} in v{profile.major}.{profile.minor}")
+
+
+@rule("fx-slot-range", "phrases", "tables")
+def _check_fx_slot_range(ctx: ValidationContext, section: str, slot: int, item):
+    """Slot-number FX arguments (TBL, GRV, SCA, INS) must be in range."""
+    targets = ctx.fx_targets
+    for j, n, fx, _ in _fx_steps(ctx, section, slot, item):
+        target = targets.get(fx.command)
+        if target is not None and fx.value != EMPTY and fx.value >= SECTION_SIZES[target]:
+            yield (f"{section}[{slot}].steps[{j}].fx{n}",
+                   f"{ctx.profile.command_name(fx.command)} value {fx.value} >= "
+                   f"{SECTION_SIZES[target]} {target}")
+
+
+# Sections whose slots can be checked for emptiness, as FX targets
+_DANGLING_FX_TARGETS = ("tables", "instruments")
+
+
+@rule("dangling-ref", "song_steps", "chains", "phrases", "tables", severity=Severity.WARNING)
+def _check_dangling(ctx: ValidationContext, section: str, slot: int, item):
+    """References to empty chains, phrases, tables or instruments."""
+    if section == "song_steps":
+        for t, chain in enumerate(item.tracks):
+            if chain < N_CHAINS and ctx.is_empty("chains", chain):
+                yield f"song_steps[{slot}].tracks[{t}]", f"chain {chain} is empty"
+    elif section == "chains":
+        for j, step in enumerate(item.steps):
+            if step.phrase < N_PHRASES and ctx.is_empty("phrases", step.phrase):
+                yield f"chains[{slot}].steps[{j}].phrase", f"phrase {step.phrase} is empty"
+    else:
+        targets = ctx.fx_targets
+        for j, n, fx, _ in _fx_steps(ctx, section, slot, item):
+            target = targets.get(fx.command)
+            if (target in _DANGLING_FX_TARGETS and fx.value < SECTION_SIZES[target]
+                    and ctx.is_empty(target, fx.value)):
+                yield (f"{section}[{slot}].steps[{j}].fx{n}",
+                       f"{ctx.profile.command_name(fx.command)} targets empty "
+                       f"{target[:-1]} {fx.value}")
+
+
+@rule("unused-instrument", "instruments", severity=Severity.INFO)
+def _check_unused_instrument(ctx: ValidationContext, section: str, slot: int, inst):
+    """Instruments that no phrase, table FX or MIDI mapping uses."""
+    if ctx.instrument_kind(slot) is not None and not ctx.index.is_used("instruments", slot):
+        yield f"instruments[{slot}]", "instrument is not used"
+
+
+@rule("raw-slot", *SECTIONS[1:], severity=Severity.WARNING, raw=True)
+def _check_raw_slot(ctx: ValidationContext, section: str, slot: int, item):
+    """Slots a lenient load could not decode, kept as their original bytes."""
+    if isinstance(item, RawSlot):
+        yield f"{section}[{slot}]", f"slot could not be decoded; kept as {item.size} raw bytes"
@@ -0,0 +1,101 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from m8py.__main__ import main
+from m8py.batch import FileReport, find_files, validate_file, validate_many
+from m8py.io import save
+from m8py.models.song import Song
+from m8py.validate import Severity, ValidationIssue
+
+FIXTURES = Path(__file__).parent / "fixtures" / "matey"
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A small tree: a clean song, a song with an error, an instrument and a damaged file."""
+    save(Song(), tmp_path / "CLEAN.m8s")
+    broken = Song()
+    broken.phrases[1].steps[2].instrument = 200
+    (tmp_path / "sub").mkdir()
+    save(broken, tmp_path / "sub" / "BROKEN.m8s")
+    shutil.copy(FIXTURES / "303HACK.m8i", tmp_path / "sub" / "303HACK.M8I")
+    (tmp_path / "DAMAGED.m8s").write_bytes(b"M8VERSION\x00" + bytes(20))
+    (tmp_path / "notes.txt").write_text("not an M8 file")
+    return tmp_path
+
+
+class TestFindFiles:
+    def test_recursive_and_sorted(self, corpus):
+        names = [p.relative_to(corpus).as_posix() for p in find_files([corpus])]
+        assert names == ["CLEAN.m8s", "DAMAGED.m8s", "sub/303HACK.M8I", "sub/BROKEN.m8s"]
+
+    def test_files_kept_as_given(self, corpus):
+        assert find_files([corpus / "CLEAN.m8s"]) == [corpus / "CLEAN.m8s"]
+
+
+class TestValidateMany:
+    def test_reports(self, corpus):
+        reports = {Path(r.path).name: r for r in validate_many([corpus], jobs=1)}
+        assert reports["CLEAN.m8s"].ok
+        assert reports["303HACK.M8I"].type == "instrument"
+        assert reports["303HACK.M8I"].ok
+
+        broken = reports["BROKEN.m8s"]
+        assert not broken.ok
+        assert broken.counts["error"] == 1
+        assert broken.issues[0].path == "phrases[1].steps[2].instrument"
+
+        damaged = reports["DAMAGED.m8s"]
+        assert not damaged.ok
+        assert damaged.error.startswith("M8ParseError")
+        assert damaged.issues == []
+
+    def test_pool_matches_inline(self, corpus):
+        inline = [r.to_json() for r in validate_many([corpus], jobs=1)]
+        pooled = [r.to_json() for r in validate_many([corpus], jobs=2)]
+
+        def strip(lines):
+            return [{k: v for k, v in json.loads(line).items() if not k.endswith("_seconds")}
+                    for line in lines]
+        assert strip(pooled) == strip(inline)
+
+    def test_empty_directory(self, tmp_path):
+        assert list(validate_many([tmp_path])) == []
+
+    def test_json_record(self, corpus):
+        record = json.loads(validate_file(corpus / "sub" / "BROKEN.m8s").to_json())
+        assert record["type"] == "song"
+        assert record["ok"] is False
+        assert record["counts"] == {"info": 0, "warning": 0, "error": 1}
+        assert record["issues"][0]["rule"] == "instrument-ref"
+        assert record["load_seconds"] > 0
+
+    def test_ok_ignores_warnings(self):
+        report = FileReport("x.m8s", "song",
+                            issues=[ValidationIssue(Severity.WARNING, "song.name", "long")])
+        assert report.ok
+        assert report.counts["warning"] == 1
+        report.error = "M8ParseError: bad"
+        assert not report.ok
+
+
+class TestCommandLine:
+    def test_streams_json_lines(self, corpus, capsys):
+        status = main(["validate", "--jobs", "1", str(corpus)])
+        out, err = capsys.readouterr()
+        records = [json.loads(line) for line in out.splitlines()]
+        assert [Path(r["path"]).name for r in records] == [
+            "CLEAN.m8s", "DAMAGED.m8s", "303HACK.M8I", "BROKEN.m8s",
+        ]
+        assert status == 1
+        assert "validated 4 files" in err
+        assert "1 unreadable, 1 errors" in err
+
+    def test_clean_tree_passes(self, corpus, capsys):
+        assert main(["validate", "-j", "1", str(corpus / "CLEAN.m8s")]) == 0
+
+    def test_fail_on_never(self, corpus, capsys):
+        assert main(["validate", "-j", "1", "--fail-on", "never", str(corpus)]) == 0
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from m8py.bench import (
+    IMPROVEMENT, MISSING, NEW, REGRESSION, UNCHANGED,
+    compare, format_comparison, main, summarize,
+)
+
+
+def _doc(**benchmarks):
+    return {"schema": 1, "environment": {}, "benchmarks": {
+        name: {"runs": runs} for name, runs in benchmarks.items()
+    }}
+
+
+STABLE = [1.00, 1.01, 0.99, 1.00, 1.02]
+NOISY = [1.0, 1.4, 0.7, 1.2, 0.8]
+
+
+class TestSummarize:
+    def test_median_and_mad(self):
+        assert summarize([1.0, 2.0, 4.0, 10.0, 3.0]) == (3.0, 1.0)
+
+
+class TestCompare:
+    def _status(self, base, cur, **kwargs):
+        [result] = compare(_doc(b=base), _doc(b=cur), **kwargs)
+        return result
+
+    def test_regression(self):
+        result = self._status(STABLE, [x * 1.2 for x in STABLE])
+        assert result.status == REGRESSION
+        assert result.delta == pytest.approx(0.2)
+
+    def test_improvement(self):
+        assert self._status(STABLE, [x * 0.8 for x in STABLE]).status == IMPROVEMENT
+
+    def test_below_threshold(self):
+        assert self._status(STABLE, [x * 1.03 for x in STABLE]).status == UNCHANGED
+        assert self._status(STABLE, [x * 1.03 for x in STABLE],
+                            threshold=0.01, sigma=1.0).status == REGRESSION
+
+    def test_noise_masks_change(self):
+        # 20% slower, but well within the spread of the runs
+        result = self._status(NOISY, [x * 1.2 for x in NOISY])
+        assert result.status == UNCHANGED
+        assert result.noise > 0.2
+        assert self._status(NOISY, [x * 1.2 for x in NOISY], sigma=0.25).status == REGRESSION
+
+    def test_median_fallback_without_runs(self):
+        base = {"benchmarks": {"b": {"median": 1.0, "mad": 0.0}}}
+        cur = {"benchmarks": {"b": {"median": 2.0, "mad": 0.0}}}
+        assert compare(base, cur)[0].status == REGRESSION
+
+    def test_new_and_missing(self):
+        results = compare(_doc(old=STABLE, both=STABLE), _doc(both=STABLE, added=STABLE))
+        assert {r.name: r.status for r in results} == {
+            "old": MISSING, "both": UNCHANGED, "added": NEW,
+        }
+        assert [r.status for r in results] == [UNCHANGED, NEW, MISSING]
+
+    def test_regressions_listed_first(self):
+        results = compare(_doc(a=STABLE, z=STABLE), _doc(a=STABLE, z=[x * 2 for x in STABLE]))
+        assert [r.name for r in results] == ["z", "a"]
+
+    def test_table(self):
+        text = format_comparison(compare(_doc(a=STABLE), _doc(a=[x * 2 for x in STABLE])))
+        assert "+100.0%" in text
+        assert "regression" in text
+        assert text.splitlines()[-1] == "1 regression"
+
+
+class TestCommandLine:
+    def _write(self, tmp_path, name, doc):
+        path = tmp_path / name
+        path.write_text(json.dumps(doc))
+        return str(path)
+
+    def test_fails_on_regression(self, tmp_path, capsys):
+        base = self._write(tmp_path, "base.json", _doc(load=STABLE))
+        cur = self._write(tmp_path, "cur.json", _doc(load=[x * 1.5 for x in STABLE]))
+        assert main(["compare", base, cur]) == 1
+        assert "regression" in capsys.readouterr().out
+
+    def test_passes_when_unchanged(self, tmp_path, capsys):
+        base = self._write(tmp_path, "base.json", _doc(load=STABLE))
+        assert main(["compare", base, base]) == 0
+
+    def test_fail_on_missing(self, tmp_path, capsys):
+        base = self._write(tmp_path, "base.json", _doc(load=STABLE, save=STABLE))
+        cur = self._write(tmp_path, "cur.json", _doc(load=STABLE))
+        assert main(["compare", base, cur]) == 0
+        assert main(["compare", "--fail-on-missing", base, cur]) == 1
+
+    def test_rejects_other_json(self, tmp_path):
+        path = self._write(tmp_path, "x.json", {"hello": 1})
+        with pytest.raises(ValueError):
+            main(["compare", path, path])
@@ -0,0 +1,176 @@
+"""Tests for slot garbage collection (m8py.compact)."""
+import m8py
+from m8py.compact import compact, dedupe
+from m8py.display.commands import command_byte
+from m8py.format.writer import M8FileWriter
+from m8py.models.chain import Chain
+from m8py.models.fx import FX
+from m8py.models.instrument import EmptyInstrument, WavSynth, SynthCommon
+from m8py.models.midi import MIDIMapping
+from m8py.models.phrase import Phrase, PhraseStep
+from m8py.models.song import Song
+from m8py.models.table import Table
+
+TBL = command_byte("TBL", (6, 5))
+
+
+def _song() -> Song:
+    song = Song()
+    song.song_steps[0].tracks[0] = 10
+    song.song_steps[1].tracks[5] = 10
+    song.chains[10].steps[0].phrase = 20
+    song.chains[10].steps[1].phrase = 30
+    song.chains[3].steps[0].phrase = 40           # garbage chain -> garbage phrase
+    song.phrases[20].steps[0] = PhraseStep(note=60, instrument=5)
+    song.phrases[30].steps[0] = PhraseStep(
+        note=64, instrument=9, fx1=FX(command=TBL, value=0x90),
+    )
+    song.phrases[40].steps[0] = PhraseStep(note=67, instrument=7)
+    song.instruments[5] = WavSynth(common=SynthCommon(name="KEEP5"))
+    song.instruments[7] = WavSynth(common=SynthCommon(name="DROP7"))
+    song.instruments[9] = WavSynth(common=SynthCommon(name="KEEP9"))
+    song.tables[5].steps[0].transpose = 5
+    song.tables[7].steps[0].transpose = 7
+    song.tables[0x90].steps[0].transpose = 0x90
+    return song
+
+
+def _encoded(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+class TestCompact:
+    def test_clears_unreachable_slots(self):
+        song = _song()
+        remap = compact(song)
+        assert song.chains[3] == Chain()
+        assert song.phrases[40] == Phrase()
+        assert song.instruments[7] == EmptyInstrument()
+        assert song.tables[7] == Table()
+        assert song.instruments[5].common.name == "KEEP5"
+        assert song.tables[0x90].steps[0].transpose == 0x90
+        assert remap["chains"] == {10: 10}
+        assert remap["instruments"] == {5: 5, 9: 9}
+        assert remap["tables"] == {5: 5, 9: 9, 0x90: 0x90}
+
+    def test_renumber_rewrites_references(self):
+        song = _song()
+        remap = compact(song, renumber=True)
+        assert remap["chains"] == {10: 0}
+        assert remap["phrases"] == {20: 0, 30: 1}
+        assert remap["instruments"] == {5: 0, 9: 1}
+        assert song.song_steps[0].tracks[0] == 0
+        assert song.song_steps[1].tracks[5] == 0
+        assert [s.phrase for s in song.chains[0].steps[:2]] == [0, 1]
+        assert song.phrases[0].steps[0].instrument == 0
+        assert song.phrases[1].steps[0].instrument == 1
+        assert song.instruments[1].common.name == "KEEP9"
+        assert song.tables[0].steps[0].transpose == 5      # moved with instrument 5
+
+    def test_standalone_table_moves_out_of_the_way(self):
+        song = _song()
+        song.phrases[30].steps[0].fx1.value = 1         # TBL 01, no instrument 1
+        compact(song, renumber=True)
+        # instrument 9 now owns table 1, so the standalone table moves up
+        new_tbl = song.phrases[1].steps[0].fx1.value
+        assert new_tbl >= 0x80
+        assert song.tables[1] == Table()
+
+    def test_midi_mapping_keeps_instrument(self):
+        song = _song()
+        song.midi_mappings[0] = MIDIMapping(control_number=1, instr_index=7, max_value=0x7F)
+        remap = compact(song, renumber=True)
+        assert 7 in remap["instruments"]
+        assert song.midi_mappings[0].instr_index == remap["instruments"][7]
+
+    def test_compact_is_idempotent(self):
+        song = _song()
+        compact(song, renumber=True)
+        once = _encoded(song)
+        compact(song, renumber=True)
+        assert _encoded(song) == once
+
+    def test_exported(self):
+        assert m8py.compact is compact
+
+
+def _melody(base: int, instrument: int = 0) -> Phrase:
+    phrase = Phrase()
+    for i, offset in enumerate((0, 4, 7, 12)):
+        phrase.steps[i * 4] = PhraseStep(note=base + offset, velocity=0x60, instrument=instrument)
+    phrase.steps[15] = PhraseStep(note=0x80)            # note off is not transposed
+    return phrase
+
+
+class TestDedupe:
+    def _song(self) -> Song:
+        song = Song()
+        song.song_steps[0].tracks[:3] = [0, 1, 2]
+        song.phrases[0] = _melody(48)
+        song.phrases[1] = _melody(48)
+        song.phrases[2] = _melody(53)
+        for c in range(3):
+            song.chains[c].steps[0].phrase = c
+        return song
+
+    def test_merges_identical_phrases_and_chains(self):
+        song = self._song()
+        remap = dedupe(song)
+        assert remap["phrases"] == {1: 0}
+        assert remap["chains"] == {1: 0}
+        assert song.phrases[1] == Phrase()
+        assert song.song_steps[0].tracks[:3] == [0, 0, 2]
+        assert song.chains[2].steps[0].phrase == 2
+
+    def test_transpose_merge_moves_offset_into_chain(self):
+        song = self._song()
+        song.chains[2].steps[0].transpose = 0xFE          # -2
+        remap = dedupe(song, transpose=True)
+        assert remap["phrases"] == {1: 0, 2: 0}
+        step = song.chains[2].steps[0]
+        assert step.phrase == 0
+        assert step.transpose == 3                         # -2 + 5
+        assert song.phrases[2] == Phrase()
+
+    def test_exact_copy_of_transposed_phrase(self):
+        song = Song()
+        for slot, notes in enumerate(([60, 62, 64, 65], [62, 64, 66, 67], [62, 64, 66, 67])):
+            for i, note in enumerate(notes):
+                song.phrases[slot].steps[i] = PhraseStep(note=note, velocity=0x60, instrument=0)
+            song.chains[slot].steps[0].phrase = slot
+        song.chains[1].steps[1].transpose = 1   # keeps chains 1 and 2 distinct
+        remap = dedupe(song, transpose=True)
+        assert remap["phrases"] == {1: 0, 2: 0}
+        assert [song.chains[c].steps[0].phrase for c in range(3)] == [0, 0, 0]
+        assert song.chains[2].steps[0].transpose == 2
+
+    def test_transpose_merge_respects_signed_range(self):
+        song = self._song()
+        song.chains[2].steps[0].transpose = 0x7E          # +126, +5 overflows
+        remap = dedupe(song, transpose=True)
+        assert 2 not in remap["phrases"]
+        assert song.chains[2].steps[0].phrase == 2
+
+    def test_tables_merge_and_fx_rewritten(self):
+        song = Song()
+        for slot in (0x90, 0x91):
+            song.tables[slot].steps[0].transpose = 12
+        song.phrases[0].steps[0] = PhraseStep(note=60, fx1=FX(command=TBL, value=0x91))
+        remap = dedupe(song)
+        assert remap["tables"] == {0x91: 0x90}
+        assert song.phrases[0].steps[0].fx1.value == 0x90
+        assert song.tables[0x91] == Table()
+
+    def test_instrument_tables_are_not_merged(self):
+        song = Song()
+        song.instruments[1] = WavSynth()
+        song.instruments[2] = WavSynth()
+        song.tables[1].steps[0].transpose = 3
+        song.tables[2].steps[0].transpose = 3
+        assert dedupe(song)["tables"] == {}
+        assert song.tables[2].steps[0].transpose == 3
+
+    def test_exported(self):
+        assert m8py.dedupe is dedupe
@@ -4,9 +4,11 @@ from m8py.format.constants import N_PHRASES, N_CHAINS, N_INSTRUMENTS, N_TABLES,
 from m8py.format.errors import M8ResourceExhaustedError
 from m8py.models.phrase import Phrase, PhraseStep
 from m8py.models.chain import Chain
-from m8py.models.instrument import WavSynth
+from m8py.models.fx import FX
+from m8py.models.instrument import WavSynth, SynthCommon
 from m8py.models.table import Table
 from m8py.models.groove import Groove
+from m8py.models.song import Song
 
 
 class TestSlotAllocator:
@@ -71,6 +73,32 @@ class TestSlotAllocator:
         slot2 = alloc.alloc_phrase(p2)
         assert slot1 != slot2
 
+    def test_dedup_distinguishes_fx(self):
+        alloc = SlotAllocator(deduplicate=True)
+        p1 = Phrase()
+        p2 = Phrase()
+        p2.steps[15].fx3 = FX(command=0x01, value=0x02)
+        assert alloc.alloc_phrase(p1) != alloc.alloc_phrase(p2)
+
+    def test_dedup_keys_on_encoded_bytes(self):
+        alloc = SlotAllocator(deduplicate=True)
+        assert alloc.alloc_phrase(Phrase(steps=[PhraseStep(note=60)])) == 0
+        assert alloc.alloc_phrase(Phrase(steps=[PhraseStep(note=60)])) == 0
+        assert alloc.alloc_chain(Chain()) == alloc.alloc_chain(Chain())
+
+    def test_dedup_instruments_by_written_bytes(self):
+        alloc = SlotAllocator(deduplicate=True)
+        a = WavSynth(common=SynthCommon(name="LEAD"))
+        b = WavSynth(common=SynthCommon(name="LEAD"))
+        c = WavSynth(common=SynthCommon(name="BASS"))
+        assert alloc.alloc_instrument(a) == alloc.alloc_instrument(b)
+        assert alloc.alloc_instrument(c) != alloc.alloc_instrument(a)
+
+    def test_dedup_pinned_object_is_reused(self):
+        alloc = SlotAllocator(deduplicate=True)
+        alloc.pin_table(7, Table())
+        assert alloc.alloc_table(Table()) == 7
+
     def test_no_dedup_identical_phrases_different_slots(self):
         alloc = SlotAllocator(deduplicate=False)
         p1 = Phrase()
@@ -113,3 +141,124 @@ class TestSlotAllocator:
         assert alloc.alloc_instrument(WavSynth()) == 0
         assert alloc.alloc_table(Table()) == 0
         assert alloc.alloc_groove(Groove()) == 0
+
+
+class TestSlotReuse:
+    def test_release_then_reuse_lowest_slot(self):
+        alloc = SlotAllocator()
+        for _ in range(4):
+            alloc.alloc_phrase(Phrase())
+        alloc.release_phrase(1)
+        assert alloc.phrases_used == 3
+        assert alloc.alloc_phrase(Phrase()) == 1
+        assert alloc.alloc_phrase(Phrase()) == 4
+
+    def test_release_pinned_slot(self):
+        alloc = SlotAllocator()
+        alloc.pin_chain(0, Chain())
+        alloc.release_chain(0)
+        assert alloc.alloc_chain(Chain()) == 0
+
+    def test_release_free_slot_raises(self):
+        alloc = SlotAllocator()
+        with pytest.raises(ValueError):
+            alloc.release_phrase(3)
+
+    def test_churn_never_exhausts(self):
+        alloc = SlotAllocator()
+        slots = [alloc.alloc_instrument(WavSynth()) for _ in range(N_INSTRUMENTS)]
+        for _ in range(1000):
+            alloc.release_instrument(slots[0])
+            slots[0] = alloc.alloc_instrument(WavSynth())
+        assert alloc.instruments_remaining == 0
+
+    def test_release_drops_dedup_entry(self):
+        alloc = SlotAllocator(deduplicate=True)
+        table = Table()
+        slot = alloc.alloc_table(table)
+        alloc.release_table(slot)
+        alloc.pin_table(slot, Table(steps=[]))
+        assert alloc.alloc_table(Table()) != slot
+
+    def test_pin_over_slot_replaces_dedup_entry(self):
+        alloc = SlotAllocator(deduplicate=True)
+        alloc.pin_phrase(3, Phrase())
+        alloc.pin_phrase(3, Phrase(steps=[PhraseStep(note=60)]))
+        assert alloc.alloc_phrase(Phrase()) == 0
+
+    def test_alloc_many(self):
+        alloc = SlotAllocator(deduplicate=True)
+        p = Phrase(steps=[PhraseStep(note=60)])
+        assert alloc.alloc_phrases([Phrase(), p, Phrase()]) == [0, 1, 0]
+
+    def test_range_skips_fragmented_slots(self):
+        alloc = SlotAllocator()
+        alloc.pin_chain(1, Chain())
+        alloc.pin_chain(4, Chain())
+        assert alloc.alloc_chain_range([Chain(), Chain(), Chain()]) == 5
+        assert alloc.alloc_chain_range([Chain(), Chain()]) == 2
+        assert alloc.alloc_chain(Chain()) == 0
+
+    def test_range_is_not_deduplicated(self):
+        alloc = SlotAllocator(deduplicate=True)
+        assert alloc.alloc_phrase_range([Phrase(), Phrase()]) == 0
+        assert alloc.phrases_used == 2
+
+    def test_range_exhausted(self):
+        alloc = SlotAllocator()
+        alloc.pin_phrase(N_PHRASES // 2, Phrase())
+        with pytest.raises(M8ResourceExhaustedError):
+            alloc.alloc_phrase_range([Phrase()] * (N_PHRASES // 2 + 1))
+        with pytest.raises(ValueError):
+            alloc.alloc_phrase_range([])
+
+    def test_range_fragmented_message(self):
+        alloc = SlotAllocator()
+        for slot in range(0, N_CHAINS, 2):
+            alloc.pin_chain(slot, Chain())
+        with pytest.raises(M8ResourceExhaustedError) as exc_info:
+            alloc.alloc_chain_range([Chain(), Chain()])
+        assert exc_info.value.requested == 2
+        assert str(exc_info.value) == "no contiguous run of 2 free chain slots (127 free)"
+
+    def test_range_full_pool_message(self):
+        alloc = SlotAllocator()
+        alloc.alloc_chain_range([Chain()] * N_CHAINS)
+        with pytest.raises(M8ResourceExhaustedError, match="none remaining"):
+            alloc.alloc_chain_range([Chain()])
+
+
+class TestFromSong:
+    def _song(self) -> Song:
+        song = Song()
+        song.phrases[0].steps[0] = PhraseStep(note=60)
+        song.phrases[2].steps[0] = PhraseStep(note=62)
+        song.chains[1].steps[0].phrase = 4          # references an empty phrase
+        song.instruments[0] = WavSynth(common=SynthCommon(name="KEEP"))
+        song.tables[5].steps[0].transpose = 1
+        return song
+
+    def test_occupied_slots_are_skipped(self):
+        alloc = SlotAllocator.from_song(self._song())
+        assert alloc.phrases_used == 3
+        assert alloc.alloc_phrase(Phrase()) == 1
+        assert alloc.alloc_phrase(Phrase()) == 3
+        assert alloc.alloc_phrase(Phrase()) == 5
+        assert alloc.alloc_chain(Chain()) == 0
+        assert alloc.alloc_chain(Chain()) == 2
+        assert alloc.alloc_instrument(WavSynth()) == 1
+        # instrument 0's table and table 5 are taken
+        assert alloc.alloc_table(Table()) == 1
+        assert alloc.alloc_groove(Groove()) == 1
+
+    def test_dedup_reuses_existing_material(self):
+        song = self._song()
+        alloc = SlotAllocator.from_song(song, deduplicate=True)
+        again = Phrase(steps=[PhraseStep(note=62)] + [PhraseStep() for _ in range(15)])
+        assert alloc.alloc_phrase(again) == 2
+        assert alloc.alloc_instrument(WavSynth(common=SynthCommon(name="KEEP"))) == 0
+
+    def test_empty_song(self):
+        alloc = SlotAllocator.from_song(Song())
+        assert alloc.phrases_used == 0
+        assert alloc.grooves_used == 1
@@ -0,0 +1,61 @@
+import pytest
+
+from m8py.compose import compose
+from m8py.compose.batch import ComposeJob, compose_many, _prepare
+from m8py.compose.declarative import TrackDef
+from m8py.format.errors import M8ResourceExhaustedError
+from m8py.format.writer import M8FileWriter
+from m8py.io import load_song
+from m8py.models.instrument import WavSynth, MacroSynth, SynthCommon
+
+
+def _jobs(tmp_path, count=6):
+    lead = WavSynth(common=SynthCommon(name="LEAD"))
+    bass = MacroSynth(common=SynthCommon(name="BASS"))
+    return [
+        ComposeJob(
+            path=tmp_path / f"VAR{i}.m8s",
+            tracks=[TrackDef(instrument=lead, pattern=f"C4 E4 G{i % 5 + 2}", track=0),
+                    TrackDef(instrument=bass, pattern="C2 . C2 .", track=1)],
+            name=f"VAR{i}",
+            tempo=100.0 + i,
+        )
+        for i in range(count)
+    ]
+
+
+def _bytes(song):
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+class TestComposeMany:
+    def test_shared_instruments_sent_once(self, tmp_path):
+        instruments, wire = _prepare(_jobs(tmp_path))
+        assert len(instruments) == 2
+        assert [t[0] for t in wire[3][4]] == [0, 1]
+
+    def test_inline_matches_compose(self, tmp_path):
+        jobs = _jobs(tmp_path, 2)
+        paths = compose_many(jobs, workers=1)
+        assert paths == [job.path for job in jobs]
+        expected = compose(_jobs(tmp_path, 2)[1].tracks, name="VAR1", tempo=101.0)
+        assert _bytes(load_song(paths[1])) == _bytes(expected)
+
+    def test_process_pool(self, tmp_path):
+        paths = compose_many(_jobs(tmp_path), workers=2)
+        assert len(paths) == 6
+        songs = [load_song(p) for p in paths]
+        assert [s.name for s in songs] == [f"VAR{i}" for i in range(6)]
+        assert songs[4].instruments[1].common.name == "BASS"
+        assert songs[4].phrases[0].steps[2].note == 91   # G6
+
+    def test_errors_propagate(self, tmp_path):
+        job = ComposeJob(tmp_path / "BIG.m8s",
+                         [TrackDef(instrument=WavSynth(), pattern="C4") for _ in range(129)])
+        with pytest.raises(M8ResourceExhaustedError):
+            compose_many([job], workers=1)
+
+    def test_no_jobs(self):
+        assert compose_many([], workers=4) == []
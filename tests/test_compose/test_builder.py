@@ -7,7 +7,8 @@ from m8py.models.song import Song
 from m8py.format.writer import M8FileWriter
 from m8py.format.reader import M8FileReader
 from m8py.models.version import M8FileType
-from m8py.format.constants import EMPTY
+from m8py.format.constants import EMPTY, N_PHRASES
+from m8py.format.errors import M8ResourceExhaustedError
 
 
 class TestSongBuilder:
@@ -138,3 +139,120 @@ class TestSongBuilder:
         song = SongBuilder().build()
         assert song.name == ""
         assert song.tempo == 120.0
+
+
+class TestBuilderFromSong:
+    def test_appends_into_free_slots(self):
+        song = Song(name="HAND")
+        song.phrases[0].steps[0] = PhraseStep(note=48)
+        song.chains[0].steps[0].phrase = 0
+        song.song_steps[0].tracks[0] = 0
+
+        built = (SongBuilder.from_song(song)
+            .add_phrase("C4 E4")
+            .add_chain([1])
+            .set_song_step(1, track=0, chain=1)
+            .build())
+        assert built is song
+        assert song.phrases[0].steps[0].note == 48
+        assert song.phrases[1].steps[0].note == 60
+        assert song.chains[1].steps[0].phrase == 1
+        assert song.name == "HAND"
+
+
+def _phrase_bytes(phrase: Phrase) -> bytes:
+    writer = M8FileWriter()
+    phrase.write(writer)
+    return writer.to_bytes()
+
+
+class TestBulkBuilder:
+    def test_add_phrases_contiguous(self):
+        builder = SongBuilder()
+        builder.add_phrase("C4")
+        builder._alloc.pin_phrase(2, Phrase())          # fragment the pool
+        builder.add_phrases(["D4", "E4", Phrase(steps=[PhraseStep(note=65)] * 16)])
+        assert builder.last_phrases == [3, 4, 5]
+        assert builder.last_phrase == 5
+        song = builder.build()
+        assert [song.phrases[i].steps[0].note for i in (3, 4, 5)] == [62, 64, 65]
+        assert len(song.phrases[3].steps) == 16
+
+    def test_add_phrases_fragmented_pool(self):
+        builder = SongBuilder()
+        for slot in range(0, N_PHRASES, 2):
+            builder._alloc.pin_phrase(slot, Phrase())    # every other slot taken
+        builder.add_phrases(["C4", "D4", "E4"])
+        assert builder.last_phrases == [1, 3, 5]
+        song = builder.build()
+        assert [song.phrases[i].steps[0].note for i in (1, 3, 5)] == [60, 62, 64]
+
+    def test_add_phrases_too_few_free_slots(self):
+        builder = SongBuilder()
+        for slot in range(N_PHRASES - 2):
+            builder._alloc.pin_phrase(slot, Phrase())
+        with pytest.raises(M8ResourceExhaustedError):
+            builder.add_phrases(["C4", "D4", "E4"])
+        assert builder._alloc.phrases_used == N_PHRASES - 2
+
+    def test_add_phrases_dedup(self):
+        builder = SongBuilder(deduplicate=True)
+        builder.add_phrases(["C4", "E4", "C4"])
+        assert builder.last_phrases == [0, 1, 0]
+
+    def test_add_phrases_from_bytes(self):
+        a = Phrase(steps=[PhraseStep(note=60, velocity=0x40)] + [PhraseStep() for _ in range(15)])
+        b = Phrase(steps=[PhraseStep(note=72)] + [PhraseStep() for _ in range(15)])
+        song = SongBuilder().add_phrases(_phrase_bytes(a) + _phrase_bytes(b)).build()
+        assert song.phrases[0] == a
+        assert song.phrases[1] == b
+
+    def test_add_phrases_from_numpy(self):
+        np = pytest.importorskip("numpy")
+        data = np.full((3, 16, 9), 0xFF, dtype=np.uint8)
+        data[:, :, 4::2] = 0                              # FX values
+        data[:, 0, 0] = [60, 62, 64]
+        builder = SongBuilder().add_phrases(data)
+        song = builder.build()
+        assert builder.last_phrases == [0, 1, 2]
+        assert [song.phrases[i].steps[0].note for i in range(3)] == [60, 62, 64]
+        assert song.phrases[2].steps[1] == PhraseStep()
+
+    def test_add_phrases_bad_buffer(self):
+        with pytest.raises(ValueError):
+            SongBuilder().add_phrases(bytes(100))
+
+    def test_add_chains(self):
+        builder = SongBuilder().add_chains([[0, 1], [2], Chain()], transpose=3)
+        song = builder.build()
+        assert builder.last_chains == [0, 1, 2]
+        assert song.chains[0].steps[1].phrase == 1
+        assert song.chains[0].steps[1].transpose == 3
+        assert song.chains[1].steps[1].phrase == EMPTY
+
+    def test_add_chains_from_bytes(self):
+        raw = bytes([5, 0] + [EMPTY, 0] * 15) * 2
+        builder = SongBuilder().add_chains(raw)
+        assert builder.last_chains == [0, 1]
+        assert builder.build().chains[1].steps[0].phrase == 5
+
+    def test_set_song_rows(self):
+        song = SongBuilder().set_song_rows([[0, 1], [2, 3, 4]], start=10).build()
+        assert song.song_steps[10].tracks == [0, 1] + [EMPTY] * 6
+        assert song.song_steps[11].tracks[2] == 4
+        assert song.song_steps[12].tracks == [EMPTY] * 8
+
+    def test_set_song_rows_from_bytes(self):
+        song = SongBuilder().set_song_rows(bytes(range(16))).build()
+        assert song.song_steps[1].tracks == list(range(8, 16))
+
+    def test_set_song_rows_out_of_range(self):
+        with pytest.raises(ValueError):
+            SongBuilder().set_song_rows([[0]], start=256)
+        with pytest.raises(ValueError):
+            SongBuilder().set_song_rows([[0] * 9])
+
+    def test_empty_bulk_calls(self):
+        builder = SongBuilder().add_phrases([]).add_chains([])
+        assert builder.last_phrases == []
+        assert builder.last_phrase is None
@@ -1,9 +1,10 @@
 import pytest
-from m8py.compose.declarative import compose, TrackDef
+from m8py.compose.declarative import compose, plan, TrackDef
 from m8py.models.instrument import WavSynth, MacroSynth, SynthCommon
 from m8py.models.phrase import PhraseStep
 from m8py.models.song import Song
-from m8py.format.constants import EMPTY, STEPS_PER_PHRASE
+from m8py.format.errors import M8ResourceExhaustedError
+from m8py.format.constants import EMPTY, STEPS_PER_PHRASE, N_INSTRUMENTS
 
 
 class TestDeclarativeCompose:
@@ -140,3 +141,84 @@ class TestDeclarativeCompose:
         song = compose(tracks=[], name="Empty")
         assert isinstance(song, Song)
         assert song.name == "Empty"
+
+
+def _used(song: Song) -> tuple[int, int, int]:
+    phrases = sum(1 for p in song.phrases if any(s.note != EMPTY for s in p.steps))
+    chains = sum(1 for c in song.chains if c.steps[0].phrase != EMPTY)
+    instruments = sum(1 for i in song.instruments if i.kind != 0xFF)
+    return phrases, chains, instruments
+
+
+class TestPlan:
+    def _tracks(self):
+        return [
+            TrackDef(instrument=WavSynth(), pattern=" ".join(["C4"] * 40), track=0),
+            TrackDef(instrument=WavSynth(), pattern=" ".join(["C4"] * 40), track=1),
+            TrackDef(instrument=MacroSynth(), pattern="E4 G4", track=2),
+        ]
+
+    def test_plan_matches_compose(self):
+        result = plan(self._tracks())
+        assert (result.phrases, result.chains, result.instruments) == (7, 3, 3)
+        assert result.song_rows == 1
+        assert result.fits
+        assert _used(compose(self._tracks())) == (7, 3, 3)
+
+    def test_plan_matches_compose_with_dedup(self):
+        result = plan(self._tracks(), deduplicate=True)
+        # tracks 0 and 1 share instrument 0, so their phrases and chain match
+        assert (result.phrases, result.chains, result.instruments) == (3, 2, 2)
+        assert _used(compose(self._tracks(), deduplicate=True)) == (3, 2, 2)
+
+    def test_plan_reports_overflow(self):
+        tracks = [TrackDef(instrument=WavSynth(), pattern="C4") for _ in range(N_INSTRUMENTS + 1)]
+        result = plan(tracks)
+        assert not result.fits
+        assert result.overflow["instruments"] == (N_INSTRUMENTS + 1, N_INSTRUMENTS)
+        assert "phrases" not in result.overflow
+
+    def test_plan_does_not_stamp_steps(self):
+        steps = [PhraseStep(note=60)]
+        plan([TrackDef(instrument=WavSynth(), pattern=steps)], deduplicate=True)
+        assert steps[0].instrument == EMPTY
+
+    def test_plan_empty(self):
+        result = plan([])
+        assert (result.phrases, result.chains, result.song_rows) == (0, 0, 0)
+
+
+class TestLongPatterns:
+    def test_pattern_streams_across_chains_and_rows(self):
+        # 40 phrases: chains of 16, 16 and 8 on rows 0-2
+        notes = " ".join(["C4"] * (40 * STEPS_PER_PHRASE))
+        song = compose([TrackDef(instrument=WavSynth(), pattern=notes, track=2)])
+        rows = [song.song_steps[r].tracks[2] for r in range(4)]
+        assert rows == [0, 1, 2, EMPTY]
+        assert song.chains[1].steps[15].phrase == 31
+        assert song.chains[2].steps[7].phrase == 39
+        assert song.chains[2].steps[8].phrase == EMPTY
+
+    def test_repeated_phrases_and_chains_dedup(self):
+        bar = "C4 E4 G4 C5 " * 4                       # one 16-step phrase
+        notes = bar * 16 * 10                           # 10 identical chains
+        song = compose([TrackDef(instrument=WavSynth(), pattern=notes)], deduplicate=True)
+        assert [song.song_steps[r].tracks[0] for r in range(10)] == [0] * 10
+        assert all(s.phrase == 0 for s in song.chains[0].steps)
+        assert song.phrases[1].steps[0].note == EMPTY
+        result = plan([TrackDef(instrument=WavSynth(), pattern=notes)], deduplicate=True)
+        assert (result.phrases, result.chains, result.song_rows) == (1, 1, 10)
+
+    def test_step_iterable_pattern(self):
+        steps = (PhraseStep(note=60 + i % 12) for i in range(20 * STEPS_PER_PHRASE))
+        song = compose([TrackDef(instrument=WavSynth(), pattern=steps)])
+        assert song.song_steps[1].tracks[0] == 1
+        assert song.phrases[19].steps[0].note == 60 + (19 * 16) % 12
+
+    def test_too_many_rows_raises(self):
+        notes = " ".join(["C4"] * (257 * 16 * STEPS_PER_PHRASE))
+        tracks = [TrackDef(instrument=WavSynth(), pattern=notes)]
+        result = plan(tracks, deduplicate=True)
+        assert result.overflow == {"song_rows": (257, 256)}
+        with pytest.raises(M8ResourceExhaustedError):
+            compose(tracks, deduplicate=True)
@@ -52,3 +52,91 @@ def test_named_constants():
     assert C4 == 60
     assert A4 == 69
     assert Fs3 == 54
+
+def test_note_table_matches_normalize():
+    from m8py.compose.notation import _NOTE_TABLE
+    assert len(set(_NOTE_TABLE.values())) == 128
+    for name in ("C", "c", "E", "b"):
+        for accidental in ("", "#", "b"):
+            for octave in range(-1, 10):
+                token = f"{name}{accidental}{octave}"
+                try:
+                    expected = normalize_note(" " + token)   # forces the slow path
+                except ValueError:
+                    assert token not in _NOTE_TABLE
+                else:
+                    assert _NOTE_TABLE[token] == expected
+
+def test_parse_lowercase_off_and_velocity():
+    steps = parse_pattern("off c4@7f Db3@0")
+    assert steps[0].note == 0x80
+    assert (steps[1].note, steps[1].velocity) == (60, 0x7F)
+    assert (steps[2].note, steps[2].velocity) == (49, 0)
+
+def test_parse_invalid_tokens():
+    for bad in ("X4", "@7F", "C4@", "C4@ZZ", "---@40", "C12"):
+        with pytest.raises(ValueError):
+            parse_pattern(bad)
+
+def test_parse_patterns_batch():
+    from m8py.compose.notation import parse_patterns
+    batches = parse_patterns(["C4 E4", "", "OFF | G4"])
+    assert [[s.note for s in steps] for steps in batches] == [[60, 64], [], [0x80, 67]]
+
+def test_parse_instrument_and_fx():
+    from m8py.display.commands import command_byte
+    steps = parse_pattern("C4@7F:02 ARP37 DEL03 . E4:0A")
+    assert len(steps) == 3
+    first = steps[0]
+    assert (first.note, first.velocity, first.instrument) == (60, 0x7F, 2)
+    assert (first.fx1.command, first.fx1.value) == (command_byte("ARP", (6, 5)), 0x37)
+    assert (first.fx2.command, first.fx2.value) == (command_byte("DEL", (6, 5)), 0x03)
+    assert first.fx3.command == 0xFF
+    assert steps[1].note == 0xFF
+    assert (steps[2].note, steps[2].instrument) == (64, 0x0A)
+
+def test_parse_fx_on_empty_step():
+    steps = parse_pattern(". TPO40")
+    assert steps[0].note == 0xFF
+    assert steps[0].fx1.value == 0x40
+
+def test_parse_fx_errors():
+    with pytest.raises(ValueError):
+        parse_pattern("ARP37 C4")                 # FX before any step
+    with pytest.raises(ValueError):
+        parse_pattern("C4 ARP01 ARP02 ARP03 ARP04")
+    with pytest.raises(ValueError):
+        parse_pattern("C4 ZZZ01")
+
+def test_parse_repeat_groups():
+    steps = parse_pattern("(C4 E4 G4)x3 OFF")
+    assert [s.note for s in steps] == [60, 64, 67] * 3 + [0x80]
+    assert steps[0] is not steps[3]
+
+def test_parse_nested_groups():
+    steps = parse_pattern("((C4)x2 D4)x2")
+    assert [s.note for s in steps] == [60, 60, 62, 60, 60, 62]
+
+def test_parse_group_fx_stay_inside_group():
+    steps = parse_pattern("(C4 RET10)x2")
+    assert [s.fx1.value for s in steps] == [0x10, 0x10]
+
+def test_parse_unbalanced_groups():
+    with pytest.raises(ValueError):
+        parse_pattern("(C4 E4")
+    with pytest.raises(ValueError):
+        parse_pattern("C4)x2")
+
+def test_iter_pattern_is_lazy():
+    from itertools import islice
+    from m8py.compose.notation import iter_pattern
+    steps = iter_pattern("(C4 E4)x1000000000")
+    assert [s.note for s in islice(steps, 4)] == [60, 64, 60, 64]
+
+def test_iter_phrases_shares_repeated_blocks():
+    from m8py.compose.notation import iter_phrases
+    phrases = list(iter_phrases("((C4 E4 G4 C5)x4)x3 (D4)x4"))
+    assert len(phrases) == 4
+    assert phrases[0] is phrases[1] is phrases[2]
+    assert phrases[3].steps[0].note == 62
+    assert phrases[3].steps[4].note == 0xFF
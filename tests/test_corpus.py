@@ -0,0 +1,101 @@
+import dataclasses
+import tempfile
+
+import pytest
+
+from m8py.format.constants import InstrumentKind, ModulatorType
+from m8py.io import load, save
+from m8py.models.instrument import EmptyInstrument, External, HyperSynth, Sampler
+from m8py.models.modulators import AHDEnv, LFOMod, RawModulator
+from m8py.models.scale import Scale
+from m8py.models.song import Song
+from m8py.models.theme import Theme
+from m8py.testing import corpus
+from m8py.validate import validate, validate_instrument
+
+N_COMBOS = len(corpus.FILE_TYPES) * len(corpus.LAYOUTS)
+
+
+def _song(data: bytes, tmp_path) -> Song:
+    path = tmp_path / "song.m8s"
+    path.write_bytes(data)
+    return load(path)
+
+
+class TestGenerate:
+    @pytest.mark.parametrize("profile", list(corpus.PROFILES))
+    def test_every_type_and_layout_loads_cleanly(self, profile, tmp_path):
+        paths = corpus.generate(N_COMBOS, seed=1, profile=profile, out=tmp_path / "out")
+        assert len(paths) == N_COMBOS
+        assert {p.stem.split("-", 1)[1] + p.suffix for p in paths} == {
+            f"{t}-{layout}{ext}" for t, ext in corpus.FILE_TYPES.items() for layout in corpus.LAYOUTS
+        }
+        for path in paths:
+            obj = load(path)
+            if isinstance(obj, Song):
+                assert validate(obj) == []
+                assert obj.version == corpus.LAYOUTS[path.stem.split("-")[2]]
+            elif path.suffix == ".m8i":
+                assert validate_instrument(obj) == []
+            else:
+                assert isinstance(obj, (Scale, Theme))
+            resaved = tmp_path / f"resaved{path.suffix}"
+            save(obj, resaved)
+            assert resaved.read_bytes() == path.read_bytes()
+
+    def test_deterministic_and_prefix_stable(self, tmp_path):
+        a = corpus.generate(5, seed=9, out=tmp_path / "a")
+        b = corpus.generate(12, seed=9, out=tmp_path / "b")
+        c = corpus.generate(5, seed=10, out=tmp_path / "c")
+        assert [p.read_bytes() for p in a] == [p.read_bytes() for p in b[:5]]
+        assert a[0].read_bytes() != c[0].read_bytes()
+
+    def test_layout_and_type_filters(self, tmp_path):
+        paths = corpus.generate(4, layouts=["v4"], types=["scale"], out=tmp_path)
+        assert [p.name for p in paths] == [f"{i:05}-scale-v4.m8n" for i in range(4)]
+
+    def test_default_out_is_new_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+        first, second = corpus.generate(1)[0], corpus.generate(1)[0]
+        assert first.parent != second.parent
+        assert first.parent.parent == second.parent.parent == tmp_path
+
+    @pytest.mark.parametrize("kwargs", [
+        {"profile": "dense"}, {"layouts": ["v9"]}, {"types": ["sample"]}, {"layouts": []},
+    ])
+    def test_rejects_unknown_arguments(self, kwargs, tmp_path):
+        with pytest.raises(ValueError):
+            corpus.generate(1, out=tmp_path, **kwargs)
+
+
+class TestProfiles:
+    def test_full_uses_every_slot(self, tmp_path):
+        song = _song(corpus.song_bytes("v6.5", 2, "full"), tmp_path)
+        assert not any(isinstance(i, EmptyInstrument) for i in song.instruments)
+        assert all(step.note != 0xFF for phrase in song.phrases for step in phrase.steps)
+        assert all(cell != 0xFF for row in song.song_steps for cell in row.tracks)
+        assert all(not isinstance(m, RawModulator) for i in song.instruments for m in i.modulators)
+
+    def test_sparse_is_sparse(self, tmp_path):
+        song = _song(corpus.song_bytes("v6.5", 2, "sparse"), tmp_path)
+        used = [i for i in song.instruments if not isinstance(i, EmptyInstrument)]
+        assert 0 < len(used) < 20
+        assert {type(m) for i in used for m in i.modulators} <= {AHDEnv, LFOMod, RawModulator}
+
+    def test_kind_mix(self, tmp_path):
+        samplers = dataclasses.replace(corpus.PROFILES["full"], kinds=((InstrumentKind.SAMPLER, 1),))
+        song = _song(corpus.song_bytes("v6.5", 2, samplers), tmp_path)
+        assert all(isinstance(i, Sampler) and i.sample_path for i in song.instruments)
+
+    def test_old_layouts_skip_newer_kinds_and_modulators(self, tmp_path):
+        song = _song(corpus.song_bytes("v2", 2, "full"), tmp_path)
+        assert not any(isinstance(i, (HyperSynth, External)) for i in song.instruments)
+        types = {m.__class__.__name__ for i in song.instruments for m in i.modulators}
+        assert not types & {"TrigEnv", "TrackingEnv"}
+
+    def test_profile_modulator_types(self, tmp_path):
+        only_lfo = dataclasses.replace(corpus.PROFILES["typical"], modulators=(ModulatorType.LFO,))
+        song = _song(corpus.song_bytes("v4.1", 5, only_lfo), tmp_path)
+        mods = [m for i in song.instruments if not isinstance(i, EmptyInstrument)
+                for m in i.modulators[:2]]
+        assert mods and all(isinstance(m, LFOMod) for m in mods)
@@ -0,0 +1,81 @@
+"""Tests for the song reference graph (m8py.index)."""
+from m8py.display.commands import command_byte
+from m8py.index import SongIndex
+from m8py.models.fx import FX
+from m8py.models.instrument import WavSynth
+from m8py.models.midi import MIDIMapping
+from m8py.models.phrase import PhraseStep
+from m8py.models.song import Song
+
+
+def _song() -> Song:
+    song = Song()
+    song.song_steps[0].tracks[0] = 1
+    song.song_steps[2].tracks[3] = 1
+    song.chains[1].steps[0].phrase = 4
+    song.chains[1].steps[1].phrase = 5
+    song.chains[7].steps[0].phrase = 5          # unreachable chain
+    song.phrases[4].steps[0] = PhraseStep(note=60, instrument=2)
+    song.phrases[5].steps[3] = PhraseStep(
+        note=62, instrument=2, fx1=FX(command=command_byte("TBL", (6, 5)), value=9),
+    )
+    song.instruments[2] = WavSynth()
+    song.midi_mappings[0] = MIDIMapping(control_number=7, instr_index=2, max_value=0x7F)
+    return song
+
+
+class TestSongIndex:
+    def test_forward_refs(self):
+        index = SongIndex(_song())
+        assert index.refs("song_steps", 0) == {("chains", 1)}
+        assert index.refs("chains", 1) == {("phrases", 4), ("phrases", 5)}
+        assert index.refs("phrases", 5) == {("instruments", 2), ("tables", 9)}
+        assert index.refs("instruments", 2) == {("tables", 2)}
+
+    def test_reverse_lookups(self):
+        index = SongIndex(_song())
+        assert index.rows_using_chain(1) == {0, 2}
+        assert index.chains_using_phrase(5) == {1, 7}
+        assert index.phrases_using_instrument(2) == {4, 5}
+        assert index.phrases_using_table(9) == {5}
+        assert index.mappings_targeting_instrument(2) == {0}
+        assert index.use_count("instruments", 2) == 3
+
+    def test_is_used(self):
+        index = SongIndex(_song())
+        assert index.is_used("phrases", 4)
+        assert not index.is_used("phrases", 6)
+        assert index.used_slots("phrases") == {4, 5}
+
+    def test_default_song_has_no_refs(self):
+        index = SongIndex(Song())
+        assert index.used_slots("chains") == set()
+        assert index.used_slots("instruments") == set()
+
+    def test_reachable(self):
+        reach = SongIndex(_song()).reachable()
+        assert reach["chains"] == {1}
+        assert reach["phrases"] == {4, 5}
+        assert reach["instruments"] == {2}
+        assert reach["tables"] == {2, 9}
+
+    def test_incremental_update(self):
+        song = _song()
+        index = SongIndex(song)
+        song.chains[1].steps[1].phrase = 6
+        index.update("chains", 1)
+        assert index.chains_using_phrase(5) == {7}
+        assert index.chains_using_phrase(6) == {1}
+        song.phrases[4].steps[0].instrument = 0xFF
+        index.update("phrases", 4)
+        assert index.phrases_using_instrument(2) == {5}
+
+    def test_update_slots_from_snapshot_diff(self):
+        song = _song()
+        index = SongIndex(song)
+        before = song.snapshot()
+        song.song_steps[0].tracks[0] = 0xFF
+        song.song_steps[2].tracks[3] = 0xFF
+        index.update_slots(song.snapshot(before).changed_slots(before))
+        assert not index.is_used("chains", 1)
+        assert index.reachable()["phrases"] == set()
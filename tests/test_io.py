@@ -1,12 +1,22 @@
 """Tests for the high-level I/O layer (m8py.io)."""
+import copy
+import pickle
+
 import pytest
 
+from m8py.compact import compact, dedupe
+from m8py.index import SongIndex
 from m8py.io import load, load_song, load_instrument, load_theme, load_scale, save
 from m8py.format.errors import M8ParseError
 from m8py.models.song import Song
 from m8py.models.theme import Theme, RGB
 from m8py.models.scale import Scale
 from m8py.models.instrument import WavSynth, SynthCommon, EmptyInstrument
+from m8py.models.profile import version_profile
+from m8py.models.raw import RawSlot
+from m8py.models.table import Table
+from m8py.models.eq import EQ
+from m8py.validate import Severity, validate
 
 
 class TestIO:
@@ -125,3 +135,154 @@ class TestIO:
         save(theme, path)
         with pytest.raises(M8ParseError, match="expected SCALE"):
             load_scale(path)
+
+
+class TestLenientLoad:
+    @pytest.fixture
+    def song_bytes(self, tmp_path):
+        song = Song(name="SALVAGE")
+        song.instruments[3] = WavSynth(common=SynthCommon(name="LEAD"))
+        song.phrases[2].steps[0].note = 60
+        save(song, tmp_path / "ok.m8s")
+        return (tmp_path / "ok.m8s").read_bytes()
+
+    def test_clean_file_has_no_diagnostics(self, tmp_path, song_bytes):
+        song, diagnostics = load(tmp_path / "ok.m8s", strict=False)
+        assert diagnostics == []
+        assert song == load(tmp_path / "ok.m8s")
+
+    def test_unknown_instrument_kind(self, tmp_path, song_bytes):
+        offset = version_profile(Song().version).sections["instruments"].slot(5).start
+        data = bytearray(song_bytes)
+        data[offset] = 0x42
+        path = tmp_path / "bad.m8s"
+        path.write_bytes(bytes(data))
+
+        with pytest.raises(M8ParseError):
+            load(path)
+        song, diagnostics = load(path, strict=False)
+        assert isinstance(song.instruments[5], RawSlot)
+        assert song.instruments[5].data == bytes(data[offset:offset + 215])
+        assert song.instruments[3].common.name == "LEAD"
+        assert song.phrases[2].steps[0].note == 60
+        assert [d.path for d in diagnostics] == ["instruments[5]"]
+        assert diagnostics[0].offset == offset
+        assert "0x42" in diagnostics[0].message
+
+        # The damaged bytes are written back where they were
+        save(song, tmp_path / "resaved.m8s")
+        assert (tmp_path / "resaved.m8s").read_bytes() == bytes(data)
+
+    def test_truncated_file(self, tmp_path, song_bytes):
+        spans = version_profile(Song().version).sections
+        cut = spans["tables"].slot(10).start + 50
+        path = tmp_path / "short.m8s"
+        path.write_bytes(song_bytes[:cut])
+
+        with pytest.raises(M8ParseError):
+            load(path)
+        song, diagnostics = load(path, strict=False)
+        assert song.name == "SALVAGE"
+        assert song.phrases[2].steps[0].note == 60
+        assert isinstance(song.tables[10], RawSlot)
+        assert song.tables[10].data == song_bytes[spans["tables"].slot(10).start:cut]
+        assert song.tables[11] == Table()
+        assert isinstance(song.instruments[3], EmptyInstrument)
+        paths = [d.path for d in diagnostics]
+        assert paths[:3] == ["tables[10]", "tables[11:]", "instruments[0:]"]
+        assert "effects_settings" in paths
+
+    def test_salvaged_song_pickles(self, tmp_path, song_bytes):
+        offset = version_profile(Song().version).sections["instruments"].slot(5).start
+        data = bytearray(song_bytes)
+        data[offset] = 0x42
+        (tmp_path / "bad.m8s").write_bytes(bytes(data))
+        song, _ = load(tmp_path / "bad.m8s", strict=False)
+        copy = pickle.loads(pickle.dumps(song))
+        assert copy.instruments[5] == song.instruments[5]
+        before = song.snapshot()
+        song.instruments[5] = EmptyInstrument()
+        song.restore(before)
+        assert isinstance(song.instruments[5], RawSlot)
+
+    @pytest.fixture
+    def salvaged(self, tmp_path, song_bytes):
+        offset = version_profile(Song().version).sections["instruments"].slot(5).start
+        data = bytearray(song_bytes)
+        data[offset] = 0x42
+        (tmp_path / "bad.m8s").write_bytes(bytes(data))
+        song, _ = load(tmp_path / "bad.m8s", strict=False)
+        song.phrases[2].steps[1].instrument = 5
+        song.phrases[7] = copy.deepcopy(song.phrases[2])
+        song.chains[0].steps[0].phrase = 7
+        song.song_steps[0].tracks[0] = 0
+        return song
+
+    def test_salvaged_song_validates(self, salvaged):
+        issues = validate(salvaged, severity={"unused-instrument": Severity.INFO})
+        assert [(i.path, i.rule) for i in issues if i.path.startswith("instruments")] == [
+            ("instruments[3]", "unused-instrument"), ("instruments[5]", "raw-slot"),
+        ]
+        assert not [i for i in issues if i.rule == "dangling-ref" and "instrument" in i.message]
+
+    def test_truncated_song_validates(self, tmp_path, song_bytes):
+        cut = version_profile(Song().version).sections["tables"].slot(10).start + 50
+        (tmp_path / "short.m8s").write_bytes(song_bytes[:cut])
+        song, _ = load(tmp_path / "short.m8s", strict=False)
+        issues = validate(song)
+        assert [(i.path, i.rule) for i in issues if i.rule == "raw-slot"] == [
+            ("tables[10]", "raw-slot"),
+        ]
+
+    def test_salvaged_song_index(self, salvaged):
+        index = SongIndex(salvaged)
+        assert index.users("instruments", 5) == {("phrases", 2), ("phrases", 7)}
+        assert index.refs("instruments", 5) == set()
+        assert index.reachable()["instruments"] == {5}
+
+    def test_salvaged_song_dedupe(self, salvaged):
+        raw = salvaged.instruments[5]
+        assert dedupe(salvaged)["phrases"] == {7: 2}
+        assert salvaged.chains[0].steps[0].phrase == 2
+        assert salvaged.instruments[5] is raw
+
+    def test_salvaged_song_compact_refuses(self, salvaged):
+        with pytest.raises(ValueError, match=r"instruments\[5\]"):
+            compact(salvaged)
+
+    @pytest.mark.parametrize("section, slot, empty", [
+        ("tables", 10, Table), ("scales", 3, Scale), ("eqs", 5, EQ),
+    ])
+    def test_truncated_song_snapshots_and_pickles(self, tmp_path, song_bytes, section, slot, empty):
+        cut = version_profile(Song().version).sections[section].slot(slot).start + 5
+        (tmp_path / "short.m8s").write_bytes(song_bytes[:cut])
+        song, _ = load(tmp_path / "short.m8s", strict=False)
+        raw = getattr(song, section)[slot]
+        assert isinstance(raw, RawSlot)
+
+        before = song.snapshot()
+        getattr(song, section)[slot] = empty()
+        song.restore(before, current=song.snapshot())
+        assert getattr(song, section)[slot] == raw
+        assert getattr(before.to_song(), section)[slot] == raw
+
+        for restored in (pickle.loads(pickle.dumps(song)), copy.deepcopy(song)):
+            assert restored == song
+            assert isinstance(getattr(restored, section)[slot], RawSlot)
+
+    def test_damaged_instrument_file(self, tmp_path):
+        inst = WavSynth(common=SynthCommon(name="X"))
+        save(inst, tmp_path / "x.m8i")
+        data = bytearray((tmp_path / "x.m8i").read_bytes())
+        data[14] = 0x42
+        (tmp_path / "x.m8i").write_bytes(bytes(data))
+        raw, diagnostics = load(tmp_path / "x.m8i", strict=False)
+        assert isinstance(raw, RawSlot)
+        assert [d.path for d in diagnostics] == ["instrument"]
+        save(raw, tmp_path / "y.m8i")
+        assert (tmp_path / "y.m8i").read_bytes() == bytes(data)
+
+    def test_bad_header_still_raises(self, tmp_path):
+        (tmp_path / "junk.m8s").write_bytes(b"NOT AN M8 FILE AT ALL")
+        with pytest.raises(M8ParseError):
+            load(tmp_path / "junk.m8s", strict=False)
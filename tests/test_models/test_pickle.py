@@ -0,0 +1,160 @@
+import copy
+import pickle
+
+import pytest
+
+from m8py.format.writer import M8FileWriter
+from m8py.models.song import Song
+from m8py.models.version import M8Version
+from m8py.models.theme import Theme, RGB
+from m8py.models.scale import Scale
+from m8py.models.phrase import PhraseStep
+from m8py.models.profile import version_profile
+from m8py.models.instrument import (
+    WavSynth, MacroSynth, Sampler, FMSynth, HyperSynth,
+    External, MIDIOut, EmptyInstrument, SynthCommon,
+)
+from m8py.io import load, save
+
+
+def _song_bytes(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+class TestPickle:
+    @pytest.mark.parametrize("version", [
+        M8Version(2, 0, 0), M8Version(3, 0, 0), M8Version(4, 1, 0), M8Version(6, 5, 0),
+    ])
+    def test_song_roundtrip_equal(self, version):
+        song = Song(version=version, name="PICKLE", tempo=128.0)
+        song.phrases[4].steps[2] = PhraseStep(note=60, velocity=0x7F, instrument=1)
+        song.instruments[1] = WavSynth(common=SynthCommon(name="W"))
+        restored = pickle.loads(pickle.dumps(song))
+        assert restored == song
+        assert _song_bytes(restored) == _song_bytes(song)
+
+    def test_song_payload_is_about_one_file(self):
+        song = Song()
+        assert len(pickle.dumps(song)) < len(_song_bytes(song)) + 1024
+
+    def test_loaded_song_roundtrip(self, tmp_path):
+        path = tmp_path / "s.m8s"
+        song = Song(name="LOADED")
+        song.instruments[0] = Sampler(sample_path="/kick.wav")
+        save(song, path)
+        loaded = load(path)
+        restored = pickle.loads(pickle.dumps(loaded))
+        assert restored == loaded
+        assert _song_bytes(restored) == path.read_bytes()
+
+    @pytest.mark.parametrize("clone", [copy.deepcopy, lambda s: pickle.loads(pickle.dumps(s))])
+    def test_loaded_instrument_edit_survives(self, tmp_path, clone):
+        path = tmp_path / "s.m8s"
+        song = Song()
+        song.instruments[2] = WavSynth(common=SynthCommon(name="OLD"), shape=1)
+        save(song, path)
+        loaded = load(path)
+        loaded.instruments[2].shape = 9
+        loaded.instruments[2].common.name = "NEW"
+        restored = clone(loaded)
+        assert restored.instruments[2].shape == 9
+        assert restored.instruments[2].common.name == "NEW"
+        assert restored == loaded
+        assert restored.instruments[2]._raw == loaded.instruments[2]._raw
+        assert _song_bytes(restored) == _song_bytes(loaded)
+
+    @pytest.mark.parametrize("version", [M8Version(2, 0, 0), M8Version(3, 0, 0), M8Version(6, 5, 0)])
+    def test_non_canonical_fields_kept(self, version):
+        song = Song(version=version, name="A NAME LONGER THAN TWELVE", tempo=120.3)
+        song.phrases[3].steps = song.phrases[3].steps[:4]
+        song.phrases[4].steps[0].note = 60
+        song.grooves[1].steps = [6, 6]
+        song.scales[2] = Scale(name="A SCALE NAME TOO LONG", tuning=432.1)
+        restored = copy.deepcopy(song)
+        assert restored == song
+        assert restored.phrases[4].steps[0].note == 60
+        assert pickle.loads(pickle.dumps(song)) == song
+
+    def test_deepcopy_is_independent(self):
+        song = Song()
+        clone = copy.deepcopy(song)
+        clone.phrases[0].steps[0].note = 60
+        assert song.phrases[0].steps[0].note == 0xFF
+
+    def test_structured_instrument_stays_editable_after_copy(self):
+        song = Song()
+        song.instruments[0] = WavSynth(common=SynthCommon(name="A"))
+        clone = copy.deepcopy(song)
+        clone.instruments[0].common.name = "B"
+        assert _song_bytes(clone)[0x13A3E + 1] == ord("B")
+
+    @pytest.mark.parametrize("inst", [
+        WavSynth(common=SynthCommon(name="WAV"), shape=4),
+        MacroSynth(shape=10),
+        Sampler(sample_path="/Samples/kick.wav"),
+        FMSynth(algo=7),
+        HyperSynth(scale=2),
+        External(port=1),
+        MIDIOut(name="MIDI", channel=3),
+        EmptyInstrument(),
+    ])
+    def test_instrument_roundtrip(self, inst):
+        restored = pickle.loads(pickle.dumps(inst))
+        assert type(restored) is type(inst)
+        assert restored == inst
+        assert copy.deepcopy(inst) == inst
+
+    def test_loaded_instrument_keeps_raw(self, tmp_path):
+        path = tmp_path / "i.m8i"
+        save(WavSynth(common=SynthCommon(name="RAW")), path)
+        loaded = load(path)
+        restored = pickle.loads(pickle.dumps(loaded))
+        assert restored._raw == loaded._raw
+        assert getattr(restored, "_file_tail", None) == getattr(loaded, "_file_tail", None)
+        assert restored._file_version == loaded._file_version
+
+    @pytest.mark.parametrize("clone", [copy.deepcopy, lambda o: pickle.loads(pickle.dumps(o))])
+    def test_loaded_non_ascii_name(self, tmp_path, clone):
+        path = tmp_path / "s.m8s"
+        song = Song()
+        song.instruments[1] = WavSynth(common=SynthCommon(name="CAFE"))
+        save(song, path)
+        data = bytearray(path.read_bytes())
+        data[version_profile(song.version).sections["instruments"].slot(1).start + 4] = 0xC9
+        path.write_bytes(bytes(data))
+        loaded = load(path)
+        assert loaded.instruments[1].common.name == "CAF\u00c9"
+        restored = clone(loaded)
+        assert restored == loaded
+        assert _song_bytes(restored) == bytes(data)
+        assert clone(loaded.instruments[1]) == loaded.instruments[1]
+
+    @pytest.mark.parametrize("obj", [
+        WavSynth(common=SynthCommon(name="LONGNAME_1234")),
+        Sampler(sample_path="/Samples/" + "x" * 130 + ".wav"),
+        MIDIOut(name="MIDI OUT NAME TOO LONG"),
+        WavSynth(common=SynthCommon(name="N\u00c9")),
+        Scale(name="A SCALE NAME TOO LONG", tuning=0.1),
+        Scale(name="\u00c9TUDE"),
+    ])
+    def test_values_the_format_cannot_hold(self, obj):
+        assert copy.deepcopy(obj) == obj
+        assert pickle.loads(pickle.dumps(obj)) == obj
+        song = Song()
+        if isinstance(obj, Scale):
+            song.scales[3] = obj
+        else:
+            song.instruments[3] = obj
+        assert copy.deepcopy(song) == song
+
+    def test_theme_roundtrip(self):
+        theme = Theme(background=RGB(1, 2, 3), cursor=RGB(200, 100, 50))
+        assert pickle.loads(pickle.dumps(theme)) == theme
+
+    def test_scale_roundtrip(self):
+        scale = Scale(name="LYDIAN", note_enable=0x0AD5, tuning=440.0)
+        restored = pickle.loads(pickle.dumps(scale))
+        assert restored == scale
+        assert restored._raw_name is None
@@ -0,0 +1,80 @@
+from m8py.display.commands import COMMANDS_V2, COMMANDS_V6_2, command_byte, fx_command_name
+from m8py.format.constants import InstrumentKind
+from m8py.format.offsets import V2_OFFSETS, V4_1_OFFSETS
+from m8py.format.reader import M8FileReader
+from m8py.format.writer import M8FileWriter
+from m8py.models.profile import VersionProfile, version_profile
+from m8py.models.scale import Scale
+from m8py.models.version import M8Version
+
+
+class TestVersionProfile:
+    def test_interned_per_major_minor(self):
+        a = version_profile(M8Version(6, 5, 0))
+        b = version_profile(M8Version(6, 5, 3))
+        c = version_profile((6, 5))
+        assert a is b is c
+        assert hash(a) == hash(c)
+        assert {a: 1}[b] == 1
+
+    def test_distinct_versions(self):
+        assert version_profile((4, 1)) != version_profile((4, 0))
+
+    def test_bundles_offsets_and_caps(self):
+        v2 = version_profile((2, 0))
+        assert v2.offsets is V2_OFFSETS
+        assert not v2.caps.has_scales
+        assert "scales" not in v2.sections
+        v41 = version_profile((4, 1))
+        assert v41.offsets is V4_1_OFFSETS
+        assert v41.caps.has_expanded_eq
+        assert v41.sections["eqs"].count == 132
+        assert v41.scale_has_tuning
+        assert not version_profile((3, 0)).scale_has_tuning
+
+    def test_command_tables(self):
+        v2 = version_profile((2, 0))
+        assert [v2.command_name(b) for b in range(len(COMMANDS_V2))] == COMMANDS_V2
+        v62 = version_profile((6, 2))
+        assert v62.command_name(0x00) == "ARP"
+        assert v62.command_byte("TBL") == COMMANDS_V6_2.index("TBL")
+        assert v62.command_byte("NOPE") is None
+
+    def test_codecs_are_bound_to_the_layout(self):
+        scale = Scale(name="S", tuning=432.0)
+        sizes = {}
+        for key in ((3, 0), (4, 0)):
+            codecs = version_profile(key).codecs
+            assert codecs is version_profile(key).codecs
+            writer = M8FileWriter()
+            codecs["scales"].write(scale, writer)
+            sizes[key] = len(writer.to_bytes())
+            restored = codecs["scales"].read(M8FileReader(writer.to_bytes()))
+            assert restored.tuning == (432.0 if key == (4, 0) else 0.0)
+        assert sizes[(4, 0)] == sizes[(3, 0)] + 4
+        assert set(version_profile((6, 5)).codecs) >= {
+            "mixer_settings", "effects_settings", "phrases", "instruments", "scales", "eqs",
+        }
+
+    def test_is_version_profile(self):
+        assert isinstance(version_profile((3, 0)), VersionProfile)
+
+
+class TestCachedLookups:
+    def test_caps_are_cached(self):
+        v = M8Version(4, 0, 0)
+        assert v.caps is v.caps
+        assert v.caps is M8Version(4, 0, 7).caps
+
+    def test_command_byte_roundtrip(self):
+        for version in [(2, 0), (3, 0), (4, 0), (6, 2)]:
+            for byte in range(0x40):
+                name = fx_command_name(byte, version=version)
+                if name.startswith("?"):
+                    continue
+                assert fx_command_name(command_byte(name, version), version=version) == name
+
+    def test_instrument_command_byte(self):
+        byte = command_byte("CUT", (6, 2), InstrumentKind.WAVSYNTH)
+        assert byte == 0x89
+        assert fx_command_name(byte, (6, 2), InstrumentKind.WAVSYNTH) == "CUT"
@@ -0,0 +1,156 @@
+import pytest
+
+from m8py.format.writer import M8FileWriter
+from m8py.models.song import Song
+from m8py.models.snapshot import SongHistory
+from m8py.models.phrase import Phrase, PhraseStep
+from m8py.models.instrument import WavSynth, SynthCommon
+from m8py.models.scale import Scale
+from m8py.models.eq import EQ
+
+
+def _song_bytes(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+class TestSongSnapshot:
+    def test_restore_roundtrip(self):
+        song = Song(name="SNAP", tempo=133.0)
+        song.phrases[2].steps[0] = PhraseStep(note=60, velocity=0x40, instrument=0)
+        song.instruments[0] = WavSynth(common=SynthCommon(name="LEAD"), shape=4)
+        snap = song.snapshot()
+
+        song.name = "EDITED"
+        song.phrases[2].steps[0].note = 72
+        song.instruments[0] = WavSynth(common=SynthCommon(name="OTHER"))
+        song.restore(snap)
+
+        assert song.name == "SNAP"
+        assert song.phrases[2].steps[0].note == 60
+        assert song.instruments[0].common.name == "LEAD"
+
+    def test_unchanged_sections_are_shared(self):
+        song = Song()
+        before = song.snapshot()
+        song.phrases[5].steps[3].note = 48
+        after = song.snapshot(previous=before)
+
+        assert after._sections["chains"] is before._sections["chains"]
+        assert after._sections["instruments"] is before._sections["instruments"]
+        assert after._sections["phrases"] is not before._sections["phrases"]
+        assert after._sections["phrases"][0] is before._sections["phrases"][0]
+        assert after._header is before._header
+
+    def test_changed_slots(self):
+        song = Song()
+        before = song.snapshot()
+        song.phrases[5].steps[3].note = 48
+        song.chains[1].steps[0].phrase = 5
+        after = song.snapshot(previous=before)
+        assert after.changed_slots(before) == {"phrases": [5], "chains": [1]}
+        assert after.changed_slots(after) == {}
+
+    def test_restore_with_current_decodes_only_changed(self):
+        song = Song()
+        before = song.snapshot()
+        untouched = song.phrases[0]
+        song.phrases[7].steps[0].note = 50
+        after = song.snapshot(previous=before)
+
+        before.restore(song, current=after)
+        assert song.phrases[7].steps[0].note == 0xFF
+        assert song.phrases[0] is untouched
+
+    def test_snapshot_is_immutable(self):
+        snap = Song().snapshot()
+        with pytest.raises(AttributeError):
+            snap.foo = 1
+
+    def test_slot_decode(self):
+        song = Song()
+        song.phrases[1].steps[0].note = 61
+        snap = song.snapshot()
+        phrase = snap.slot("phrases", 1)
+        assert isinstance(phrase, Phrase)
+        assert phrase.steps[0].note == 61
+
+    def test_to_song_byte_identical(self):
+        song = Song(name="COPY")
+        song.instruments[3] = WavSynth(common=SynthCommon(name="W"))
+        song.scales[0] = Scale(name="MAJ", note_enable=0x0AB5, tuning=440.0)
+        song.eqs = [EQ() for _ in range(132)]
+        copy = song.snapshot().to_song()
+        assert _song_bytes(copy) == _song_bytes(song)
+        assert copy.scales[0].tuning == 440.0
+
+    def test_programmatic_instrument_stays_editable(self):
+        song = Song()
+        song.instruments[0] = WavSynth(common=SynthCommon(name="A"))
+        snap = song.snapshot()
+        restored = snap.to_song()
+        restored.instruments[0].common.name = "B"
+        assert _song_bytes(restored)[0x13A3E + 1] == ord("B")
+
+    def test_short_phrase_roundtrips(self):
+        song = Song()
+        song.phrases[0] = Phrase(steps=[PhraseStep(note=60)] * 4)
+        restored = song.snapshot().to_song()
+        assert len(restored.phrases[0].steps) == 4
+
+
+class TestSongHistory:
+    def test_undo_redo(self):
+        song = Song()
+        history = SongHistory(song)
+        song.phrases[0].steps[0].note = 60
+        history.commit()
+        song.phrases[0].steps[0].note = 62
+        history.commit()
+
+        assert history.undo()
+        assert song.phrases[0].steps[0].note == 60
+        assert history.undo()
+        assert song.phrases[0].steps[0].note == 0xFF
+        assert not history.undo()
+        assert history.redo()
+        assert song.phrases[0].steps[0].note == 60
+
+    def test_undo_discards_uncommitted_edits(self):
+        song = Song()
+        history = SongHistory(song)
+        song.chains[0].steps[0].phrase = 1
+        history.commit()
+        song.tables[4].steps[0].transpose = 3
+        assert history.undo()
+        assert song.chains[0].steps[0].phrase == 0xFF
+        assert song.tables[4].steps[0].transpose == 0
+
+    def test_commit_truncates_redo(self):
+        song = Song()
+        history = SongHistory(song)
+        song.name = "A"
+        history.commit()
+        history.undo()
+        song.name = "B"
+        history.commit()
+        assert not history.can_redo
+        assert len(history) == 2
+
+    def test_limit_evicts_oldest(self):
+        song = Song()
+        history = SongHistory(song, limit=3)
+        for i in range(10):
+            song.phrases[0].steps[0].note = i
+            history.commit()
+        assert len(history) == 4
+        undone = 0
+        while history.undo():
+            undone += 1
+        assert undone == 3
+        assert song.phrases[0].steps[0].note == 6
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            SongHistory(Song(), limit=0)
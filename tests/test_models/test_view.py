@@ -0,0 +1,74 @@
+import pytest
+
+from m8py.format.errors import M8ParseError
+from m8py.format.offsets import PHRASE_SIZE, section_spans
+from m8py.format.writer import M8FileWriter
+from m8py.models.instrument import WavSynth, SynthCommon
+from m8py.models.phrase import PhraseStep
+from m8py.models.song import Song
+from m8py.models.version import M8Version
+from m8py.models.view import SongView
+
+
+def _encode(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+@pytest.fixture
+def song() -> Song:
+    song = Song(name="VIEW", tempo=140.0)
+    song.phrases[3].steps[0] = PhraseStep(note=60, velocity=0x40, instrument=2)
+    song.chains[1].steps[0].phrase = 3
+    song.song_steps[0].tracks[0] = 1
+    song.instruments[2] = WavSynth(common=SynthCommon(name="LEAD"))
+    return song
+
+
+class TestSongView:
+    def test_header_fields(self, song):
+        view = SongView(_encode(song))
+        assert view.name == "VIEW"
+        assert view.tempo == 140.0
+        assert view.version.major == 6
+
+    def test_section_is_zero_copy_slice(self, song):
+        data = bytearray(_encode(song))
+        view = SongView(data)
+        phrases = view.section("phrases")
+        assert len(phrases) == 255 * PHRASE_SIZE
+        assert phrases.readonly
+        span = view.sections["phrases"]
+        data[span.offset + 3 * PHRASE_SIZE] = 61
+        assert view.phrase(3).steps[0].note == 61
+
+    def test_slot_decoding(self, song):
+        view = SongView(_encode(song))
+        assert view.phrase(3).steps[0].note == 60
+        assert view.chain(1).steps[0].phrase == 3
+        assert view.song_step(0).tracks[0] == 1
+        assert view.instrument(2).common.name == "LEAD"
+
+    def test_to_song(self, song):
+        view = SongView(_encode(song))
+        assert _encode(view.to_song()) == _encode(song)
+
+    @pytest.mark.parametrize("version", [
+        M8Version(2, 0, 0), M8Version(2, 5, 0), M8Version(4, 0, 0), M8Version(4, 1, 0),
+    ])
+    def test_older_layouts(self, version):
+        song = Song(version=version)
+        song.phrases[0].steps[0].note = 50
+        view = SongView(_encode(song))
+        assert view.phrase(0).steps[0].note == 50
+        assert set(view.sections) == set(section_spans(version))
+
+    def test_missing_section(self):
+        view = SongView(_encode(Song(version=M8Version(2, 0, 0))))
+        with pytest.raises(KeyError):
+            view.section("eqs")
+
+    def test_truncated_buffer(self, song):
+        with pytest.raises(M8ParseError):
+            SongView(_encode(song)[:1000])
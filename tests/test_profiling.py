@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from m8py import profiling
+from m8py.format.reader import M8FileReader
+from m8py.format.writer import M8FileWriter
+from m8py.models.song import Song
+from m8py.models.version import M8FileType
+from m8py.testing import corpus
+
+SECTIONS = ["header", "grooves", "song_steps", "phrases", "chains", "tables",
+            "instruments", "effects_settings", "midi_mappings"]
+
+
+# Generated up front: the first call per layout encodes a template song
+DATA = {layout: corpus.song_bytes(layout, 3, "typical") for layout in corpus.LAYOUTS}
+
+
+def _roundtrip(layout: str) -> bytes:
+    data = DATA[layout]
+    reader = M8FileReader(data)
+    song = Song.from_reader(reader, M8FileType.from_reader(reader))
+    writer = M8FileWriter()
+    song.write(writer)
+    assert writer.to_bytes() == data
+    return data
+
+
+@pytest.fixture(autouse=True)
+def _no_profiler():
+    profiling.disable()
+    yield
+    profiling.disable()
+
+
+class TestProfile:
+    def test_off_by_default(self):
+        assert profiling.active() is None
+        _roundtrip("v6.5")
+        assert profiling.active() is None
+
+    @pytest.mark.parametrize("layout, extra", [
+        ("v2", []), ("v2.5", ["scales"]), ("v6.5", ["scales", "eqs"]),
+    ])
+    def test_sections_per_layout(self, layout, extra):
+        with profiling.profile() as prof:
+            data = _roundtrip(layout)
+        key = f"{corpus.LAYOUTS[layout].major}.{corpus.LAYOUTS[layout].minor}"
+        for op in ("read", "write"):
+            names = [name for (o, lay, name) in prof.stats.sections if o == op]
+            assert names == SECTIONS + extra + ["total"]
+            assert all(lay == key for (_, lay, _) in prof.stats.sections)
+            total = prof.stats.sections[op, key, "total"]
+            assert total.calls == 1 and total.seconds > 0
+        # Everything after the 14-byte file header is attributed to some section
+        read = prof.stats.sections["read", key, "total"]
+        assert read.bytes == len(data) - 14
+        sections = sum(t.bytes for (op, _, name), t in prof.stats.sections.items()
+                       if op == "read" and name != "total")
+        assert sections <= read.bytes
+
+    def test_instrument_kinds(self):
+        with profiling.profile() as prof:
+            _roundtrip("v4.1")
+        reads = {name: t for (op, _, name), t in prof.stats.instruments.items() if op == "read"}
+        assert sum(t.calls for t in reads.values()) == 128
+        assert "EmptyInstrument" in reads and len(reads) > 2
+        assert all(t.bytes == 215 * t.calls for t in reads.values())
+        writes = {name: t.calls for (op, _, name), t in prof.stats.instruments.items()
+                  if op == "write"}
+        assert writes == {name: t.calls for name, t in reads.items()}
+
+    def test_profile_restores_previous(self):
+        outer = profiling.enable()
+        with profiling.profile() as inner:
+            _roundtrip("v6.5")
+        assert profiling.active() is outer
+        assert inner.stats.sections and not outer.stats.sections
+        assert profiling.disable() is outer
+        assert profiling.active() is None
+
+    def test_stats_output(self):
+        with profiling.profile() as prof:
+            _roundtrip("v6.5")
+        text = prof.stats.format()
+        assert "phrases" in text and "EmptyInstrument" in text
+        records = json.loads(json.dumps(prof.stats.to_dict()))
+        assert {r["name"] for r in records["sections"]} >= set(SECTIONS)
+
+
+class TestTrace:
+    def test_no_events_without_trace(self):
+        with profiling.profile() as prof:
+            _roundtrip("v6.5")
+        assert prof.chrome_trace()["traceEvents"] == []
+
+    def test_chrome_trace(self, tmp_path):
+        with profiling.profile(trace=True) as prof:
+            _roundtrip("v6.5")
+        path = tmp_path / "trace.json"
+        prof.write_trace(path)
+        events = json.loads(path.read_text())["traceEvents"]
+        assert {e["ph"] for e in events} == {"X"}
+        assert {"read,section", "write,section", "read,instrument"} <= {e["cat"] for e in events}
+        total = next(e for e in events if e["name"] == "total" and e["cat"] == "read,section")
+        phrases = next(e for e in events if e["name"] == "phrases" and e["cat"] == "read,section")
+        assert total["ts"] <= phrases["ts"]
+        assert phrases["ts"] + phrases["dur"] <= total["ts"] + total["dur"]
+        assert phrases["args"] == {"operation": "read", "layout": "6.5",
+                                   "bytes": phrases["args"]["bytes"]}
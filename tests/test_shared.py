@@ -0,0 +1,81 @@
+"""Tests for publishing songs through shared memory (m8py.shared)."""
+import multiprocessing
+
+import pytest
+
+from m8py.format.writer import M8FileWriter
+from m8py.io import save
+from m8py.models.song import Song
+from m8py.shared import SharedSongCorpus
+
+
+def _encode(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+def _songs(n: int) -> list[Song]:
+    songs = []
+    for i in range(n):
+        song = Song(name=f"S{i}")
+        song.phrases[0].steps[0].note = 40 + i
+        songs.append(song)
+    return songs
+
+
+def _worker_note(name: str, index: int) -> int:
+    corpus = SharedSongCorpus.attach(name)
+    try:
+        view = corpus[index]
+        note = view.phrase(0).steps[0].note
+        view.release()
+        return note
+    finally:
+        corpus.close()
+
+
+class TestSharedSongCorpus:
+    def test_create_and_read(self):
+        songs = _songs(3)
+        with SharedSongCorpus.create(songs) as corpus:
+            assert len(corpus) == 3
+            for i, view in enumerate(corpus):
+                assert view.name == f"S{i}"
+                assert view.phrase(0).steps[0].note == 40 + i
+                view.release()
+            raw = corpus.raw(1)
+            assert bytes(raw) == _encode(songs[1])
+            raw.release()
+
+    def test_create_from_paths_and_bytes(self, tmp_path):
+        songs = _songs(2)
+        path = tmp_path / "a.m8s"
+        save(songs[0], path)
+        with SharedSongCorpus.create([path, _encode(songs[1])]) as corpus:
+            view = corpus[-1]
+            assert view.name == "S1"
+            view.release()
+            view = corpus[0]
+            assert view.name == "S0"
+            view.release()
+
+    def test_attach_reads_same_block(self):
+        with SharedSongCorpus.create(_songs(2)) as corpus:
+            other = SharedSongCorpus.attach(corpus.name)
+            view = other[1]
+            assert view.name == "S1"
+            view.release()
+            other.close()
+
+    def test_worker_processes(self):
+        with SharedSongCorpus.create(_songs(4)) as corpus:
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(2) as pool:
+                notes = pool.starmap(_worker_note, [(corpus.name, i) for i in range(4)])
+        assert notes == [40, 41, 42, 43]
+
+    def test_index_out_of_range(self):
+        with SharedSongCorpus.create(_songs(1)) as corpus:
+            with pytest.raises(IndexError):
+                corpus.raw(1)
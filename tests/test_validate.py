@@ -1,11 +1,17 @@
 import pytest
-from m8py.validate import validate, Severity, ValidationIssue
+from m8py.validate import (
+    RULES, Rule, Severity, ValidationIssue, Validator,
+    register_rule, rule, validate, validate_bytes, validate_instrument,
+)
 from m8py.models.song import Song
 from m8py.models.song_step import SongStep
 from m8py.models.chain import Chain, ChainStep
 from m8py.models.phrase import Phrase, PhraseStep
 from m8py.models.instrument import Sampler, SynthCommon, EmptyInstrument
 from m8py.format.constants import EMPTY, N_PHRASES, N_CHAINS, N_INSTRUMENTS
+from m8py.format.writer import M8FileWriter
+from m8py.models.fx import FX
+from m8py.models.profile import version_profile
 
 
 class TestValidation:
@@ -99,3 +105,275 @@ class TestValidation:
         issues = validate(song)
         errors = [i for i in issues if i.severity == Severity.ERROR]
         assert any("transpose" in i.path for i in errors)
+
+
+class TestValidator:
+    def test_initial_issues_match_validate(self):
+        song = Song()
+        song.phrases[3].steps[2].instrument = 200
+        song.instruments[1] = Sampler(common=SynthCommon(name="S"), sample_path="")
+        assert [str(i) for i in Validator(song).issues] == [str(i) for i in validate(song)]
+
+    def test_explicit_dirty_slots(self):
+        song = Song()
+        validator = Validator(song)
+        song.phrases[3].steps[0].instrument = 200
+        issues = validator.update({"phrases": [3]})
+        assert [i.path for i in issues] == ["phrases[3].steps[0].instrument"]
+        assert validator.slot_issues("phrases", 3)
+
+        song.phrases[3].steps[0].instrument = 1
+        assert validator.update({"phrases": [3]}) == []
+        assert validator.slot_issues("phrases", 3) == []
+
+    def test_only_dirty_slots_are_rechecked(self):
+        song = Song()
+        validator = Validator(song)
+        song.phrases[3].steps[0].instrument = 200
+        song.phrases[4].steps[0].instrument = 200
+        validator.update({"phrases": [4]})
+        assert validator.slot_issues("phrases", 3) == []
+        assert validator.slot_issues("phrases", 4)
+
+    def test_diff_against_snapshot(self):
+        song = Song()
+        validator = Validator(song)
+        song.chains[2].steps[5].phrase = 300
+        song.tempo = 0.5
+        paths = [i.path for i in validator.update()]
+        assert paths == ["song.tempo", "chains[2].steps[5].phrase"]
+
+    def test_diff_after_explicit_updates_rebuilds(self):
+        song = Song()
+        validator = Validator(song)
+        validator.update({"phrases": [0]})
+        song.phrases[9].steps[0].instrument = 200
+        assert [i.path for i in validator.update()] == ["phrases[9].steps[0].instrument"]
+
+    def test_changed_slots_feed(self):
+        song = Song()
+        validator = Validator(song)
+        before = song.snapshot()
+        song.song_steps[7].tracks[1] = 300
+        after = song.snapshot(previous=before)
+        issues = validator.update(after.changed_slots(before))
+        assert [i.path for i in issues] == ["song_steps[7].tracks[1]"]
+
+
+def _encode(song: Song) -> bytes:
+    writer = M8FileWriter()
+    song.write(writer)
+    return writer.to_bytes()
+
+
+class TestValidateBytes:
+    def test_default_song_no_issues(self):
+        assert validate_bytes(_encode(Song())) == []
+
+    def test_matches_validate(self):
+        song = Song()
+        song.tempo = 900.0
+        song.name = "WAYTOOLONGNAME"
+        song.phrases[3].steps[2].instrument = 200
+        song.phrases[254].steps[15].instrument = 128
+        song.phrases[7].steps[0].instrument = 127
+        data = _encode(song)
+        expected = [str(i) for i in validate(song)]
+        # the name is truncated on write, so only 12 bytes come back
+        expected = [i for i in expected if "song.name" not in i]
+        assert [str(i) for i in validate_bytes(data) if i.path != "song.name"] == expected
+        assert [i.path for i in validate_bytes(data)][-2:] == [
+            "phrases[3].steps[2].instrument",
+            "phrases[254].steps[15].instrument",
+        ]
+
+    def test_accepts_memoryview(self):
+        song = Song()
+        song.phrases[0].steps[0].instrument = 129
+        issues = validate_bytes(memoryview(bytearray(_encode(song))))
+        assert [i.path for i in issues] == ["phrases[0].steps[0].instrument"]
+
+    def test_truncated_buffer(self):
+        issues = validate_bytes(_encode(Song())[:1000])
+        assert len(issues) == 1
+        assert issues[0].path == "file"
+        assert issues[0].severity == Severity.ERROR
+
+    def test_bad_magic(self):
+        issues = validate_bytes(b"NOTANM8FILE" + bytes(200))
+        assert [i.path for i in issues] == ["file"]
+
+
+def _cmd(name: str) -> int:
+    return version_profile((6, 5)).command_byte(name)
+
+
+@pytest.fixture
+def registry():
+    saved = dict(RULES)
+    yield RULES
+    RULES.clear()
+    RULES.update(saved)
+
+
+class TestRules:
+    def test_issues_carry_rule_name(self):
+        song = Song()
+        song.tempo = 0.5
+        song.phrases[0].steps[0].instrument = 200
+        assert [i.rule for i in validate(song)] == ["tempo-range", "instrument-ref"]
+
+    def test_severity_override(self):
+        song = Song()
+        song.name = "VeryLongSongName"
+        issues = validate(song, severity={"name-length": Severity.ERROR})
+        assert [i.severity for i in issues] == [Severity.ERROR]
+
+    def test_severity_none_disables_rule(self):
+        song = Song()
+        song.tempo = 0.5
+        assert validate(song, severity={"tempo-range": None}) == []
+
+    def test_severity_policy_unknown_rule(self):
+        with pytest.raises(ValueError):
+            validate(Song(), severity={"no-such-rule": Severity.ERROR})
+
+    def test_rule_subset_by_name(self):
+        song = Song()
+        song.tempo = 0.5
+        song.name = "VeryLongSongName"
+        assert [i.rule for i in validate(song, rules=["name-length"])] == ["name-length"]
+
+    def test_each_slot_visited_once_per_rule(self):
+        seen = {"a": [], "b": []}
+
+        def make(name):
+            def check(ctx, section, slot, item):
+                seen[name].append((section, slot))
+                return ()
+            return Rule(name, ("phrases", "tables"), check)
+
+        validate(Song(), rules=[make("a"), make("b")])
+        assert seen["a"] == seen["b"]
+        assert len(seen["a"]) == len(set(seen["a"])) == N_PHRASES + 256
+
+    def test_decorator_registers_rule(self, registry):
+        @rule("zero-velocity", "phrases", severity=Severity.WARNING)
+        def _check(ctx, section, slot, phrase):
+            """Steps with a note but zero velocity."""
+            for j, step in enumerate(phrase.steps):
+                if step.note != EMPTY and step.velocity == 0:
+                    yield f"phrases[{slot}].steps[{j}].velocity", "zero velocity"
+
+        assert registry["zero-velocity"].description == "Steps with a note but zero velocity."
+        song = Song()
+        song.phrases[2].steps[1] = PhraseStep(note=36, velocity=0)
+        issues = validate(song)
+        assert [(i.path, i.severity) for i in issues] == [
+            ("phrases[2].steps[1].velocity", Severity.WARNING),
+        ]
+
+    def test_duplicate_registration_rejected(self, registry):
+        with pytest.raises(ValueError):
+            register_rule(Rule("tempo-range", ("song",), lambda *a: ()))
+        register_rule(Rule("tempo-range", ("song",), lambda *a: ()), replace=True)
+        song = Song()
+        song.tempo = 0.5
+        assert validate(song) == []
+
+    def test_unknown_section_rejected(self, registry):
+        with pytest.raises(ValueError):
+            register_rule(Rule("bad", ("patterns",), lambda *a: ()))
+
+    def test_unknown_fx_command(self):
+        song = Song()
+        song.chains[0].steps[0].phrase = 0
+        song.song_steps[0].tracks[0] = 0
+        song.phrases[0].steps[3].fx2 = FX(command=0x60, value=0)
+        song.phrases[0].steps[4].fx1 = FX(command=_cmd("TPO"), value=0x80)
+        issues = [i for i in validate(song) if i.rule == "fx-command"]
+        assert [i.path for i in issues] == ["phrases[0].steps[3].fx2"]
+        assert "v6.5" in issues[0].message
+
+    def test_instrument_fx_needs_known_instrument(self):
+        song = Song()
+        song.phrases[0].steps[0].fx1 = FX(command=0xF0, value=0)
+        assert not [i for i in validate(song) if i.rule == "fx-command"]
+        song.instruments[0] = Sampler(common=SynthCommon(name="S"), sample_path="/a.wav")
+        song.phrases[0].steps[0].instrument = 0
+        assert [i.path for i in validate(song) if i.rule == "fx-command"] == [
+            "phrases[0].steps[0].fx1",
+        ]
+
+    def test_fx_slot_range(self):
+        song = Song()
+        song.tables[5].steps[0].fx1 = FX(command=_cmd("GRV"), value=40)
+        song.tables[5].steps[1].fx1 = FX(command=_cmd("GRV"), value=31)
+        issues = [i for i in validate(song) if i.rule == "fx-slot-range"]
+        assert [i.path for i in issues] == ["tables[5].steps[0].fx1"]
+
+    def test_dangling_refs(self):
+        song = Song()
+        song.song_steps[0].tracks[0] = 3
+        song.phrases[1].steps[0].fx1 = FX(command=_cmd("TBL"), value=9)
+        song.chains[2].steps[0].phrase = 7
+        issues = [i for i in validate(song) if i.rule == "dangling-ref"]
+        assert [i.path for i in issues] == [
+            "song_steps[0].tracks[0]",
+            "chains[2].steps[0].phrase",
+            "phrases[1].steps[0].fx1",
+        ]
+        assert all(i.severity == Severity.WARNING for i in issues)
+
+    def test_unused_instrument(self):
+        song = Song()
+        song.instruments[4] = Sampler(common=SynthCommon(name="S"), sample_path="/a.wav")
+        issues = validate(song)
+        assert [(i.path, i.severity) for i in issues] == [("instruments[4]", Severity.INFO)]
+        song.phrases[0].steps[0].instrument = 4
+        assert validate(song, severity={"dangling-ref": None}) == []
+
+    def test_validator_rechecks_referenced_slots(self):
+        song = Song()
+        song.instruments[4] = Sampler(common=SynthCommon(name="S"), sample_path="/a.wav")
+        validator = Validator(song)
+        assert validator.slot_issues("instruments", 4)
+        song.phrases[0].steps[0].instrument = 4
+        validator.update({"phrases": [0]})
+        assert validator.slot_issues("instruments", 4) == []
+        song.phrases[0].steps[0].instrument = EMPTY
+        validator.update({"phrases": [0]})
+        assert validator.slot_issues("instruments", 4)
+
+    def test_validator_severity_policy(self):
+        song = Song()
+        song.instruments[4] = Sampler(common=SynthCommon(name="S"))
+        validator = Validator(song, severity={"unused-instrument": None,
+                                              "sample-path": Severity.ERROR})
+        assert [(i.rule, i.severity) for i in validator.issues] == [
+            ("sample-path", Severity.ERROR),
+        ]
+
+
+class TestValidateInstrument:
+    def test_sampler_without_path(self):
+        issues = validate_instrument(Sampler(common=SynthCommon(name="S")))
+        assert [(i.path, i.rule) for i in issues] == [("instruments[0]", "sample-path")]
+
+    def test_unused_instrument_is_off(self):
+        assert validate_instrument(Sampler(common=SynthCommon(name="S"), sample_path="/a.wav")) == []
+
+    def test_rule_subset(self):
+        inst = Sampler(common=SynthCommon(name="S"))
+        assert validate_instrument(inst, rules=["unused-instrument"]) == []
+        issues = validate_instrument(inst, severity={"sample-path": Severity.ERROR})
+        assert [i.severity for i in issues] == [Severity.ERROR]
+
+    def test_song_scoped_rule_rejected(self):
+        inst = Sampler(common=SynthCommon(name="S"), sample_path="/a.wav")
+        with pytest.raises(ValueError, match="unused-instrument"):
+            validate_instrument(inst, severity={"unused-instrument": Severity.INFO})
+        with pytest.raises(ValueError, match="unused-instrument"):
+            validate_instrument(inst, rules=["unused-instrument"],
+                                severity={"unused-instrument": Severity.INFO})
+        assert validate_instrument(inst, severity={"unused-instrument": None}) == []